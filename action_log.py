@@ -0,0 +1,341 @@
+"""
+Log de ações por jogo (somente anexação) com replay determinístico.
+
+Cada ação da API web que altera o jogo (mover, coletar, combate, equipar,
+desbloquear...) vira uma linha JSON compacta em saves/logs/<game_id>.log:
+
+    [seq, rota, corpo, status]
+    [0, "start", {"name": "Arthon", "class": "guerreiro", "dungeon": "...", "seed": 42}, 200]
+    [1, "/api/move", {"direction": "norte"}, 200]
+
+A primeira linha diz de onde o jogo partiu: "start" (novo jogo, com a
+semente da partida) ou "load" (save carregado, com snapshot no seq 0).
+A cada SNAPSHOT_INTERVAL ações o jogo completo é gravado como snapshot
+(<game_id>.session, formato do SaveManager), então um jogo perdido numa
+queda do servidor é reconstruído carregando o snapshot e reexecutando só
+a cauda do log. Como o RNG é da partida (game_rng.py), o replay chega
+exatamente ao mesmo estado.
+
+O disco é limitado de duas formas: um log que passa de max_bytes é
+compactado (snapshot do estado atual + log recomeçado como "load"), e
+logs sem ação há mais de max_age segundos são apagados com o snapshot
+por uma varredura que roda no máximo uma vez a cada LOG_SWEEP_INTERVAL.
+Encerrar o jogo (/exit, novo jogo, carregar save) apaga o log na hora.
+
+Uso (relatórios de bug):
+    python action_log.py replay saves/logs/<game_id>.log
+    python action_log.py replay saves/logs/<game_id>.log --trace
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import secrets
+import threading
+import time
+
+from save_manager import SaveManager
+
+START_ACTION = "start"
+LOAD_ACTION = "load"
+
+# Ações entre snapshots: limita a cauda reexecutada numa reconstrução
+SNAPSHOT_INTERVAL = 50
+
+# Limites padrão do disco: tamanho de um log e idade de um jogo abandonado
+DEFAULT_MAX_LOG_BYTES = 1024 * 1024
+DEFAULT_LOG_TTL = 7 * 24 * 60 * 60
+
+# Intervalo mínimo entre duas varreduras de logs vencidos (por processo)
+LOG_SWEEP_INTERVAL = 10 * 60
+
+# Rotas registradas no log (as GETs só leem o estado)
+LOGGED_ENDPOINTS = frozenset({
+    'collect_treasure',
+    'recruit_npc_companion',
+    'unlock_companion_skill_api',
+    'equip_companion_weapon_api',
+    'move',
+    'spend_attribute_point',
+    'inventory_action',
+    'unlock_skill',
+    'start_combat',
+    'combat_action',
+})
+
+_replay_state = threading.local()
+
+
+def is_replaying():
+    """True enquanto a thread atual reexecuta um log (nada é registrado)"""
+    return getattr(_replay_state, "active", False)
+
+
+@contextlib.contextmanager
+def replaying():
+    """Desliga o registro de ações e a reconstrução durante um replay"""
+    previous = is_replaying()
+    _replay_state.active = True
+    try:
+        yield
+    finally:
+        _replay_state.active = previous
+
+
+def read_log(path):
+    """Entradas de um arquivo de log (uma linha cortada no fim é ignorada)"""
+    entries = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Queda no meio de uma escrita: o resto do arquivo não é confiável
+                    break
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def replay_entries(app, store, entries, game_data=None):
+    """Reexecuta entradas do log pelas rotas do app, sem rede e sem registrar.
+
+    Cada ação roda num contexto de request montado direto (sem cliente HTTP
+    nem cookie de sessão), o que mantém o replay em milhares de ações/s.
+    Sem game_data, a primeira entrada precisa ser "start". Retorna
+    (game_data final, divergências), onde cada divergência é
+    (seq, rota, status registrado, status obtido).
+    """
+    from flask import session
+
+    replay_id = None
+    if game_data is not None:
+        replay_id = f"replay-{secrets.token_hex(8)}"
+        store[replay_id] = game_data
+
+    mismatches = []
+    with replaying():
+        for seq, action, body, status in entries:
+            if action == START_ACTION:
+                path = '/new_game'
+            elif action == LOAD_ACTION:
+                # Saves carregados só podem ser retomados a partir do snapshot
+                raise ValueError("Log iniciado por save carregado: use o snapshot do seq 0")
+            else:
+                path = action
+
+            with app.test_request_context(path, method='POST', json=body):
+                if replay_id:
+                    session['game_id'] = replay_id
+                # Sem process_response: o replay não grava cookie nem registra a ação
+                response = app.make_response(app.preprocess_request() or app.dispatch_request())
+                replay_id = session.get('game_id')
+            if response.status_code != status:
+                mismatches.append((seq, action, status, response.status_code))
+
+    game_data = store.pop(replay_id, None) if replay_id else None
+    if game_data is not None and entries:
+        game_data['action_seq'] = entries[-1][0]
+    return game_data, mismatches
+
+
+class ActionLog:
+    """Logs de ações e snapshots periódicos dos jogos web"""
+
+    def __init__(self, log_dir=os.path.join("saves", "logs"), snapshot_interval=SNAPSHOT_INTERVAL,
+                 max_bytes=None, max_age=None):
+        self.log_dir = log_dir
+        self.snapshot_interval = snapshot_interval
+        self.max_bytes = max_bytes  # Log maior que isso é compactado (None = sem limite)
+        self.max_age = max_age  # Segundos sem ação antes de apagar o log (None = nunca)
+        self.save_manager = SaveManager(snapshot_dir=log_dir)
+        self._sweep_lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def log_path(self, game_id):
+        """Arquivo de log de um jogo"""
+        safe_id = "".join(char for char in str(game_id) if char.isalnum() or char in {"_", "-"})
+        return os.path.join(self.log_dir, f"{safe_id}.log")
+
+    def has_log(self, game_id):
+        return os.path.exists(self.log_path(game_id))
+
+    def start(self, game_id, game_data, action, params):
+        """Começa o log de um jogo novo ("start") ou carregado ("load")"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        game_data['action_seq'] = 0
+        with open(self.log_path(game_id), 'w', encoding='utf-8') as f:
+            f.write(self._encode([0, action, params, 200]))
+
+        if action == LOAD_ACTION:
+            self.save_manager.save_snapshot(game_id, game_data)
+        else:
+            self.save_manager.delete_snapshot(game_id)
+        self._maybe_sweep()
+
+    def append(self, game_id, game_data, path, body, status):
+        """Registra uma ação; a cada snapshot_interval grava o jogo completo"""
+        seq = game_data.get('action_seq', 0) + 1
+        game_data['action_seq'] = seq
+        with open(self.log_path(game_id), 'a', encoding='utf-8') as f:
+            f.write(self._encode([seq, path, body, status]))
+            size = f.tell()
+
+        if self.max_bytes and size > self.max_bytes:
+            # Recomeça o log a partir do estado atual, como um save carregado
+            self.start(game_id, game_data, LOAD_ACTION, {'compacted': seq})
+        elif self.snapshot_interval and seq % self.snapshot_interval == 0:
+            self.save_manager.save_snapshot(game_id, game_data)
+        return seq
+
+    def read(self, game_id):
+        return read_log(self.log_path(game_id))
+
+    def rebuild(self, game_id, app, store):
+        """Reconstrói o jogo pelo último snapshot + cauda do log (ou None)"""
+        entries = self.read(game_id)
+        if not entries:
+            return None
+
+        snapshot = self.save_manager.load_snapshot(game_id)
+        if snapshot is not None:
+            snapshot_seq = snapshot.get('action_seq', 0)
+            tail = [entry for entry in entries if entry[0] > snapshot_seq]
+            game_data, _ = replay_entries(app, store, tail, snapshot)
+            if game_data is not None:
+                game_data['action_seq'] = max(snapshot_seq, entries[-1][0])
+            return game_data
+
+        if entries[0][1] != START_ACTION:
+            return None
+        game_data, _ = replay_entries(app, store, entries)
+        return game_data
+
+    def delete(self, game_id):
+        """Apaga o log e o snapshot de um jogo"""
+        self.save_manager.delete_snapshot(game_id)
+        try:
+            os.remove(self.log_path(game_id))
+        except FileNotFoundError:
+            pass
+
+    def sweep_expired(self, now=None):
+        """Apaga logs (e snapshots) sem ação há mais de max_age segundos. Retorna quantos jogos"""
+        if self.max_age is None:
+            return 0
+        deadline = (time.time() if now is None else now) - self.max_age
+        try:
+            with os.scandir(self.log_dir) as entries:
+                files = [entry for entry in entries if entry.name.endswith((".log", ".session"))]
+        except FileNotFoundError:
+            return 0
+
+        logs = {os.path.splitext(entry.name)[0] for entry in files if entry.name.endswith(".log")}
+        removed = 0
+        for entry in files:
+            game_id, extension = os.path.splitext(entry.name)
+            if extension == ".session" and game_id in logs:
+                continue  # Vai junto com o log, que diz se o jogo ainda é jogado
+            try:
+                if entry.stat().st_mtime > deadline:
+                    continue
+            except FileNotFoundError:
+                continue
+            self.delete(game_id)
+            removed += 1
+        return removed
+
+    def _maybe_sweep(self):
+        if self.max_age is None or time.monotonic() < self._next_sweep:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return  # Outra thread já está varrendo
+        try:
+            self._next_sweep = time.monotonic() + LOG_SWEEP_INTERVAL
+            self.sweep_expired()
+        finally:
+            self._sweep_lock.release()
+
+    @staticmethod
+    def _encode(entry):
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+def create_action_log():
+    """Cria o log configurado por variáveis de ambiente (ou None se desligado).
+
+    DUNGEON_ACTION_LOG: "0" desliga o registro de ações
+    DUNGEON_ACTION_LOG_DIR: diretório dos logs e snapshots (padrão saves/logs)
+    DUNGEON_SNAPSHOT_INTERVAL: ações entre snapshots (0 desliga os periódicos)
+    DUNGEON_ACTION_LOG_MAX_BYTES: tamanho que dispara a compactação de um log
+        (padrão 1 MiB, 0 sem limite)
+    DUNGEON_ACTION_LOG_TTL: segundos sem ação antes de apagar o log de um
+        jogo abandonado (padrão 7 dias, 0 mantém para sempre)
+    """
+    if os.environ.get("DUNGEON_ACTION_LOG", "1").strip() == "0":
+        return None
+    log_dir = os.environ.get("DUNGEON_ACTION_LOG_DIR", os.path.join("saves", "logs"))
+    interval = int(os.environ.get("DUNGEON_SNAPSHOT_INTERVAL", SNAPSHOT_INTERVAL))
+    max_bytes = int(os.environ.get("DUNGEON_ACTION_LOG_MAX_BYTES", DEFAULT_MAX_LOG_BYTES))
+    max_age = float(os.environ.get("DUNGEON_ACTION_LOG_TTL", DEFAULT_LOG_TTL))
+    return ActionLog(log_dir, interval, max_bytes=max_bytes or None, max_age=max_age or None)
+
+
+def replay_file(path, trace=False):
+    """Reexecuta um log inteiro sem servidor. Retorna (game_data, divergências, ações/s)"""
+    # O replay não grava nada: store só em memória e log de ações desligado
+    os.environ["DUNGEON_ACTION_LOG"] = "0"
+    os.environ["DUNGEON_SESSION_STORE"] = "memory"
+    from app_web import active_games, app
+
+    entries = read_log(path)
+    if not entries:
+        raise ValueError(f"Log vazio ou inexistente: {path}")
+
+    game_data = None
+    if entries[0][1] == LOAD_ACTION:
+        snapshot_dir = os.path.dirname(path) or "."
+        game_id = os.path.splitext(os.path.basename(path))[0]
+        game_data = SaveManager(snapshot_dir=snapshot_dir).load_snapshot(game_id)
+        if game_data is None or game_data.get('action_seq', 0) != 0:
+            raise ValueError("Log de save carregado sem o snapshot inicial")
+        entries = entries[1:]
+
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        game_data, mismatches = replay_entries(app, active_games, entries, game_data)
+    elapsed = time.perf_counter() - started
+
+    if trace:
+        print(output.getvalue())
+    return game_data, mismatches, len(entries) / elapsed if elapsed else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logs de ações dos jogos web")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="Reexecuta um log sem servidor")
+    replay_parser.add_argument("log", help="Arquivo .log (saves/logs/<game_id>.log)")
+    replay_parser.add_argument("--trace", action="store_true", help="Mostra a saída do jogo durante o replay")
+    args = parser.parse_args()
+
+    game_data, mismatches, rate = replay_file(args.log, trace=args.trace)
+    player = game_data['player']
+    print(f"▶️ {game_data.get('action_seq', 0)} ações reexecutadas ({rate:.0f} ações/s)")
+    print(f"   {player.name} ({player.player_class}) nv{player.level} - HP {player.hp}/{player.max_hp} - sala {player.position}")
+    if game_data.get('in_combat'):
+        print(f"   Em combate contra {game_data['combat'].enemy.name}")
+
+    if mismatches:
+        print(f"\n⚠️ {len(mismatches)} divergências de status:")
+        for seq, action, expected, actual in mismatches:
+            print(f"   #{seq} {action}: registrado {expected}, replay {actual}")
+    else:
+        print("✅ Replay idêntico ao registrado")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,40 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g
 from player import Player
 from world import World
-from save_manager import SaveManager
+from dungeon_loader import DEFAULT_DUNGEON_ID, list_dungeons
+from save_manager import SAVE_SORT_KEYS, SaveManager
+from item_registry import get_item_registry
+from session_store import create_session_store
+from combat_pa import validate_skill_handlers
+from combat_events import CombatEvent, JsonEventCollector, NULL_SINK
+from game_rng import daily_seed
+from autosave import create_autosave_service
+from action_log import LOAD_ACTION, LOGGED_ENDPOINTS, START_ACTION, create_action_log, is_replaying
 import os
 import secrets
+from functools import lru_cache
 
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(16)
+# Com vários workers a chave precisa ser compartilhada, senão a sessão não vale entre processos
+app.secret_key = os.environ.get('FLASK_SECRET_KEY') or secrets.token_hex(16)
 
-# Dicionário para armazenar jogos ativos (em memória)
-active_games = {}
+# Store de jogos ativos (memória LRU ou snapshots em disco, ver session_store.py)
+active_games = create_session_store()
+
+# Log de ações por jogo para reconstrução e replay (ver action_log.py)
+action_log = create_action_log()
+
+# Autosave em segundo plano (troca de sala, fim de combate, nível), ver autosave.py
+autosave = create_autosave_service()
+
+# Segundos que /saves e /api/load esperam a fila do autosave antes de ler a pasta
+AUTOSAVE_FLUSH_TIMEOUT = 5
+
+# Saves por página na tela de carregar jogo
+SAVES_PER_PAGE = 20
+
+# Falha na inicialização se alguma habilidade da árvore não tiver efeito em combate
+validate_skill_handlers()
 
 SPECIAL_BOSS_ROOMS = {
     '14': {
@@ -51,14 +76,112 @@ SPECIAL_BOSS_ROOMS = {
 }
 
 
-def clear_current_game():
-    """Remove o jogo ativo da sessão atual."""
+@app.before_request
+def recover_logged_game():
+    """Reconstrói pelo log de ações um jogo que sumiu do store (ex.: queda do servidor)."""
+    game_id = session.get('game_id')
+    if action_log is None or not game_id or is_replaying() or game_id in active_games:
+        return
+    game_data = action_log.rebuild(game_id, app, active_games)
+    if game_data is not None:
+        active_games[game_id] = game_data
+
+
+@app.after_request
+def record_action(response):
+    """Registra no log as ações que alteram o jogo."""
+    if action_log is None or request.method != 'POST' or is_replaying():
+        return response
+
+    game_id = session.get('game_id')
+    game_data = active_games.get(game_id) if game_id else None
+    if game_data is None:
+        return response
+
+    if request.endpoint == 'new_game' and response.status_code == 200:
+        action_log.start(game_id, game_data, START_ACTION, {
+            'name': game_data['player'].name,
+            'class': game_data['player'].player_class,
+            'dungeon': game_data['world'].dungeon_id,
+            'seed': game_data['world'].rng.run_seed,
+        })
+    elif request.endpoint == 'load_save_file' and response.status_code == 200:
+        action_log.start(game_id, game_data, LOAD_ACTION, {'save': game_data['save_filename']})
+    elif request.endpoint in LOGGED_ENDPOINTS:
+        action_log.append(game_id, game_data, request.path, request.get_json(silent=True), response.status_code)
+    return response
+
+
+def autosave_marker(game_data):
+    """Parte do estado que dispara um autosave quando muda"""
+    return (
+        game_data['player'].position,
+        game_data['player'].level,
+        bool(game_data.get('in_combat')),
+    )
+
+
+@app.before_request
+def mark_autosave_state():
+    """Guarda o estado antes das ações para detectar eventos de autosave."""
+    if autosave is None or request.method != 'POST' or is_replaying():
+        return
+    game_id = session.get('game_id')
+    game_data = active_games.get(game_id) if game_id else None
+    if game_data is not None:
+        g.autosave_marker = (game_id, autosave_marker(game_data))
+
+
+@app.after_request
+def autosave_on_events(response):
+    """Agenda um autosave ao trocar de sala, terminar um combate ou subir de nível."""
+    marker = g.pop('autosave_marker', None)
+    if autosave is None or marker is None or response.status_code != 200:
+        return response
+
+    game_id, (position, level, in_combat) = marker
+    game_data = active_games.get(game_id)
+    if game_data is None:
+        return response
+
+    new_position, new_level, new_in_combat = autosave_marker(game_data)
+    if new_position != position or new_level > level or (in_combat and not new_in_combat):
+        filename = game_data.setdefault('autosave_filename', f"autosave_{game_id}.json")
+        autosave.schedule(
+            game_data['player'], game_data['world'], filename,
+            combat_state=get_combat_session_state(game_data),
+        )
+    return response
+
+
+@app.teardown_request
+def persist_active_games(exception=None):
+    """Grava de volta os jogos carregados/alterados durante o request."""
+    active_games.flush()
+
+
+def clear_current_game(keep_save=None):
+    """Remove o jogo ativo da sessão atual (e o log de ações e o autosave dele).
+
+    keep_save: arquivo que não deve ser apagado (o autosave sendo carregado).
+    """
     game_id = session.get('game_id')
     if game_id:
-        active_games.pop(game_id, None)
+        game_data = active_games.pop(game_id, None)
+        if not is_replaying():
+            if action_log is not None:
+                action_log.delete(game_id)
+            autosave_filename = game_data and game_data.get('autosave_filename')
+            if autosave is not None and autosave_filename and autosave_filename != keep_save:
+                autosave.discard(autosave_filename)
     session.clear()
 
 
+def get_save_manager():
+    """SaveManager dos saves da web (o mesmo da thread do autosave, se ligado)"""
+    return autosave.save_manager if autosave is not None else SaveManager()
+
+
 def get_special_boss_state(player, world, room_id):
     """Retorna o estado de invocação dos bosses especiais para a interface web."""
     config = SPECIAL_BOSS_ROOMS.get(room_id)
@@ -125,11 +248,6 @@ def serialize_player_companion(companion):
     }
 
 
-def get_item_registry():
-    """Retorna o registro de itens disponível para reconstrução/equipamento."""
-    return SaveManager()._get_item_registry()
-
-
 def serialize_companion_inventory_weapon(item, item_index):
     """Serializa uma arma compatível com companions."""
     return {
@@ -286,6 +404,49 @@ def clear_multi_enemy_progress(game_data):
     game_data.pop('multi_enemy_progress', None)
 
 
+def get_combat_session_state(game_data):
+    """Combate em andamento (e fila de inimigos da sala) em formato JSON para o save."""
+    combat = game_data.get('combat')
+    if not game_data.get('in_combat') or not combat:
+        return None
+
+    state = {'combat': combat.get_state()}
+    if game_data.get('combat_intro'):
+        state['intro'] = game_data['combat_intro']
+    if game_data.get('multi_enemy_room_id') is not None:
+        state['multi_enemy'] = {
+            'room_id': game_data['multi_enemy_room_id'],
+            'total': game_data.get('multi_enemy_total'),
+            'progress': game_data.get('multi_enemy_progress', 1),
+            'queue': [enemy.get_state() for enemy in game_data.get('multi_enemy_queue', [])],
+        }
+    return state
+
+
+def restore_combat_session(game_data, state):
+    """Retoma no game_data o combate salvo por get_combat_session_state."""
+    from combat_pa import CombatPA
+    from enemy import restore_enemy
+
+    combat = CombatPA.from_state(game_data['player'], state['combat'], sink=NULL_SINK, rng=game_data['world'].rng)
+    if combat is None:
+        return False
+
+    game_data['combat'] = combat
+    game_data['in_combat'] = True
+    if state.get('intro'):
+        game_data['combat_intro'] = state['intro']
+
+    multi_enemy = state.get('multi_enemy')
+    if multi_enemy:
+        queue = [restore_enemy(enemy_state) for enemy_state in multi_enemy['queue']]
+        game_data['multi_enemy_queue'] = [enemy for enemy in queue if enemy is not None]
+        game_data['multi_enemy_room_id'] = multi_enemy['room_id']
+        game_data['multi_enemy_total'] = multi_enemy['total']
+        game_data['multi_enemy_progress'] = multi_enemy['progress']
+    return True
+
+
 def sanitize_save_filename(filename):
     """Sanitiza o nome do arquivo de save informado pelo usuário."""
     if not filename:
@@ -326,10 +487,24 @@ def new_game():
         data = request.json
         name = data.get('name', 'Aventureiro')
         player_class = data.get('class', 'guerreiro')
+        dungeon_id = data.get('dungeon', DEFAULT_DUNGEON_ID)
+        if dungeon_id not in list_dungeons():
+            return jsonify({'error': 'Dungeon não encontrada'}), 400
+
+        # Semente da partida: informada, do desafio diário ou aleatória
+        seed = data.get('seed')
+        if data.get('daily'):
+            seed = daily_seed()
+        elif seed is not None:
+            try:
+                seed = int(seed)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Semente inválida'}), 400
         
         # Cria novo jogador e mundo
         player = Player(name, player_class)
-        world = World()
+        world = World(dungeon_id, seed=seed)
+        player.position = world.dungeon.start_room
         
         # Gera ID único para a sessão
         game_id = secrets.token_hex(8)
@@ -342,7 +517,7 @@ def new_game():
             'save_filename': None,
         }
         
-        return jsonify({'success': True, 'game_id': game_id})
+        return jsonify({'success': True, 'game_id': game_id, 'seed': world.rng.run_seed})
     
     return render_template('new_game.html')
 
@@ -395,7 +570,7 @@ def get_game_state():
     player.sync_companion_progression()
 
     # Garante progresso do mapa na interface web
-    world.visited_rooms.add(player.position)
+    world.visit_room(player.position)
 
     room = world.get_room(player.position)
     special_boss = get_special_boss_state(player, world, player.position)
@@ -450,7 +625,8 @@ def get_game_state():
             'special_boss_locked_message': special_boss['locked_message'] if special_boss else None,
             'combat_button_label': multi_enemy['button_label'] if multi_enemy else None,
         },
-        'directions': world.get_available_directions(player.position)
+        'directions': world.get_available_directions(player.position),
+        'seed': world.rng.run_seed,
     })
 
 
@@ -577,6 +753,7 @@ def unlock_companion_skill_api():
     success, payload = unlock_companion_skill(companion, skill_id, player.level)
     if not success:
         return jsonify({'success': False, 'message': payload})
+    player.mark_dirty('companions')
 
     return jsonify({
         'success': True,
@@ -619,16 +796,19 @@ def equip_companion_weapon_api():
     if getattr(item, 'companion_class', None) != companion.get('companion_class'):
         return jsonify({'success': False, 'message': 'Essa arma não pertence à classe desse companion.'})
 
-    previous_weapon_name = companion.get('weapon_item_name')
-    if previous_weapon_name:
-        previous_item = get_item_registry().get(previous_weapon_name)
+    # Companions salvos antes dos ids estáveis guardam apenas o nome exibido
+    previous_weapon_key = companion.get('weapon_item_id') or companion.get('weapon_item_name')
+    if previous_weapon_key:
+        previous_item = get_item_registry().resolve(previous_weapon_key)
         if previous_item:
             player.add_to_inventory(previous_item)
 
-    player.inventory.pop(item_index)
+    player.remove_from_inventory(item)
     companion['weapon_name'] = item.name
     companion['weapon_bonus'] = getattr(item, 'attack_bonus', 0)
-    companion['weapon_item_name'] = item.name
+    companion['weapon_item_id'] = item.item_id
+    companion.pop('weapon_item_name', None)
+    player.mark_dirty('companions')
 
     return jsonify({
         'success': True,
@@ -656,7 +836,7 @@ def move():
     
     if new_room:
         player.position = new_room
-        world.visited_rooms.add(new_room)
+        world.visit_room(new_room)
         room_npc = serialize_room_npc(world.get_room(new_room), player)
 
         if world.is_exit(new_room):
@@ -696,7 +876,7 @@ def get_status_data():
     player = game_data['player']
     world = game_data['world']
 
-    world.visited_rooms.add(player.position)
+    world.visit_room(player.position)
     total_rooms = len(world.rooms)
     visited_count = len(world.visited_rooms)
     defeated_count = len(world.defeated_enemies)
@@ -782,8 +962,8 @@ def get_inventory():
 
     player = active_games[game_id]['player']
 
+    # Consumíveis já vêm empilhados: uma entrada por tipo, com 'count'
     items = []
-    consumable_groups = {}
     for idx, item in enumerate(player.inventory):
         item_data = {
             'index': idx,
@@ -791,7 +971,7 @@ def get_inventory():
             'type': item.item_type,
             'description': getattr(item, 'description', ''),
             'action': 'equipar',
-            'count': 1,
+            'count': item.count,
         }
 
         if item.item_type == 'weapon':
@@ -812,15 +992,7 @@ def get_inventory():
         else:
             item_data['action'] = 'info'
 
-        if item.item_type == 'consumable':
-            key = item.name
-            if key in consumable_groups:
-                consumable_groups[key]['count'] += 1
-            else:
-                consumable_groups[key] = item_data
-                items.append(consumable_groups[key])
-        else:
-            items.append(item_data)
+        items.append(item_data)
 
     return jsonify({
         'items': items,
@@ -871,8 +1043,12 @@ def inventory_action():
         return jsonify({'success': False, 'message': 'Essa arma foi feita para um companion, não para o herói.'})
 
     if item.item_type == 'consumable':
-        success = player.use_item(item_index)
-        message = f'{item.name} usado com sucesso!' if success else f'Não foi possível usar {item.name}.'
+        notes = []
+        success = player.use_item(item_index, report=notes.append)
+        if success:
+            message = f'{item.name} usado com sucesso!'
+        else:
+            message = notes[-1].strip() if notes else f'Não foi possível usar {item.name}.'
         return jsonify({'success': success, 'message': message})
 
     if item.item_type == 'weapon':
@@ -904,14 +1080,20 @@ def save_current_game():
     use_current = bool(data.get('use_current')) and current_save_filename
     filename = current_save_filename if use_current else sanitize_save_filename(data.get('filename'))
 
-    save_mgr = SaveManager()
-    filepath = save_mgr.save_game(game_data['player'], game_data['world'], filename)
-
+    combat_state = get_combat_session_state(game_data)
+    if autosave is not None:
+        # Grava já (fora da fila): o sucesso só é respondido com o arquivo no disco
+        filepath = autosave.save_now(game_data['player'], game_data['world'], filename, combat_state=combat_state)
+    else:
+        filepath = SaveManager().save_game(game_data['player'], game_data['world'], filename, combat_state=combat_state)
     if not filepath:
         return jsonify({'success': False, 'message': 'Não foi possível salvar o jogo.'})
-
     saved_filename = os.path.basename(filepath)
+
     game_data['save_filename'] = saved_filename
+    if game_data.get('autosave_filename') == saved_filename:
+        # Salvo de propósito por cima do autosave: o arquivo passa a ser do jogador
+        game_data.pop('autosave_filename')
 
     return jsonify({
         'success': True,
@@ -923,24 +1105,33 @@ def save_current_game():
 @app.route('/api/load/<path:filename>', methods=['POST'])
 def load_save_file(filename):
     """Carrega um save salvo em disco para a sessão web."""
-    save_mgr = SaveManager()
-    player, world = save_mgr.load_game(filename)
+    if autosave is not None and not autosave.flush(AUTOSAVE_FLUSH_TIMEOUT):
+        # O arquivo no disco continua íntegro (escrita atômica), só pode estar um pouco atrás
+        print(f"\n⚠️ Autosave ainda gravando; carregando {filename} como está no disco")
+    save_mgr = get_save_manager()
+    player, world, combat_state = save_mgr.load_game_session(filename)
 
     if not player or not world:
         return jsonify({'success': False, 'message': 'Não foi possível carregar o save selecionado.'}), 404
 
-    clear_current_game()
+    clear_current_game(keep_save=filename)
     game_id = secrets.token_hex(8)
     session['game_id'] = game_id
-    active_games[game_id] = {
+    game_data = {
         'player': player,
         'world': world,
         'save_filename': filename,
     }
+    if filename.startswith('autosave_'):
+        # Continua gravando no mesmo autosave em vez de abrir outro arquivo
+        game_data['autosave_filename'] = filename
+    # Save feito no meio de uma luta volta direto para o combate
+    resumed_combat = bool(combat_state) and restore_combat_session(game_data, combat_state)
+    active_games[game_id] = game_data
 
     return jsonify({
         'success': True,
-        'redirect_url': url_for('game'),
+        'redirect_url': url_for('combat_page') if resumed_combat else url_for('game'),
         'message': f'Save {filename} carregado com sucesso!'
     })
 
@@ -957,9 +1148,7 @@ def get_map_data():
     player = game_data['player']
     world = game_data['world']
 
-    from minimap import MiniMap
-    mini_map = MiniMap(world)
-    positions = mini_map.room_positions
+    positions = world.dungeon.positions
 
     rooms = []
     for room_id, room in world.rooms.items():
@@ -1002,6 +1191,56 @@ def get_map_data():
     })
 
 
+ROUTE_TARGETS = ('treasure', 'enemy', 'exit')
+
+
+@app.route('/api/route')
+def get_route():
+    """Rota até o baú não saqueado, inimigo vivo e saída mais próximos.
+
+    ?target=treasure|enemy|exit limita a um tipo de alvo; ?to=<sala> pede a
+    rota até uma sala específica. As rotas vêm das tabelas pré-computadas da
+    dungeon, sem busca por request.
+    """
+    game_id = session.get('game_id')
+
+    if not game_id or game_id not in active_games:
+        return jsonify({'error': 'Jogo não encontrado'}), 404
+
+    game_data = active_games[game_id]
+    player = game_data['player']
+    world = game_data['world']
+
+    def route_payload(room_id):
+        if room_id is None:
+            return None
+        steps = world.route(player.position, room_id)
+        if steps is None:
+            return None
+        return {
+            'room': room_id,
+            'name': world.get_room(room_id).get('name', f'Sala {room_id}'),
+            'distance': len(steps),
+            'steps': [{'direction': direction, 'room': target} for direction, target in steps],
+        }
+
+    to_room = request.args.get('to')
+    if to_room is not None:
+        if to_room not in world.dungeon.room_index:
+            return jsonify({'error': 'Sala não encontrada'}), 404
+        return jsonify({'from': player.position, 'route': route_payload(to_room)})
+
+    target = request.args.get('target')
+    if target is not None and target not in ROUTE_TARGETS:
+        return jsonify({'error': 'Alvo inválido'}), 400
+    targets = (target,) if target else ROUTE_TARGETS
+
+    return jsonify({
+        'from': player.position,
+        'routes': {name: route_payload(world.nearest(player.position, name)) for name in targets},
+    })
+
+
 @app.route('/skills')
 def skills_page():
     """Página da árvore de habilidades"""
@@ -1013,6 +1252,28 @@ def skills_page():
     return render_template('skills.html')
 
 
+@lru_cache(maxsize=None)
+def get_skills_template(player_class):
+    """Dados fixos das skills da classe, agrupados por caminho (montados uma vez)"""
+    from skill_tree import get_skill_tree
+
+    template = {}
+    for skill_id, skill in get_skill_tree(player_class).get_all_skills().items():
+        template.setdefault(skill.path, []).append((skill, {
+            'id': skill_id,
+            'name': skill.name,
+            'description': skill.description,
+            'tier': skill.tier,
+            'path': skill.path,
+            'cost_pa': get_skill_pa_cost(skill),
+            'cooldown': skill.cooldown,
+            'power': skill.power,
+            'requirements': list(skill.requirements),
+            'is_passive': skill.is_passive,
+        }))
+    return tuple((path, tuple(path_skills)) for path, path_skills in template.items())
+
+
 @app.route('/api/skills')
 def get_skills():
     """Retorna todas as skills da classe do jogador"""
@@ -1024,26 +1285,18 @@ def get_skills():
     game_data = active_games[game_id]
     player = game_data['player']
     
-    # Organizar skills por caminho
+    # Parte fixa vem do template da classe; só o estado do jogador é montado aqui
+    unlocked_skills = set(player.unlocked_skills)
     skills_data = {}
-    for skill_id, skill in player.skill_tree.get_all_skills().items():
-        if skill.path not in skills_data:
-            skills_data[skill.path] = []
-        
-        skills_data[skill.path].append({
-            'id': skill_id,
-            'name': skill.name,
-            'description': skill.description,
-            'tier': skill.tier,
-            'path': skill.path,
-            'cost_pa': get_skill_pa_cost(skill),
-            'cooldown': skill.cooldown,
-            'power': skill.power,
-            'requirements': skill.requirements,
-            'is_passive': skill.is_passive,
-            'unlocked': skill_id in player.unlocked_skills,
-            'can_unlock': skill.can_unlock(player.unlocked_skills)
-        })
+    for path, path_skills in get_skills_template(player.player_class):
+        skills_data[path] = [
+            {
+                **skill_data,
+                'unlocked': skill.skill_id in unlocked_skills,
+                'can_unlock': skill.can_unlock(unlocked_skills),
+            }
+            for skill, skill_data in path_skills
+        ]
     
     return jsonify({
         'skills': skills_data,
@@ -1079,10 +1332,26 @@ def unlock_skill():
 
 @app.route('/saves')
 def saves():
-    """Lista saves disponíveis"""
-    save_mgr = SaveManager()
-    saves_list = save_mgr.list_saves()
-    return render_template('saves.html', saves=saves_list)
+    """Lista saves disponíveis (paginada, ?sort=timestamp|player|level)"""
+    if autosave is not None and not autosave.flush(AUTOSAVE_FLUSH_TIMEOUT):
+        print("\n⚠️ Autosave ainda gravando; a lista pode não ter os saves mais recentes")
+    save_mgr = get_save_manager()
+    sort_by = request.args.get('sort', 'timestamp')
+    if sort_by not in SAVE_SORT_KEYS:
+        sort_by = 'timestamp'
+    listing = save_mgr.list_saves_page(
+        page=request.args.get('page', 1, type=int),
+        per_page=SAVES_PER_PAGE,
+        sort_by=sort_by,
+    )
+    return render_template(
+        'saves.html',
+        saves=listing['saves'],
+        page=listing['page'],
+        pages=listing['pages'],
+        total=listing['total'],
+        sort_by=sort_by,
+    )
 
 
 @app.route('/combat')
@@ -1096,6 +1365,20 @@ def combat_page():
     return render_template('combat.html')
 
 
+@app.route('/api/sessions/stats')
+def get_session_stats():
+    """Retorna contadores do store de jogos ativos (residentes, despejados, reidratados)"""
+    return jsonify(active_games.stats())
+
+
+@app.route('/api/autosave/stats')
+def get_autosave_stats():
+    """Retorna fila e latência de escrita do autosave"""
+    if autosave is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **autosave.stats()})
+
+
 @app.route('/api/combat/start', methods=['POST'])
 def start_combat():
     """Inicia um combate"""
@@ -1123,7 +1406,7 @@ def start_combat():
         player.remove_from_inventory(special_boss['rune'])
 
         from combat_pa import CombatPA
-        combat = CombatPA(player, enemy)
+        combat = CombatPA(player, enemy, sink=NULL_SINK, rng=world.rng)
 
         game_data['combat'] = combat
         game_data['in_combat'] = True
@@ -1142,18 +1425,19 @@ def start_combat():
 
     if multi_enemy:
         enemy_names = multi_enemy['enemy_names']
-        first_enemy = world.create_enemy_by_name(enemy_names[0])
+        enemies = world.spawn_room_enemies(player.position)
 
-        if not first_enemy:
+        if len(enemies) != len(enemy_names):
             return jsonify({'success': False, 'message': 'Erro ao iniciar o desafio final!'})
+        first_enemy = enemies[0]
 
         from combat_pa import CombatPA
-        combat = CombatPA(player, first_enemy)
+        combat = CombatPA(player, first_enemy, sink=NULL_SINK, rng=world.rng)
 
         game_data['combat'] = combat
         game_data['in_combat'] = True
         game_data['combat_intro'] = multi_enemy['intro_message']
-        game_data['multi_enemy_queue'] = enemy_names[1:]
+        game_data['multi_enemy_queue'] = enemies[1:]  # Inimigos já criados, na ordem do combate
         game_data['multi_enemy_room_id'] = player.position
         game_data['multi_enemy_total'] = len(enemy_names)
         game_data['multi_enemy_progress'] = 1
@@ -1181,7 +1465,7 @@ def start_combat():
     
     # Cria instância de combate
     from combat_pa import CombatPA
-    combat = CombatPA(player, enemy)
+    combat = CombatPA(player, enemy, sink=NULL_SINK, rng=world.rng)
     
     # Armazena combate na sessão
     game_data['combat'] = combat
@@ -1194,6 +1478,61 @@ def start_combat():
     })
 
 
+@app.route('/api/combat/preview')
+def combat_preview():
+    """Chance de vitória estimada contra o(s) inimigo(s) da sala atual.
+
+    ?enemy=<chave> estima contra um inimigo específico. Em salas com vários
+    inimigos cada duelo é estimado com o HP atual e a chance total é o
+    produto das chances (aproximação).
+    """
+    import combat_estimator
+
+    game_id = session.get('game_id')
+
+    if not game_id or game_id not in active_games:
+        return jsonify({'error': 'Jogo não encontrado'}), 404
+
+    if not combat_estimator.is_available():
+        return jsonify({'error': 'Preview de combate indisponível (numpy não instalado)'}), 503
+
+    game_data = active_games[game_id]
+    player = game_data['player']
+    world = game_data['world']
+    room = world.get_room(player.position) or {}
+
+    enemy_names = None
+    if request.args.get('enemy'):
+        enemy_names = [request.args['enemy']]
+    else:
+        special_boss = get_special_boss_state(player, world, player.position)
+        multi_enemy = get_multi_enemy_state(world, player.position)
+        if special_boss:
+            enemy_names = [special_boss['boss_name']]
+        elif multi_enemy:
+            enemy_names = multi_enemy['enemy_names']
+        elif world.has_enemy(player.position) and room.get('enemy'):
+            enemy_names = [room['enemy']]
+
+    if not enemy_names:
+        return jsonify({'error': 'Não há inimigo nesta sala'}), 404
+
+    try:
+        estimates = [combat_estimator.estimate_fight(player, enemy_name) for enemy_name in enemy_names]
+    except ValueError:
+        return jsonify({'error': 'Inimigo não encontrado'}), 404
+
+    win_chance = 1.0
+    for estimate in estimates:
+        win_chance *= estimate['win_chance']
+
+    return jsonify({
+        'room': player.position,
+        'win_chance': win_chance,
+        'fights': estimates,
+    })
+
+
 @app.route('/api/combat/state')
 def get_combat_state_api():
     """Retorna estado atual do combate"""
@@ -1243,72 +1582,49 @@ def combat_action():
     data = request.json
     action = data.get('action')
     
-    messages = []
+    # Eventos do motor nesta requisição (nada vai para o stdout); o log da
+    # tela (messages) sai deles, junto com as linhas próprias da web (report)
+    events = JsonEventCollector()
+    combat.sink = events
     success = False
+
+    def report(message, kind='info'):
+        events.emit(CombatEvent(kind, message))
     
     if action == 'attack':
         success = combat.player_attack()
-        if success:
-            messages.append(f"Você atacou {combat.enemy.name}!")
-            messages.append("💡 Você ganhará +1 PA extra no próximo turno!")
-            messages.append("⏭️ Turno encerrado após ataque.")
     
     elif action == 'defend':
         success = combat.player_defend()
-        if success:
-            messages.append("🛡️ Você está defendendo!")
-            messages.append("⏭️ Seu turno termina automaticamente!")
     
     elif action == 'skill':
         skill_id = data.get('skill_id')
         if skill_id:
             success = combat.player_use_skill(skill_id)
-            if success:
-                skill = player.skill_tree.get_skill(skill_id)
-                messages.append(f"Você usou {skill.name}!")
-                messages.append("⏭️ Turno encerrado após habilidade.")
     
     elif action == 'item':
         item_idx = data.get('item_idx')
         if item_idx is not None:
             success = combat.player_use_item(item_idx)
-            if success:
-                messages.append("Item usado!")
-                messages.append("⏭️ Turno encerrado após item.")
     
     elif action == 'flee':
         success = combat.attempt_flee()
-        if success:
-            messages.append("Você fugiu!")
     
     elif action == 'end_turn':
         # Termina turno do jogador sem zerar PA (preserva PA restante)
-        messages.append("⏭️ Turno terminado!")
         success = True
 
-    # Ações que encerram o turno também liberam a ação automática do companheiro.
+    # Na web, agir encerra o turno do jogador (regeneração das passivas) e
+    # libera a ação automática do companheiro.
     if action in ['attack', 'defend', 'skill', 'item', 'end_turn'] and success and not combat.is_combat_over():
-        companion_actions = combat.companion_turn()
-        for companion_action in companion_actions:
-            messages.append(companion_action['message'])
-            if companion_action.get('damage', 0) > 0:
-                messages.append(f"💥 {companion_action['name']} causou {companion_action['damage']} de dano!")
-            if companion_action.get('heal', 0) > 0:
-                messages.append(f"💚 {companion_action['name']} restaurou {companion_action['heal']} HP!")
-            if companion_action.get('effect') == 'damage_guard':
-                messages.append(f"🛡️ {companion_action['name']} reforçou sua defesa para o próximo ataque!")
-            if companion_action.get('effect') == 'damage_freeze':
-                messages.append(f"❄️ {companion_action['name']} congelou o alvo por um instante!")
-            if companion_action.get('effect') == 'damage_poison':
-                messages.append(f"☠️ {companion_action['name']} deixou veneno natural agindo no alvo!")
+        combat.end_player_turn()
+        combat.companion_turn()
 
         if not combat.is_combat_over():
             combat.enemy_turn()
-            messages.append(f"{combat.enemy.name} realizou suas ações!")
 
         if not combat.is_combat_over():
             combat.start_player_turn()
-            messages.append(f"✨ Novo turno! {combat.player_pa} PA disponível")
     
     # Verifica se combate acabou
     combat_over = combat.is_combat_over()
@@ -1324,35 +1640,23 @@ def combat_action():
         is_multi_enemy_room = game_data.get('multi_enemy_room_id') == room_id
         
         if result == 'victory':
-            player.gain_xp(combat.enemy.xp_reward, auto_distribute=True)
-            messages.append(f"Você derrotou {combat.enemy.name}!")
-            messages.append(f"+{combat.enemy.xp_reward} XP!")
+            report(f"Você derrotou {combat.enemy.name}!")
+            player.gain_xp(combat.enemy.xp_reward, auto_distribute=True, report=report)
 
             if is_multi_enemy_room and game_data.get('multi_enemy_queue'):
-                next_enemy_name = game_data['multi_enemy_queue'].pop(0)
-                next_enemy = world.create_enemy_by_name(next_enemy_name)
-
-                if not next_enemy:
-                    clear_multi_enemy_progress(game_data)
-                    return jsonify({
-                        'success': False,
-                        'messages': messages + ['❌ Erro ao preparar o próximo inimigo.'],
-                        'combat_state': get_combat_state_data(combat, player),
-                        'combat_over': True,
-                        'result': 'defeat',
-                        'reward_summary': None
-                    })
+                next_enemy = game_data['multi_enemy_queue'].pop(0)
 
                 player.heal(15)
                 player.restore_mana(10)
                 from combat_pa import CombatPA
-                combat = CombatPA(player, next_enemy)
+                combat = CombatPA(player, next_enemy, sink=events, rng=world.rng)
                 game_data['combat'] = combat
                 game_data['in_combat'] = True
                 game_data['multi_enemy_progress'] = game_data.get('multi_enemy_progress', 1) + 1
-                messages.append('💚 Você recupera 15 HP e 10 mana antes do próximo duelo!')
-                messages.append(
-                    f"⚔️ Próximo combate {game_data['multi_enemy_progress']}/{game_data.get('multi_enemy_total', game_data['multi_enemy_progress'])}: {next_enemy.name}!"
+                report('💚 Você recupera 15 HP e 10 mana antes do próximo duelo!', kind='heal')
+                report(
+                    f"⚔️ Próximo combate {game_data['multi_enemy_progress']}/{game_data.get('multi_enemy_total', game_data['multi_enemy_progress'])}: {next_enemy.name}!",
+                    kind='turn',
                 )
                 combat_over = False
                 result = None
@@ -1376,9 +1680,11 @@ def combat_action():
         elif result in {'defeat', 'fled'}:
             clear_multi_enemy_progress(game_data)
     
+    combat.sink = NULL_SINK
     return jsonify({
         'success': success,
-        'messages': messages,
+        'messages': events.messages(),
+        'events': events.events,
         'combat_state': get_combat_state_data(combat, player),
         'combat_over': combat_over,
         'result': result,
@@ -1435,14 +1741,15 @@ def get_available_skills(player, combat):
             else:
                 pa_cost = combat.PA_COSTS['skill_tier1']
             
-            can_use = (combat.player_pa >= pa_cost and skill.current_cooldown == 0)
+            current_cooldown = player.get_skill_cooldown(skill_id)
+            can_use = (combat.player_pa >= pa_cost and current_cooldown == 0)
             
             skills.append({
                 'id': skill_id,
                 'name': skill.name,
                 'description': skill.description,
                 'pa_cost': pa_cost,
-                'cooldown': skill.current_cooldown,
+                'cooldown': current_cooldown,
                 'can_use': can_use
             })
     
@@ -1458,7 +1765,8 @@ def get_available_items(player):
             items.append({
                 'index': idx,
                 'name': item.name,
-                'description': getattr(item, 'description', '')
+                'description': getattr(item, 'description', ''),
+                'count': item.count,
             })
     
     return items
@@ -0,0 +1,247 @@
+"""
+Autosave em segundo plano com escrita atômica.
+
+O request só monta os dados do save (SaveManager.prepare_save, que remonta
+apenas as seções alteradas desde o último save do arquivo) e entrega para
+o AutosaveService; uma thread dedicada grava o arquivo com temporário +
+fsync + rename (SaveManager.write_save). Assim um disco lento não trava a
+resposta e uma queda no meio da escrita nunca deixa um save pela metade.
+
+Rajadas de eventos do mesmo jogo (andar por várias salas seguidas, vencer
+uma luta e subir de nível...) são agrupadas: enquanto um save espera na
+fila, um novo pedido para o mesmo arquivo só troca os dados pendentes, e
+o arquivo é gravado uma vez com o estado mais recente, no máximo `delay`
+segundos depois do primeiro pedido.
+
+Um pedido para um arquivo que já tem exatamente o estado atual do jogo
+(nenhuma seção alterada desde o último save, ver dirty_tracking.py) é
+descartado sem montar nada.
+
+Saves manuais usam save_now(): gravam na hora, no request, para a resposta
+só confirmar o save depois do arquivo no disco. Um autosave pendente do
+mesmo arquivo é descartado (ficaria mais velho que o save manual).
+
+stats() expõe profundidade da fila e latência de escrita (rota
+/api/autosave/stats do app_web).
+"""
+import atexit
+import os
+import threading
+import time
+
+from save_manager import SaveManager
+
+# Segundos que um save espera na fila para agrupar pedidos seguidos
+DEFAULT_COALESCE_DELAY = 0.5
+
+
+class AutosaveService:
+    """Fila de saves gravados por uma thread em segundo plano"""
+
+    def __init__(self, save_manager=None, delay=DEFAULT_COALESCE_DELAY):
+        self.save_manager = save_manager or SaveManager()
+        self.delay = delay
+        self._pending = {}  # arquivo -> [save_data, momento de gravar, marca do save]
+        self._writing = 0
+        self._in_flight = set()  # Arquivos sendo gravados agora (por qualquer thread)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._counters = {
+            "written": 0,
+            "coalesced": 0,
+            "skipped": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+        }
+        self._latencies = {"last": 0.0, "total": 0.0, "max": 0.0}
+
+    def submit(self, filename, save_data, immediate=False, mark=None):
+        """Enfileira um save já montado (immediate=True grava sem esperar o agrupamento)"""
+        due = time.monotonic() + (0 if immediate else self.delay)
+        with self._condition:
+            pending = self._pending.get(filename)
+            if pending is not None:
+                # Mesmo arquivo ainda na fila: grava só o estado mais recente
+                pending[0] = save_data
+                pending[1] = min(pending[1], due)
+                pending[2] = mark
+                self._counters["coalesced"] += 1
+            else:
+                self._pending[filename] = [save_data, due, mark]
+                self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], len(self._pending))
+            self._ensure_thread()
+            self._condition.notify()
+        return filename
+
+    def schedule(self, player, world, filename=None, combat_state=None, immediate=False):
+        """Monta o save agora (no request) e enfileira a gravação. Retorna o nome final"""
+        filename = self.save_manager.resolve_save_filename(filename)
+        prepared = self.save_manager.prepare_save(player, world, filename, combat_state)
+        if prepared is None:
+            with self._condition:
+                self._counters["skipped"] += 1
+            return filename
+        save_data, mark = prepared
+        return self.submit(filename, save_data, immediate=immediate, mark=mark)
+
+    def save_now(self, player, world, filename=None, combat_state=None):
+        """Grava o save no request (fora da fila). Retorna o caminho ou None se falhar"""
+        save_manager = self.save_manager
+        filename = save_manager.resolve_save_filename(filename)
+        with self._condition:
+            self._claim(filename)
+        try:
+            prepared = save_manager.prepare_save(player, world, filename, combat_state)
+            if prepared is None:
+                with self._condition:
+                    self._counters["skipped"] += 1
+                return os.path.join(save_manager.save_dir, filename)
+            save_data, mark = prepared
+            started = time.perf_counter()
+            filepath = save_manager.write_save(filename, save_data, mark)
+            elapsed = time.perf_counter() - started
+            with self._condition:
+                self._record_write(filepath, elapsed)
+            return filepath
+        finally:
+            with self._condition:
+                self._release(filename)
+
+    def discard(self, filename):
+        """Cancela o autosave pendente de um arquivo e apaga o arquivo (jogo encerrado)"""
+        with self._condition:
+            self._claim(filename)
+        try:
+            self.save_manager.delete_save(filename)
+        finally:
+            with self._condition:
+                self._release(filename)
+
+    def flush(self, timeout=None):
+        """Grava tudo que está na fila e espera terminar. False se estourar o timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            now = time.monotonic()
+            for pending in self._pending.values():
+                pending[1] = now
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                if (self._thread is None or not self._thread.is_alive()) and self._write_due(force=True):
+                    # Sem thread (parada ou nunca iniciada): grava aqui mesmo
+                    continue
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stop(self, timeout=None):
+        """Grava o que falta e encerra a thread"""
+        self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Fila, saves gravados/agrupados/descartados/falhos e latência de escrita (ms)"""
+        with self._condition:
+            written = self._counters["written"]
+            return {
+                "queue_depth": len(self._pending) + self._writing,
+                **self._counters,
+                "last_write_ms": round(self._latencies["last"] * 1000, 3),
+                "avg_write_ms": round(self._latencies["total"] / written * 1000, 3) if written else 0.0,
+                "max_write_ms": round(self._latencies["max"] * 1000, 3),
+            }
+
+    def _claim(self, filename):
+        """Tira o arquivo da fila e espera a gravação em andamento dele (com o lock)"""
+        if self._pending.pop(filename, None) is not None:
+            self._counters["coalesced"] += 1
+        while filename in self._in_flight:
+            self._condition.wait()
+        self._in_flight.add(filename)
+
+    def _release(self, filename):
+        self._in_flight.discard(filename)
+        self._condition.notify_all()
+
+    def _record_write(self, filepath, elapsed):
+        """Atualiza contadores e latência de uma gravação (com o lock)"""
+        if filepath:
+            self._counters["written"] += 1
+            self._latencies["last"] = elapsed
+            self._latencies["total"] += elapsed
+            self._latencies["max"] = max(self._latencies["max"], elapsed)
+        else:
+            self._counters["failed"] += 1
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                ready = [due for filename, (_, due, _) in self._pending.items() if filename not in self._in_flight]
+                if not ready:
+                    # Nada na fila (ou só arquivos que um save_now está gravando)
+                    self._condition.wait()
+                    continue
+                wait = min(ready) - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                self._write_due()
+
+    def _write_due(self, force=False):
+        """Grava os saves vencidos (chamado com o lock; solta durante o disco). Retorna quantos"""
+        now = time.monotonic()
+        batch = [
+            (filename, save_data, mark)
+            for filename, (save_data, due, mark) in self._pending.items()
+            if (force or due <= now) and filename not in self._in_flight
+        ]
+        for filename, _, _ in batch:
+            del self._pending[filename]
+            self._in_flight.add(filename)
+        self._writing += len(batch)
+
+        for filename, save_data, mark in batch:
+            self._condition.release()
+            started = time.perf_counter()
+            try:
+                filepath = self.save_manager.write_save(filename, save_data, mark)
+            except Exception as e:
+                # A thread não pode morrer: flush() esperaria para sempre
+                print(f"\n❌ Erro no autosave de {filename}: {e}")
+                filepath = None
+            finally:
+                elapsed = time.perf_counter() - started
+                self._condition.acquire()
+            self._writing -= 1
+            self._in_flight.discard(filename)
+            self._record_write(filepath, elapsed)
+        self._condition.notify_all()
+        return len(batch)
+
+
+def create_autosave_service():
+    """Cria o autosave configurado por variáveis de ambiente (ou None se desligado).
+
+    DUNGEON_AUTOSAVE: "0" desliga o autosave (saves manuais continuam funcionando)
+    DUNGEON_AUTOSAVE_DELAY: segundos de agrupamento dos saves (padrão 0.5)
+    """
+    if os.environ.get("DUNGEON_AUTOSAVE", "1").strip() == "0":
+        return None
+    delay = float(os.environ.get("DUNGEON_AUTOSAVE_DELAY", DEFAULT_COALESCE_DELAY))
+    service = AutosaveService(delay=delay)
+    # Saves ainda na fila são gravados antes do processo terminar
+    atexit.register(service.stop)
+    return service
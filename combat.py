@@ -48,7 +48,11 @@ class Combat:
     def enemy_attack(self):
         """Turno de ataque do inimigo"""
         # Obtém dano do inimigo (pode incluir habilidade especial)
-        attack_damage = self.enemy.get_attack_damage()
+        attack_damage, special = self.enemy.next_attack()
+        if special:
+            print(special['message'])
+            if special['heal'] > 0:
+                print(f"💚 {self.enemy.name} recuperou {special['heal']} HP!")
         
         damage = self.calculate_damage(
             attack_damage,
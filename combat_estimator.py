@@ -0,0 +1,145 @@
+"""
+Estimador vetorizado (NumPy) do resultado de um combate.
+
+Em vez de jogar combate por combate como o combat_simulator, avalia
+dezenas de milhares de duelos de uma vez como arrays: cada posição do
+array é um combate. Usado pelo preview de combate do app_web para mostrar
+a chance de vitória antes de entrar na luta.
+
+Modelo (o mesmo fluxo de turnos do app_web):
+    - o jogador usa ataque básico a cada turno (crítico, multiplicadores
+      passivos, Fúria Crescente conforme o HP e roubo de vida) e regenera
+      o HP das passivas de regeneração no fim do turno;
+    - o inimigo faz dois ataques por turno (4 PA, 2 por ataque), seguindo
+      o ciclo de ataques especiais do próprio next_attack.
+Habilidades ativas e companheiros não entram na estimativa.
+
+Sem numpy (ver numpy_support.py) o app_web responde que o preview está
+indisponível.
+"""
+from functools import lru_cache
+
+from combat_pa import BASIC_ATTACK_CRIT_CHANCE, CRIT_MULTIPLIER
+from combat_simulator import MAX_TURNS
+from enemy import create_enemy, resolve_enemy_key
+from numpy_support import is_available, np
+
+DEFAULT_TRIALS = 20000
+
+# Ataques do inimigo por turno (enemy_max_pa 4, cada ataque custa 2 PA)
+ENEMY_ATTACKS_PER_TURN = 2
+
+# Ataques amostrados para montar o ciclo (MMC dos ciclos de 3 e 4 ataques)
+ATTACK_CYCLE_LENGTH = 12
+
+
+@lru_cache(maxsize=None)
+def enemy_attack_cycle(enemy_key):
+    """Ciclo de (dano, cura própria) dos ataques do inimigo.
+
+    Amostrado do next_attack de um inimigo novo, então segue
+    automaticamente os ataques especiais definidos em enemy.py
+    (ex.: Orc Chief dobra o dano a cada 3 ataques, Necromante se cura).
+    """
+    enemy = create_enemy(enemy_key)
+    cycle = []
+    for _ in range(ATTACK_CYCLE_LENGTH):
+        enemy.hp = 1  # Cura própria sem esbarrar no HP máximo
+        damage, special = enemy.next_attack()
+        cycle.append((damage, special['heal'] if special else 0))
+    return tuple(cycle)
+
+
+def player_combat_stats(player):
+    """Números do jogador que entram no ataque básico e na defesa"""
+    profile = player.get_passive_profile()
+    return {
+        'hp': player.hp,
+        'max_hp': player.max_hp,
+        'attack': player.get_total_attack(),
+        'defense': int(player.get_total_defense() * profile['defense_multiplier']),
+        'crit_chance': BASIC_ATTACK_CRIT_CHANCE + profile['crit_chance'] / 100,
+        'damage_multiplier': profile['damage_multiplier'],
+        'fury_power': profile['fury_power'],
+        'lifesteal': profile['lifesteal'],
+        # Mesmo arredondamento do CombatPA.end_player_turn
+        'hp_regen': int(profile['regen_fraction'] * player.max_hp),
+    }
+
+
+def estimate_outcome(stats, enemy_key, trials=DEFAULT_TRIALS, max_turns=MAX_TURNS, seed=None):
+    """Probabilidades de vitória/derrota de `stats` contra o inimigo `enemy_key`"""
+    if np is None:
+        raise RuntimeError("numpy não está instalado")
+    key = resolve_enemy_key(enemy_key)
+    if key is None:
+        raise ValueError(f"Inimigo desconhecido: {enemy_key}")
+
+    enemy = create_enemy(key)
+    cycle = enemy_attack_cycle(key)
+    rng = np.random.default_rng(seed)
+
+    max_hp = stats['max_hp']
+    player_hp = np.full(trials, stats['hp'], dtype=np.int64)
+    enemy_hp = np.full(trials, enemy.hp, dtype=np.int64)
+    active = np.ones(trials, dtype=bool)
+    won = np.zeros(trials, dtype=bool)
+    end_turn = np.zeros(trials, dtype=np.int64)
+    attack_index = 0
+
+    for turn in range(1, max_turns + 1):
+        # Ataque básico do jogador
+        multiplier = stats['damage_multiplier']
+        if stats['fury_power']:
+            multiplier = multiplier + (1.0 - player_hp / max_hp) * stats['fury_power'] / 100
+        attack = (stats['attack'] * np.broadcast_to(multiplier, (trials,))).astype(np.int64)
+        damage = attack - enemy.defense
+        critical = rng.random(trials) < stats['crit_chance']
+        damage = np.where(critical, (damage * CRIT_MULTIPLIER).astype(np.int64), damage)
+        damage = np.maximum(1, damage)
+
+        if stats['lifesteal'] > 0:
+            heal = (damage * (stats['lifesteal'] / 100)).astype(np.int64)
+            player_hp = np.where(active, np.minimum(max_hp, player_hp + heal), player_hp)
+        enemy_hp = np.where(active, np.maximum(0, enemy_hp - damage), enemy_hp)
+
+        victories = active & (enemy_hp <= 0)
+        won |= victories
+        end_turn[victories] = turn
+        active &= ~victories
+
+        # Fim do turno do jogador: regeneração das passivas
+        if stats.get('hp_regen', 0) > 0:
+            player_hp = np.where(active, np.minimum(max_hp, player_hp + stats['hp_regen']), player_hp)
+
+        # Turno do inimigo: mesmo ciclo para todos os combates ainda ativos
+        for _ in range(ENEMY_ATTACKS_PER_TURN):
+            enemy_damage, enemy_heal = cycle[attack_index % len(cycle)]
+            attack_index += 1
+            player_hp = np.where(active, player_hp - max(1, enemy_damage - stats['defense']), player_hp)
+            if enemy_heal:
+                enemy_hp = np.where(active, np.minimum(enemy.max_hp, enemy_hp + enemy_heal), enemy_hp)
+
+        defeats = active & (player_hp <= 0)
+        end_turn[defeats] = turn
+        active &= ~defeats
+
+        if not active.any():
+            break
+
+    win_turns = end_turn[won]
+    return {
+        'enemy': enemy.name,
+        'trials': trials,
+        'win_chance': float(won.mean()),
+        'loss_chance': float((~won & ~active).mean()),
+        'timeout_chance': float(active.mean()),
+        'turns_p50': int(np.percentile(win_turns, 50)) if win_turns.size else None,
+        'turns_p90': int(np.percentile(win_turns, 90)) if win_turns.size else None,
+        'hp_left_mean': float((player_hp[won].clip(0) / max_hp).mean()) if win_turns.size else None,
+    }
+
+
+def estimate_fight(player, enemy_key, trials=DEFAULT_TRIALS, seed=None):
+    """Estimativa para o jogador atual (HP, equipamento e passivas) contra o inimigo"""
+    return estimate_outcome(player_combat_stats(player), enemy_key, trials=trials, seed=seed)
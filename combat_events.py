@@ -0,0 +1,80 @@
+"""
+Eventos do combate com PA.
+
+O motor (CombatPA) não escreve na tela: cada acontecimento do turno vira
+um CombatEvent (tipo + texto + dados) entregue a um sink plugável.
+
+Sinks disponíveis:
+    ConsoleSink        - imprime o texto (jogo no terminal, game.py)
+    JsonEventCollector - junta os eventos como dicts (respostas do app_web)
+    NullSink           - descarta tudo (simulações)
+
+Tipos de evento usados pelo motor:
+    damage, crit, heal, status, status_tick, pa, defend, flee,
+    companion, special, turn, error, info
+"""
+
+
+class CombatEvent:
+    """Um acontecimento do combate"""
+    __slots__ = ("kind", "message", "data")
+
+    def __init__(self, kind, message, data=None):
+        self.kind = kind
+        self.message = message
+        self.data = data or {}
+
+    def to_dict(self):
+        """Formato serializável em JSON"""
+        event = {'type': self.kind, 'message': self.message.strip()}
+        event.update(self.data)
+        return event
+
+
+class ConsoleSink:
+    """Renderiza os eventos no terminal"""
+
+    def emit(self, event):
+        print(event.message)
+
+    def __reduce__(self):
+        # Snapshots de combate voltam com o sink único do módulo
+        return "CONSOLE_SINK"
+
+
+class JsonEventCollector:
+    """Acumula os eventos de uma requisição para devolver ao cliente"""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event.to_dict())
+
+    def messages(self):
+        """Linhas de texto para o log da web, na ordem em que aconteceram.
+
+        Mensagens de várias linhas viram uma linha cada; as faixas de "="
+        que separam os turnos no terminal ficam de fora.
+        """
+        return [
+            line.strip()
+            for event in self.events
+            for line in event['message'].splitlines()
+            if line.strip(" =")
+        ]
+
+
+class NullSink:
+    """Descarta os eventos (combates simulados sem saída)"""
+
+    def emit(self, event):
+        pass
+
+    def __reduce__(self):
+        # Mantém `sink is NULL_SINK` verdadeiro após despejo/reidratação
+        return "NULL_SINK"
+
+
+CONSOLE_SINK = ConsoleSink()
+NULL_SINK = NullSink()
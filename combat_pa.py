@@ -1,17 +1,78 @@
 """
 Sistema de Combate com PA (Action Points) - Inspirado em Clair Obscur: Expedition 33
 """
-import random
+from combat_events import CONSOLE_SINK, NULL_SINK, CombatEvent
+from enemy import restore_enemy
+from game_rng import SHARED_RNG
 
 CRIT_MULTIPLIER = 2.0
+# Chance de crítico do ataque básico antes das passivas
+BASIC_ATTACK_CRIT_CHANCE = 0.1
+
+# Golpes do guerreiro: skill_id -> configuração do ataque
+WARRIOR_STRIKES = {
+    'w_dps_1': {'hits': 1, 'crit_multiplier': 1.0, 'defense_modifier': 0.5, 'label': 'GOLPE PRECISO'},
+    'w_berserk_2': {'hits': 1, 'crit_multiplier': 1.0, 'defense_modifier': 1.0, 'label': 'GOLPE SELVAGEM'},
+    'w_dps_3': {'hits': 3, 'crit_multiplier': 1.0, 'defense_modifier': 1.0},
+    'w_dps_ultimate': {'hits': 5, 'crit_multiplier': 2.0, 'defense_modifier': 1.0},
+}
+
+# Atributos do combate que vão para saves/snapshots (o resto é reconstruído)
+COMBAT_STATE_FIELDS = (
+    'turn_count', 'combat_active',
+    'player_max_pa', 'enemy_max_pa', 'player_pa', 'enemy_pa',
+    'player_defending', 'enemy_defending', 'used_basic_attack',
+    'player_status', 'enemy_status',
+)
+
+# Efeitos de cada habilidade ativa, por classe: skill_id -> ids de efeito em ordem
+SKILL_EFFECTS = {
+    "guerreiro": {
+        "w_tank_1": ("skill_damage",),
+        "w_tank_3": ("defend",),
+        "w_tank_ultimate": ("skill_damage", "defend"),
+        "w_dps_1": ("warrior_strike",),
+        "w_dps_3": ("warrior_strike",),
+        "w_dps_ultimate": ("warrior_strike",),
+        "w_berserk_2": ("warrior_strike",),
+        "w_berserk_ultimate": ("skill_damage",),
+    },
+    "mago": {
+        "m_fire_1": ("skill_damage", "burn"),
+        "m_fire_3": ("skill_damage",),
+        "m_fire_ultimate": ("skill_damage", "burn"),
+        "m_ice_1": ("skill_damage", "freeze"),
+        "m_ice_2": ("skill_damage",),
+        "m_ice_3": ("skill_damage", "freeze"),
+        "m_ice_ultimate": ("skill_damage",),
+        "m_arcane_1": ("skill_damage",),
+        "m_arcane_3": ("skill_damage",),
+        "m_arcane_ultimate": ("skill_damage",),
+    },
+    "druida": {
+        "d_nature_1": ("skill_damage", "poison"),
+        "d_nature_3": ("skill_damage", "roots"),
+        "d_nature_ultimate": ("skill_damage", "poison"),
+        "d_spirit_1": ("heal",),
+        "d_spirit_3": ("skill_damage", "guard"),
+        "d_spirit_ultimate": ("skill_damage", "spirit_heal"),
+        "d_shape_1": ("skill_damage",),
+        "d_shape_3": ("skill_damage",),
+        "d_shape_ultimate": ("skill_damage",),
+    },
+}
 
 
 class CombatPA:
     """Sistema de combate com pontos de ação"""
     
-    def __init__(self, player, enemy):
+    def __init__(self, player, enemy, sink=None, rng=None):
         self.player = player
         self.enemy = enemy
+        # Destino dos eventos do motor (terminal por padrão, ver combat_events.py)
+        self.sink = sink or CONSOLE_SINK
+        # Fluxos aleatórios da partida (World.rng); sem partida usa o random global
+        self.rng = rng or SHARED_RNG
         self.turn_count = 0
         self.combat_active = True
         
@@ -33,6 +94,38 @@ class CombatPA:
         self.player_status = []  # Lista de efeitos (queimadura, congelamento, etc)
         self.enemy_status = []
     
+    def emit(self, kind, message, **data):
+        """Entrega um evento do combate ao sink atual"""
+        if self.sink is NULL_SINK:
+            return
+        self.sink.emit(CombatEvent(kind, message, data))
+
+    def emit_info(self, message):
+        """Texto de itens, magias e do jogador (parâmetro report) como evento info"""
+        self.emit("info", message)
+
+    def get_state(self):
+        """Estado serializável em JSON do combate em andamento (inimigo incluso)"""
+        state = {field: getattr(self, field) for field in COMBAT_STATE_FIELDS}
+        state['player_status'] = [dict(status) for status in self.player_status]
+        state['enemy_status'] = [dict(status) for status in self.enemy_status]
+        state['enemy'] = self.enemy.get_state()
+        return state
+
+    @classmethod
+    def from_state(cls, player, state, sink=None, rng=None):
+        """Retoma um combate de get_state() (None se o inimigo não existir mais)"""
+        enemy = restore_enemy(state['enemy'])
+        if enemy is None:
+            return None
+        combat = cls(player, enemy, sink=sink, rng=rng)
+        for field in COMBAT_STATE_FIELDS:
+            if field in state:
+                setattr(combat, field, state[field])
+        combat.player_status = [dict(status) for status in combat.player_status]
+        combat.enemy_status = [dict(status) for status in combat.enemy_status]
+        return combat
+    
     # === CUSTOS DE PA ===
     PA_COSTS = {
         'attack': 2,
@@ -54,7 +147,7 @@ class CombatPA:
         # Bônus de PA se usou ataque básico no turno anterior
         if self.used_basic_attack:
             pa_regen += 1
-            print(f"\n⚡ +1 PA extra (usou ataque básico!)")
+            self.emit("pa", "\n⚡ +1 PA extra (usou ataque básico!)", delta=1)
         
         # Adiciona PA (máximo 6)
         old_pa = self.player_pa
@@ -62,7 +155,8 @@ class CombatPA:
         actual_regen = self.player_pa - old_pa
         
         if actual_regen > 0:
-            print(f"✨ +{actual_regen} PA regenerado ({self.player_pa}/{self.player_max_pa})")
+            self.emit("pa", f"✨ +{actual_regen} PA regenerado ({self.player_pa}/{self.player_max_pa})",
+                      delta=actual_regen, pa=self.player_pa, max_pa=self.player_max_pa)
         
         # Reset de estado
         self.player_defending = False
@@ -94,14 +188,16 @@ class CombatPA:
         for effect in status_list:
             effect_type = effect['type']
             damage = effect.get('damage', 0)
+            target_name = getattr(target, 'name', 'Você')
             duration = effect.get('duration', 0)
             
             if effect_type == 'burning':
                 target.take_damage(damage)
-                print(f"🔥 {target.name if hasattr(target, 'name') else 'Você'} sofre {damage} de dano por queimadura!")
+                self.emit("status_tick", f"🔥 {target_name} sofre {damage} de dano por queimadura!",
+                          target=target_name, status=effect_type, amount=damage)
             
             elif effect_type == 'frozen':
-                print(f"❄️ {target.name if hasattr(target, 'name') else 'Você'} está congelado!")
+                self.emit("status_tick", f"❄️ {target_name} está congelado!", target=target_name, status=effect_type)
                 # Perde 1 PA
                 if target == self.player:
                     self.player_pa = max(0, self.player_pa - 1)
@@ -110,13 +206,15 @@ class CombatPA:
             
             elif effect_type == 'poison':
                 target.take_damage(damage)
-                print(f"☠️ {target.name if hasattr(target, 'name') else 'Você'} sofre {damage} de dano por veneno!")
+                self.emit("status_tick", f"☠️ {target_name} sofre {damage} de dano por veneno!",
+                          target=target_name, status=effect_type, amount=damage)
             
             # Reduz duração
             effect['duration'] -= 1
             if effect['duration'] <= 0:
                 effects_to_remove.append(effect)
-                print(f"✨ Efeito {effect_type} acabou!")
+                self.emit("status", f"✨ Efeito {effect_type} acabou!",
+                          target=target_name, status=effect_type, expired=True)
         
         # Remove efeitos expirados
         for effect in effects_to_remove:
@@ -146,7 +244,7 @@ class CombatPA:
             normalized_element = 'fire' if skill_path == 'fogo' else 'ice'
 
         if weapon.elemental_type == 'all' or weapon.elemental_type == normalized_element:
-            print(f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
+            self.emit("info", f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
             return 1.0 + (weapon.elemental_bonus / 100.0)
 
         return 1.0
@@ -159,70 +257,52 @@ class CombatPA:
 
     def apply_warrior_skill_damage(self, skill, caster, target, bonuses):
         """Aplica as habilidades ofensivas do guerreiro com escala de ataque e crítico."""
-        skill_id = getattr(skill, 'skill_id', '')
+        config = WARRIOR_STRIKES.get(getattr(skill, 'skill_id', ''))
+        if config is None:
+            return None
+
         skill_multiplier = skill.power * bonuses.get('damage_multiplier', 1.0)
+        crit_chance = self.get_skill_crit_chance(caster, bonuses, config['crit_multiplier'])
 
-        if skill_id == 'w_dps_1':
-            crit_chance = self.get_skill_crit_chance(caster, bonuses)
-            is_critical = random.random() < crit_chance
+        if config['hits'] == 1:
+            is_critical = self.rng.combat.random() < crit_chance
             damage = self.calculate_damage(
                 int(caster.get_total_attack() * skill_multiplier),
                 target.defense,
                 is_critical,
-                defense_modifier=0.5,
+                defense_modifier=config['defense_modifier'],
             )
             target.take_damage(damage)
             if is_critical:
-                print("🌟 ✨ GOLPE PRECISO CRÍTICO! ✨ 🌟")
-            print(f"💥 {damage} de dano!")
-            print(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
+                self.emit("crit", f"🌟 ✨ {config['label']} CRÍTICO! ✨ 🌟")
+            self.emit("damage", f"💥 {damage} de dano!", target=target.name, amount=damage)
+            self.emit("info", f"🩸 {target.name} HP: {target.hp}/{target.max_hp}",
+                      target=target.name, hp=target.hp, max_hp=target.max_hp)
             return damage
 
-        if skill_id == 'w_berserk_2':
-            crit_chance = self.get_skill_crit_chance(caster, bonuses)
-            is_critical = random.random() < crit_chance
-            damage = self.calculate_damage(
+        total_damage = 0
+        self.emit("info", f"⚔️ {config['hits']} ataques consecutivos!")
+
+        for hit_number in range(config['hits']):
+            is_critical = self.rng.combat.random() < crit_chance
+            attack_damage = self.calculate_damage(
                 int(caster.get_total_attack() * skill_multiplier),
                 target.defense,
                 is_critical,
+                defense_modifier=config['defense_modifier'],
             )
-            target.take_damage(damage)
-            if is_critical:
-                print("🌟 ✨ GOLPE SELVAGEM CRÍTICO! ✨ 🌟")
-            print(f"💥 {damage} de dano!")
-            print(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
-            return damage
+            target.take_damage(attack_damage)
+            total_damage += attack_damage
+            critical_suffix = " CRÍTICO" if is_critical else ""
+            self.emit("damage", f"   💥 Ataque {hit_number + 1}: {attack_damage} dano{critical_suffix}",
+                      target=target.name, amount=attack_damage, critical=is_critical)
 
-        multi_hit_skills = {
-            'w_dps_3': {'hits': 3, 'crit_multiplier': 1.0},
-            'w_dps_ultimate': {'hits': 5, 'crit_multiplier': 2.0},
-        }
-
-        if skill_id in multi_hit_skills:
-            config = multi_hit_skills[skill_id]
-            crit_chance = self.get_skill_crit_chance(caster, bonuses, config['crit_multiplier'])
-            total_damage = 0
-            print(f"⚔️ {config['hits']} ataques consecutivos!")
-
-            for hit_number in range(config['hits']):
-                is_critical = random.random() < crit_chance
-                attack_damage = self.calculate_damage(
-                    int(caster.get_total_attack() * skill_multiplier),
-                    target.defense,
-                    is_critical,
-                )
-                target.take_damage(attack_damage)
-                total_damage += attack_damage
-                critical_suffix = " CRÍTICO" if is_critical else ""
-                print(f"   💥 Ataque {hit_number + 1}: {attack_damage} dano{critical_suffix}")
-
-                if not target.is_alive():
-                    break
-
-            print(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
-            return total_damage
+            if not target.is_alive():
+                break
 
-        return None
+        self.emit("info", f"🩸 {target.name} HP: {target.hp}/{target.max_hp}",
+                  target=target.name, hp=target.hp, max_hp=target.max_hp)
+        return total_damage
     
     def calculate_damage(self, attacker_attack, defender_defense, is_critical=False, defense_modifier=1.0):
         """Calcula dano causado"""
@@ -234,7 +314,7 @@ class CombatPA:
     def player_attack(self):
         """Ataque básico do jogador (2 PA)"""
         if not self.has_pa_for_action('attack'):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS['attack']}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS['attack']}, disponível: {self.player_pa}")
             return False
         
         # Consome PA
@@ -244,9 +324,9 @@ class CombatPA:
         bonuses = self.player.get_passive_bonuses()
         
         # Verifica crítico
-        base_crit_chance = 0.1  # 10% base
+        base_crit_chance = BASIC_ATTACK_CRIT_CHANCE  # 10% base
         crit_chance = base_crit_chance + (bonuses['crit_chance'] / 100)
-        is_critical = random.random() < crit_chance
+        is_critical = self.rng.combat.random() < crit_chance
         
         # Calcula ataque
         base_attack = self.player.get_total_attack()
@@ -267,39 +347,40 @@ class CombatPA:
             heal = int(damage * (bonuses['lifesteal'] / 100))
             if heal > 0:
                 self.player.restore_hp(heal)
-                print(f"💉 Você recupera {heal} HP (Roubo de Vida)")
+                self.emit("heal", f"💉 Você recupera {heal} HP (Roubo de Vida)", target=self.player.name, amount=heal)
         
         self.enemy.take_damage(damage)
         
         # Marca que usou ataque básico (para regenerar +1 PA)
         self.used_basic_attack = True
         
-        print(f"\n⚔️  Você ataca {self.enemy.name}! (-{cost} PA)")
-        print("💡 Você ganhará +1 PA extra no próximo turno!")
+        self.emit("pa", f"\n⚔️  Você ataca {self.enemy.name}! (-{cost} PA)", delta=-cost, pa=self.player_pa)
+        self.emit("info", "💡 Você ganhará +1 PA extra no próximo turno!")
         
         if is_critical:
-            print("🌟 ✨ ACERTO CRÍTICO! ✨ 🌟")
+            self.emit("crit", "🌟 ✨ ACERTO CRÍTICO! ✨ 🌟")
         
         if self.enemy_defending:
-            print(f"🛡️ {self.enemy.name} estava defendendo! (Defesa +50%)")
+            self.emit("defend", f"🛡️ {self.enemy.name} estava defendendo! (Defesa +50%)")
         
-        print(f"💥 Dano causado: {damage}")
-        print(f"🩸 {self.enemy.name} HP: {self.enemy.hp}/{self.enemy.max_hp}")
+        self.emit("damage", f"💥 Dano causado: {damage}", target=self.enemy.name, amount=damage, critical=is_critical)
+        self.emit("info", f"🩸 {self.enemy.name} HP: {self.enemy.hp}/{self.enemy.max_hp}",
+                  target=self.enemy.name, hp=self.enemy.hp, max_hp=self.enemy.max_hp)
         
         return True
     
     def player_defend(self):
         """Jogador assume postura defensiva (1 PA) - TERMINA O TURNO AUTOMATICAMENTE"""
         if not self.has_pa_for_action('defend'):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS['defend']}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS['defend']}, disponível: {self.player_pa}")
             return False
         
         cost = self.consume_pa('defend')
         self.player_defending = True
         
-        print(f"\n🛡️ Você assume postura defensiva! (-{cost} PA)")
-        print("Defesa aumentada em 50% até o próximo turno!")
-        print("⏭️ Seu turno termina automaticamente!")
+        self.emit("defend", f"\n🛡️ Você assume postura defensiva! (-{cost} PA)", delta=-cost, pa=self.player_pa)
+        self.emit("info", "Defesa aumentada em 50% até o próximo turno!")
+        self.emit("info", "⏭️ Seu turno termina automaticamente!")
         
         return True
     
@@ -308,15 +389,15 @@ class CombatPA:
         skill = self.player.skill_tree.get_skill(skill_id)
         
         if not skill:
-            print("❌ Habilidade não encontrada!")
+            self.emit("error", "❌ Habilidade não encontrada!")
             return False
         
         if skill_id not in self.player.unlocked_skills:
-            print("❌ Você não possui esta habilidade!")
+            self.emit("error", "❌ Você não possui esta habilidade!")
             return False
         
         if skill.is_passive:
-            print("❌ Esta é uma habilidade passiva!")
+            self.emit("error", "❌ Esta é uma habilidade passiva!")
             return False
         
         # Determina custo de PA baseado no tier
@@ -330,172 +411,185 @@ class CombatPA:
             pa_action = 'skill_tier1'
         
         if not self.has_pa_for_action(pa_action):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS[pa_action]}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS[pa_action]}, disponível: {self.player_pa}")
             return False
         
         # Sem mana: apenas verifica cooldown e ativa skill
-        if skill.current_cooldown > 0:
-            print(f"❌ {skill.name} ainda está em cooldown! ({skill.current_cooldown} turnos)")
+        current_cooldown = self.player.get_skill_cooldown(skill_id)
+        if current_cooldown > 0:
+            self.emit("error", f"❌ {skill.name} ainda está em cooldown! ({current_cooldown} turnos)")
             return False
-        skill.current_cooldown = skill.cooldown
+        self.player.start_skill_cooldown(skill_id)
         
         # Consome PA
         cost = self.consume_pa(pa_action)
         
         # Aplica efeitos da skill
-        print(f"\n⚡ {skill.name}! (-{cost} PA)")
+        self.emit("pa", f"\n⚡ {skill.name}! (-{cost} PA)", skill_id=skill_id, delta=-cost, pa=self.player_pa)
         damage = self.apply_skill_effects(skill, self.player, self.enemy)
         
         return True
     
     def apply_skill_effects(self, skill, caster, target):
-        """Aplica efeitos da habilidade"""
+        """Aplica efeitos da habilidade (handlers registrados em SKILL_HANDLERS)"""
+        handlers = get_skill_handlers(getattr(caster, 'player_class', None), skill.skill_id)
+        if handlers is None:
+            self.emit("error", f"❌ {skill.name} não tem efeito registrado!")
+            return 0
+
         damage = 0
-        skill_id = getattr(skill, 'skill_id', '')
-        skill_name_lower = skill.name.lower()
         bonuses = caster.get_passive_bonuses()
-        effect_kind = getattr(skill, 'effect_kind', None)
+        for handler in handlers:
+            dealt = handler(self, skill, caster, target, bonuses)
+            if dealt is not None:
+                damage = dealt
+        return damage
 
-        warrior_skill_damage = self.apply_warrior_skill_damage(skill, caster, target, bonuses)
-        if warrior_skill_damage is not None:
-            damage = warrior_skill_damage
-        
-        # Habilidades de dano
-        if skill.power > 0 and warrior_skill_damage is None and effect_kind != 'heal':
-            base_damage = int(skill.power * bonuses['damage_multiplier'])
-            skill_path = getattr(skill, 'path', None)
-            player_class = getattr(caster, 'player_class', None)
+    # === EFEITOS DE HABILIDADE ===
+    # Assinatura comum: (skill, caster, target, bonuses) -> dano causado ou None
+
+    def _effect_skill_damage(self, skill, caster, target, bonuses):
+        """Dano de habilidade escalado por classe, arma e caminho"""
+        base_damage = int(skill.power * bonuses['damage_multiplier'])
+        skill_path = getattr(skill, 'path', None)
+        player_class = getattr(caster, 'player_class', None)
 
-            # Mago aplica poder mágico em habilidades
-            if player_class == 'mago':
+        # Mago aplica poder mágico em habilidades
+        if player_class == 'mago':
+            base_damage = int(base_damage * getattr(caster, 'magic_power', 1.0))
+        elif player_class == 'druida':
+            if skill_path in {'natureza', 'espiritos'}:
                 base_damage = int(base_damage * getattr(caster, 'magic_power', 1.0))
-            elif player_class == 'druida':
-                if skill_path in {'natureza', 'espiritos'}:
-                    base_damage = int(base_damage * getattr(caster, 'magic_power', 1.0))
-                elif skill_path == 'metamorfose':
-                    base_damage = int(base_damage * getattr(caster, 'melee_bonus', 1.0))
-
-            base_damage = int(base_damage * self.get_weapon_magic_multiplier(caster, skill_path=skill_path))
-
-            # Buff elemental por caminho da habilidade
-            if skill_path == 'fogo':
-                base_damage = int(base_damage * bonuses.get('fire_damage_multiplier', 1.0))
-            elif skill_path == 'arcano':
-                base_damage = int(base_damage * bonuses.get('arcane_damage_multiplier', 1.0))
-            
-            # Defesa do alvo
-            defense_modifier = 1.5 if (target == self.enemy and self.enemy_defending) else 1.0
-            damage = self.calculate_damage(base_damage, target.defense, False, defense_modifier)
-            
-            target.take_damage(damage)
-            print(f"💥 {damage} de dano!")
-            print(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
-        
-        # Habilidades específicas
-        if "bastião eterno" in skill_name_lower or "muralha" in skill_name_lower:
-            print(f"🛡️ Defesa aumentada drasticamente!")
-            self.player_defending = True
-
-        elif "fogo" in skill_name_lower or "inferno" in skill_name_lower or "chama" in skill_name_lower:
-            # Adiciona queimadura
-            burn_damage = int(skill.power * 0.2)
-            self.enemy_status.append({
-                'type': 'burning',
-                'damage': burn_damage,
-                'duration': 3
-            })
-            print(f"🔥 {target.name} está queimando! ({burn_damage} dano por 3 turnos)")
+            elif skill_path == 'metamorfose':
+                base_damage = int(base_damage * getattr(caster, 'melee_bonus', 1.0))
 
-        elif "gelo" in skill_name_lower or "inverno" in skill_name_lower or "congelante" in skill_name_lower:
-            # Adiciona congelamento
-            self.enemy_status.append({
-                'type': 'frozen',
-                'duration': 2
-            })
-            print(f"❄️ {target.name} está congelado! (-1 PA por 2 turnos)")
+        base_damage = int(base_damage * self.get_weapon_magic_multiplier(caster, skill_path=skill_path))
 
-        elif effect_kind == 'heal' or "cura" in skill_name_lower or "regeneração" in skill_name_lower:
-            # Cura
-            heal = min(skill.power, caster.max_hp - caster.hp)
-            caster.heal(heal)
-            print(f"💚 Você recupera {heal} HP!")
+        # Buff elemental por caminho da habilidade
+        if skill_path == 'fogo':
+            base_damage = int(base_damage * bonuses.get('fire_damage_multiplier', 1.0))
+        elif skill_path == 'arcano':
+            base_damage = int(base_damage * bonuses.get('arcane_damage_multiplier', 1.0))
+        
+        # Defesa do alvo
+        defense_modifier = 1.5 if (target == self.enemy and self.enemy_defending) else 1.0
+        damage = self.calculate_damage(base_damage, target.defense, False, defense_modifier)
+        
+        target.take_damage(damage)
+        self.emit("damage", f"💥 {damage} de dano!", target=target.name, amount=damage)
+        self.emit("info", f"🩸 {target.name} HP: {target.hp}/{target.max_hp}",
+                  target=target.name, hp=target.hp, max_hp=target.max_hp)
+        return damage
 
-        elif effect_kind == 'damage_guard':
-            self.player_defending = True
-            print("🌫️ Espíritos guardiões envolvem seu corpo até o próximo turno!")
+    def _effect_warrior_strike(self, skill, caster, target, bonuses):
+        """Golpes do guerreiro (ver WARRIOR_STRIKES)"""
+        return self.apply_warrior_skill_damage(skill, caster, target, bonuses)
 
-        elif effect_kind == 'damage_heal':
-            heal = min(getattr(skill, 'secondary_power', 0), caster.max_hp - caster.hp)
-            if heal > 0:
-                caster.heal(heal)
-                print(f"💚 Espíritos restauram {heal} HP!")
+    def _effect_defend(self, skill, caster, target, bonuses):
+        self.emit("defend", "🛡️ Defesa aumentada drasticamente!")
+        self.player_defending = True
 
-        if "raízes" in skill_name_lower:
-            self.enemy_status.append({
-                'type': 'frozen',
-                'duration': 2
-            })
-            print(f"🌿 {target.name} foi enredado por raízes! (-1 PA por 2 turnos)")
-
-        elif "vinhas" in skill_name_lower or "floresta" in skill_name_lower:
-            poison_damage = max(4, int(skill.power * 0.18))
-            self.enemy_status.append({
-                'type': 'poison',
-                'damage': poison_damage,
-                'duration': 3
-            })
-            print(f"☠️ Seiva tóxica corrói {target.name}! ({poison_damage} dano por 3 turnos)")
-        
-        return damage
+    def _effect_burn(self, skill, caster, target, bonuses):
+        # Adiciona queimadura
+        burn_damage = int(skill.power * 0.2)
+        self.enemy_status.append({
+            'type': 'burning',
+            'damage': burn_damage,
+            'duration': 3
+        })
+        self.emit("status", f"🔥 {target.name} está queimando! ({burn_damage} dano por 3 turnos)",
+                  target=target.name, status="burning", duration=3)
+
+    def _effect_freeze(self, skill, caster, target, bonuses):
+        # Adiciona congelamento
+        self.enemy_status.append({
+            'type': 'frozen',
+            'duration': 2
+        })
+        self.emit("status", f"❄️ {target.name} está congelado! (-1 PA por 2 turnos)",
+                  target=target.name, status="frozen", duration=2)
+
+    def _effect_heal(self, skill, caster, target, bonuses):
+        heal = min(skill.power, caster.max_hp - caster.hp)
+        caster.heal(heal)
+        self.emit("heal", f"💚 Você recupera {heal} HP!", target=caster.name, amount=heal)
+
+    def _effect_guard(self, skill, caster, target, bonuses):
+        self.player_defending = True
+        self.emit("defend", "🌫️ Espíritos guardiões envolvem seu corpo até o próximo turno!")
+
+    def _effect_spirit_heal(self, skill, caster, target, bonuses):
+        heal = min(getattr(skill, 'secondary_power', 0), caster.max_hp - caster.hp)
+        if heal > 0:
+            caster.heal(heal)
+            self.emit("heal", f"💚 Espíritos restauram {heal} HP!", target=caster.name, amount=heal)
+
+    def _effect_roots(self, skill, caster, target, bonuses):
+        self.enemy_status.append({
+            'type': 'frozen',
+            'duration': 2
+        })
+        self.emit("status", f"🌿 {target.name} foi enredado por raízes! (-1 PA por 2 turnos)",
+                  target=target.name, status="frozen", duration=2)
+
+    def _effect_poison(self, skill, caster, target, bonuses):
+        poison_damage = max(4, int(skill.power * 0.18))
+        self.enemy_status.append({
+            'type': 'poison',
+            'damage': poison_damage,
+            'duration': 3
+        })
+        self.emit("status", f"☠️ Seiva tóxica corrói {target.name}! ({poison_damage} dano por 3 turnos)",
+                  target=target.name, status="poison", duration=3)
     
     def player_use_spell(self, spell_idx):
         """Usa uma magia (2 PA) - Sistema antigo"""
         if not self.has_pa_for_action('spell'):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS['spell']}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS['spell']}, disponível: {self.player_pa}")
             return False
         
         if not self.player.known_spells:
-            print("❌ Você não conhece nenhuma magia!")
+            self.emit("error", "❌ Você não conhece nenhuma magia!")
             return False
         
         if spell_idx < 0 or spell_idx >= len(self.player.known_spells):
-            print("❌ Magia inválida!")
+            self.emit("error", "❌ Magia inválida!")
             return False
         
         spell = self.player.known_spells[spell_idx]
         
         if self.player.mana < spell.mana_cost:
-            print(f"❌ Mana insuficiente! Precisa de {spell.mana_cost}, tem {self.player.mana}")
+            self.emit("error", f"❌ Mana insuficiente! Precisa de {spell.mana_cost}, tem {self.player.mana}")
             return False
         
         # Consome PA
         cost = self.consume_pa('spell')
         
         # Lança a magia
-        result = spell.cast(self.player, self.enemy)
-        print(f"\n{result} (-{cost} PA)")
+        spell.cast(self.player, self.enemy, report=self.emit_info)
+        self.emit("pa", f"⚡ -{cost} PA", delta=-cost, pa=self.player_pa)
         
         return True
     
     def player_use_item(self, item_idx):
         """Usa um item (1 PA)"""
         if not self.has_pa_for_action('item'):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS['item']}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS['item']}, disponível: {self.player_pa}")
             return False
         
         if not self.player.inventory:
-            print("❌ Inventário vazio!")
+            self.emit("error", "❌ Inventário vazio!")
             return False
         
         if item_idx < 0 or item_idx >= len(self.player.inventory):
-            print("❌ Item inválido!")
+            self.emit("error", "❌ Item inválido!")
             return False
         
         # Consome PA
         cost = self.consume_pa('item')
         
-        if self.player.use_item(item_idx):
-            print(f"✅ Item usado com sucesso! (-{cost} PA)")
+        if self.player.use_item(item_idx, report=self.emit_info):
+            self.emit("pa", f"✅ Item usado com sucesso! (-{cost} PA)", delta=-cost, pa=self.player_pa)
             return True
         else:
             # Devolve PA se falhou
@@ -505,23 +599,23 @@ class CombatPA:
     def attempt_flee(self):
         """Tenta fugir (2 PA)"""
         if not self.has_pa_for_action('flee'):
-            print(f"❌ PA insuficiente! Necessário: {self.PA_COSTS['flee']}, disponível: {self.player_pa}")
+            self.emit("error", f"❌ PA insuficiente! Necessário: {self.PA_COSTS['flee']}, disponível: {self.player_pa}")
             return False
         
         # Boss não permite fuga
         if not getattr(self.enemy, 'can_flee', True):
-            print(f"\n❌ Você não pode fugir de {self.enemy.name}!")
+            self.emit("error", f"\n❌ Você não pode fugir de {self.enemy.name}!")
             return False
         
         cost = self.consume_pa('flee')
         
         # 30% de chance de fuga
-        if random.random() < 0.3:
-            print(f"\n🏃 Você conseguiu fugir de {self.enemy.name}! (-{cost} PA)")
+        if self.rng.combat.random() < 0.3:
+            self.emit("flee", f"\n🏃 Você conseguiu fugir de {self.enemy.name}! (-{cost} PA)", escaped=True)
             self.combat_active = False
             return True
         else:
-            print(f"\n❌ Você tentou fugir, mas {self.enemy.name} bloqueou! (-{cost} PA)")
+            self.emit("flee", f"\n❌ Você tentou fugir, mas {self.enemy.name} bloqueou! (-{cost} PA)", escaped=False)
             return False
 
     def companion_turn(self):
@@ -544,6 +638,8 @@ class CombatPA:
             skill_id, skill = choose_companion_skill(companion)
             if skill_id and skill:
                 companion['skill_cooldowns'][skill_id] = skill.get('cooldown', 0)
+                if hasattr(self.player, 'mark_dirty'):
+                    self.player.mark_dirty('companions')
                 effect = skill.get('effect', 'damage')
                 damage = 0
                 heal = 0
@@ -582,12 +678,13 @@ class CombatPA:
                     'heal': heal,
                     'effect': effect,
                 })
+                self.emit_companion_action(actions[-1])
                 continue
 
             weapon_bonus = companion.get('weapon_bonus', 0)
             min_damage = max(1, companion.get('attack_min', 1) + weapon_bonus)
             max_damage = max(min_damage, companion.get('attack_max', min_damage) + weapon_bonus)
-            base_damage = random.randint(min_damage, max_damage)
+            base_damage = self.rng.ai.randint(min_damage, max_damage)
             damage = self.calculate_damage(base_damage, self.enemy.defense, False)
             self.enemy.take_damage(damage)
 
@@ -604,14 +701,33 @@ class CombatPA:
                 'heal': 0,
                 'effect': 'basic_attack',
             })
+            self.emit_companion_action(actions[-1])
 
         return actions
     
+    def emit_companion_action(self, action):
+        """Eventos de uma ação automática de companheiro (a ação e seus efeitos)"""
+        name = action['name']
+        self.emit("companion", action['message'], name=name, amount=action['damage'],
+                  heal=action['heal'], effect=action['effect'])
+        if action['damage'] > 0:
+            self.emit("damage", f"💥 {name} causou {action['damage']} de dano!",
+                      target=self.enemy.name, amount=action['damage'])
+        if action['heal'] > 0:
+            self.emit("heal", f"💚 {name} restaurou {action['heal']} HP!",
+                      target=self.player.name, amount=action['heal'])
+        if action['effect'] == 'damage_guard':
+            self.emit("defend", f"🛡️ {name} reforçou sua defesa para o próximo ataque!")
+        elif action['effect'] == 'damage_freeze':
+            self.emit("status", f"❄️ {name} congelou o alvo por um instante!",
+                      target=self.enemy.name, status='frozen')
+        elif action['effect'] == 'damage_poison':
+            self.emit("status", f"☠️ {name} deixou veneno natural agindo no alvo!",
+                      target=self.enemy.name, status='poison')
+    
     def enemy_turn(self):
         """Turno do inimigo (IA simples)"""
-        print(f"\n{'='*50}")
-        print(f"🔴 Turno de {self.enemy.name}")
-        print(f"{'='*50}")
+        self.emit("turn", f"\n{'='*50}\n🔴 Turno de {self.enemy.name}\n{'='*50}", actor=self.enemy.name)
         
         self.reset_enemy_pa()
         
@@ -622,11 +738,16 @@ class CombatPA:
             else:
                 break
         
-        print(f"\n🔵 Fim do turno de {self.enemy.name}")
+        self.emit("turn", f"\n🔵 Fim do turno de {self.enemy.name}", actor=self.enemy.name, ended=True)
     
     def enemy_attack(self):
         """Ataque do inimigo"""
-        attack_damage = self.enemy.get_attack_damage()
+        attack_damage, special = self.enemy.next_attack()
+        if special:
+            self.emit("special", special['message'], actor=self.enemy.name, attack=special['attack'])
+            if special['heal'] > 0:
+                self.emit("heal", f"💚 {self.enemy.name} recuperou {special['heal']} HP!",
+                          target=self.enemy.name, amount=special['heal'])
         bonuses = self.player.get_passive_bonuses()
         total_defense = int(self.player.get_total_defense() * bonuses.get('defense_multiplier', 1.0))
         
@@ -642,13 +763,14 @@ class CombatPA:
         
         self.player.take_damage(damage)
         
-        print(f"\n🗡️  {self.enemy.name} ataca!")
+        self.emit("info", f"\n🗡️  {self.enemy.name} ataca!")
         
         if self.player_defending:
-            print(f"🛡️ Você estava defendendo! (Defesa +50%)")
+            self.emit("defend", "🛡️ Você estava defendendo! (Defesa +50%)")
         
-        print(f"💥 Dano recebido: {damage}")
-        print(f"❤️  Seu HP: {self.player.hp}/{self.player.max_hp}")
+        self.emit("damage", f"💥 Dano recebido: {damage}", target=self.player.name, amount=damage)
+        self.emit("info", f"❤️  Seu HP: {self.player.hp}/{self.player.max_hp}",
+                  target=self.player.name, hp=self.player.hp, max_hp=self.player.max_hp)
         
         # Consome PA do inimigo
         self.enemy_pa -= 2
@@ -746,7 +868,8 @@ class CombatPA:
                             else:
                                 pa_cost = self.PA_COSTS['skill_tier1']
                             
-                            cooldown_text = f" (CD: {skill.current_cooldown})" if skill.current_cooldown > 0 else ""
+                            current_cooldown = self.player.get_skill_cooldown(skill_id)
+                            cooldown_text = f" (CD: {current_cooldown})" if current_cooldown > 0 else ""
                             print(f"{idx} - {skill.name} ({pa_cost} PA){cooldown_text}")
                             print(f"    {skill.description}")
                             skill_list.append(skill_id)
@@ -813,21 +936,23 @@ class CombatPA:
                 print(f"❌ Erro: {e}")
                 continue
         
-        # Regeneração no fim do turno
-        print(f"\n{'='*50}")
-        print("🔄 Fim do seu turno!")
-        print(f"{'='*50}")
+        self.end_player_turn()
+    
+    def end_player_turn(self):
+        """Regeneração no fim do turno do jogador"""
+        self.emit("turn", f"\n{'='*50}\n🔄 Fim do seu turno!\n{'='*50}", actor=self.player.name, ended=True)
         
         # HP regen de passivas
         bonuses = self.player.get_passive_bonuses()
         if bonuses['hp_regen'] > 0:
             hp_regen = int(bonuses['hp_regen'])
             self.player.restore_hp(hp_regen)
-            print(f"💚 +{hp_regen} HP regenerado (Passiva)")
+            self.emit("heal", f"💚 +{hp_regen} HP regenerado (Passiva)", target=self.player.name, amount=hp_regen)
         
         # Mostra preview de PA para próximo turno
         next_pa = min(self.player_max_pa, self.player_pa + 1 + (1 if self.used_basic_attack else 0))
-        print(f"\n💡 Próximo turno: {next_pa} PA (base +1" + (" + ataque básico +1" if self.used_basic_attack else "") + ")")
+        self.emit("pa", f"\n💡 Próximo turno: {next_pa} PA (base +1" + (" + ataque básico +1" if self.used_basic_attack else "") + ")",
+                  next_pa=next_pa)
     
     def is_combat_over(self):
         """Verifica se o combate terminou"""
@@ -913,3 +1038,61 @@ class CombatPA:
             return {
                 "result": "fled"
             }
+
+
+class SkillHandlerError(ValueError):
+    """Habilidade definida na árvore sem efeito registrado"""
+
+
+# Id de efeito -> método do CombatPA
+EFFECT_HANDLERS = {
+    "skill_damage": CombatPA._effect_skill_damage,
+    "warrior_strike": CombatPA._effect_warrior_strike,
+    "defend": CombatPA._effect_defend,
+    "burn": CombatPA._effect_burn,
+    "freeze": CombatPA._effect_freeze,
+    "heal": CombatPA._effect_heal,
+    "guard": CombatPA._effect_guard,
+    "spirit_heal": CombatPA._effect_spirit_heal,
+    "roots": CombatPA._effect_roots,
+    "poison": CombatPA._effect_poison,
+}
+
+# Classe -> skill_id -> handlers já resolvidos (consulta O(1) por uso)
+SKILL_HANDLERS = {}
+
+
+def register_skill_handler(player_class, skill_id, *effect_ids):
+    """Registra os efeitos (em ordem) de uma habilidade ativa da classe"""
+    unknown = [effect_id for effect_id in effect_ids if effect_id not in EFFECT_HANDLERS]
+    if unknown:
+        raise SkillHandlerError(f"{skill_id}: efeitos desconhecidos {unknown}")
+    SKILL_HANDLERS.setdefault(player_class, {})[skill_id] = tuple(
+        EFFECT_HANDLERS[effect_id] for effect_id in effect_ids
+    )
+
+
+def get_skill_handlers(player_class, skill_id):
+    """Handlers de uma habilidade (ou None se não houver registro)"""
+    return SKILL_HANDLERS.get(player_class, {}).get(skill_id)
+
+
+def validate_skill_handlers(player_classes=None):
+    """Garante que toda skill da árvore tem efeito: ativas aqui, passivas em PASSIVE_EFFECTS"""
+    from skill_tree import PASSIVE_EFFECTS, get_skill_tree
+
+    missing = []
+    for player_class in player_classes or SKILL_EFFECTS:
+        for skill_id, skill in get_skill_tree(player_class).skills.items():
+            if skill.is_passive:
+                if skill.effect_kind not in PASSIVE_EFFECTS:
+                    missing.append(f"{player_class}/{skill_id}")
+            elif get_skill_handlers(player_class, skill_id) is None:
+                missing.append(f"{player_class}/{skill_id}")
+    if missing:
+        raise SkillHandlerError(f"Habilidades sem efeito registrado: {', '.join(missing)}")
+
+
+for _player_class, _skill_effects in SKILL_EFFECTS.items():
+    for _skill_id, _effect_ids in _skill_effects.items():
+        register_skill_handler(_player_class, _skill_id, *_effect_ids)
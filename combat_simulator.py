@@ -0,0 +1,284 @@
+"""
+Simulador Monte Carlo de combates para balanceamento.
+
+Joga milhares de combates CombatPA por loadout (classe, nível, equipamento,
+companheiros) contra cada inimigo do registro, com uma política fixa de
+decisão, e resume taxa de vitória, turnos até matar e HP restante.
+
+O trabalho é dividido em lotes distribuídos num pool de processos; cada
+lote semeia o RNG a partir da semente base e do índice do lote, então o
+resultado é reprodutível independente de quantos workers forem usados.
+
+O fluxo de turnos é o mesmo do app_web: ação do jogador (qualquer ação
+encerra o turno, com a regeneração das passivas), companheiros, inimigo e
+início do próximo turno.
+
+Uso:
+    python combat_simulator.py --fights 2000
+    python combat_simulator.py --classes mago --enemies goblin orc_chief --level 3
+    python combat_simulator.py --classes guerreiro --gear battle_axe iron_armor --companion warrior_companion
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from combat_events import NULL_SINK
+from combat_pa import CombatPA
+from enemy import ENEMY_REGISTRY, create_enemy, resolve_enemy_key
+from item_registry import get_item_registry
+from player import Player
+
+PLAYER_CLASSES = ("guerreiro", "mago", "druida")
+
+# Ordem de distribuição dos pontos de atributo ao subir de nível
+ATTRIBUTE_CYCLE = ("strength", "vitality", "agility")
+
+# Limite de turnos por combate (evita laços em empates de defesa)
+MAX_TURNS = 60
+
+# Abaixo desta fração de HP a política bebe uma poção
+POTION_THRESHOLD = 0.35
+
+
+def make_loadout(player_class, level=1, gear=(), companions=()):
+    """Descrição serializável de um personagem simulado"""
+    return {
+        'player_class': player_class,
+        'level': level,
+        'gear': tuple(gear),
+        'companions': tuple(companions),
+    }
+
+
+def loadout_label(loadout):
+    """Nome curto do loadout para relatórios"""
+    label = f"{loadout['player_class']} nv{loadout['level']}"
+    extras = list(loadout['gear']) + list(loadout['companions'])
+    if extras:
+        label += " +" + "+".join(extras)
+    return label
+
+
+def build_player(loadout):
+    """Monta o jogador do loadout (nível, atributos, skills, equipamento, companheiros)"""
+    player = Player("Simulado", loadout['player_class'])
+
+    for _ in range(1, loadout['level']):
+        player.xp = player.get_xp_needed()
+        player.level_up_auto()
+    for index in range(player.attribute_points):
+        player.spend_attribute_point(ATTRIBUTE_CYCLE[index % len(ATTRIBUTE_CYCLE)])
+
+    # Gasta os pontos de skill na ordem dos tiers (tier 1 de todos os caminhos primeiro)
+    tiers = {1: 0, 2: 1, 3: 2, 'ultimate': 3}
+    skills = sorted(player.skill_tree.skills.values(), key=lambda skill: tiers.get(skill.tier, 4))
+    for skill in skills:
+        if player.skill_points <= 0:
+            break
+        player.unlock_skill(skill.skill_id)
+
+    registry = get_item_registry()
+    equip_by_type = {
+        'weapon': player.equip_weapon,
+        'shield': player.equip_shield,
+        'armor': player.equip_armor,
+    }
+    for item_id in loadout['gear']:
+        item = registry.get(item_id)
+        if item is None:
+            raise ValueError(f"Item desconhecido no loadout: {item_id}")
+        equip = equip_by_type.get(item.item_type)
+        if equip:
+            equip(item)
+        else:
+            player.add_to_inventory(item)
+
+    for companion_id in loadout['companions']:
+        recruited, _ = player.recruit_companion(companion_id)
+        if not recruited:
+            raise ValueError(f"Companheiro desconhecido no loadout: {companion_id}")
+
+    player.hp = player.max_hp
+    return player
+
+
+def scripted_policy(combat):
+    """Escolhe e executa a ação do jogador no turno (sempre uma ação)"""
+    player = combat.player
+
+    if player.hp < player.max_hp * POTION_THRESHOLD and combat.has_pa_for_action('item'):
+        for index, entry in enumerate(player.inventory):
+            if entry.item_type == 'consumable':
+                if combat.player_use_item(index):
+                    return 'item'
+                break
+
+    # Skill ativa mais cara que estiver pronta
+    best_skill_id = None
+    best_cost = 0
+    for skill_id in player.unlocked_skills:
+        skill = player.skill_tree.get_skill(skill_id)
+        if not skill or skill.is_passive or player.get_skill_cooldown(skill_id) > 0:
+            continue
+        cost = combat.PA_COSTS[skill_pa_action(skill)]
+        if cost <= combat.player_pa and cost > best_cost:
+            best_skill_id, best_cost = skill_id, cost
+    if best_skill_id and combat.player_use_skill(best_skill_id):
+        return 'skill'
+
+    if combat.player_attack():
+        return 'attack'
+    return 'end_turn'
+
+
+def skill_pa_action(skill):
+    """Ação de PA correspondente ao tier da skill"""
+    if skill.tier == 'ultimate':
+        return 'skill_ultimate'
+    if skill.tier in (2, 3):
+        return f'skill_tier{skill.tier}'
+    return 'skill_tier1'
+
+
+def play_fight(player, enemy, policy=scripted_policy, max_turns=MAX_TURNS):
+    """Joga um combate até o fim, sem saída. Retorna (resultado, turnos, fração de HP)"""
+    combat = CombatPA(player, enemy, sink=NULL_SINK)
+
+    while not combat.is_combat_over() and combat.turn_count < max_turns:
+        combat.turn_count += 1
+        policy(combat)
+        if not combat.is_combat_over():
+            combat.end_player_turn()
+            combat.companion_turn()
+        if not combat.is_combat_over():
+            combat.enemy_turn()
+        if not combat.is_combat_over():
+            combat.start_player_turn()
+
+    result = combat.get_combat_result()
+    if result == 'ongoing':
+        result = 'timeout'
+    return result, combat.turn_count, player.hp / player.max_hp
+
+
+def run_batch(task):
+    """Executa um lote de combates (roda dentro do worker)"""
+    loadout, enemy_key, fights, seed = task
+    random.seed(seed)
+
+    # Montar o jogador (skills, equipamento, companheiros) ainda imprime
+    # mensagens do jogo no terminal; os combates em si não escrevem nada
+    with contextlib.redirect_stdout(io.StringIO()):
+        template = build_player(loadout)
+    outcomes = []
+    for _ in range(fights):
+        player = copy.deepcopy(template)
+        outcomes.append(play_fight(player, create_enemy(enemy_key)))
+    return loadout_label(loadout), enemy_key, outcomes
+
+
+def percentile(sorted_values, fraction):
+    """Percentil simples (vizinho mais próximo) de uma lista ordenada"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(outcomes):
+    """Resumo de uma lista de (resultado, turnos, fração de HP)"""
+    wins = [outcome for outcome in outcomes if outcome[0] == 'victory']
+    turns = sorted(outcome[1] for outcome in wins)
+    hp_left = sorted(outcome[2] for outcome in wins)
+    # Histograma do HP restante nas vitórias, em faixas de 10%
+    hp_histogram = [0] * 10
+    for fraction in hp_left:
+        hp_histogram[min(9, int(fraction * 10))] += 1
+
+    return {
+        'fights': len(outcomes),
+        'win_rate': len(wins) / len(outcomes) if outcomes else 0.0,
+        'timeouts': sum(1 for outcome in outcomes if outcome[0] == 'timeout'),
+        'turns_mean': statistics.mean(turns) if turns else None,
+        'turns_p50': percentile(turns, 0.5),
+        'turns_p90': percentile(turns, 0.9),
+        'hp_left_mean': statistics.mean(hp_left) if hp_left else None,
+        'hp_left_p10': percentile(hp_left, 0.1),
+        'hp_left_p50': percentile(hp_left, 0.5),
+        'hp_left_histogram': hp_histogram,
+    }
+
+
+def simulate(loadouts, enemy_keys, fights=1000, workers=None, seed=0, batch_size=250):
+    """Simula `fights` combates para cada par (loadout, inimigo).
+
+    Retorna {(rótulo do loadout, inimigo): resumo}. workers=1 roda no
+    processo atual; None usa um worker por núcleo.
+    """
+    unknown = [enemy_key for enemy_key in enemy_keys if resolve_enemy_key(enemy_key) is None]
+    if unknown:
+        raise ValueError(f"Inimigos desconhecidos: {', '.join(unknown)}")
+
+    tasks = []
+    for loadout in loadouts:
+        for enemy_key in enemy_keys:
+            for start in range(0, fights, batch_size):
+                batch_seed = seed * 1_000_003 + len(tasks)
+                tasks.append((loadout, enemy_key, min(batch_size, fights - start), batch_seed))
+
+    grouped = {}
+    if workers == 1:
+        batches = map(run_batch, tasks)
+        for label, enemy_key, outcomes in batches:
+            grouped.setdefault((label, enemy_key), []).extend(outcomes)
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for label, enemy_key, outcomes in executor.map(run_batch, tasks):
+                grouped.setdefault((label, enemy_key), []).extend(outcomes)
+
+    return {key: summarize(outcomes) for key, outcomes in grouped.items()}
+
+
+def format_report(results):
+    """Tabela de texto com o resumo de cada par"""
+    lines = [f"{'Loadout':28s} {'Inimigo':16s} {'Vitória':>8s} {'Turnos p50/p90':>15s} {'HP médio':>9s}"]
+    for (label, enemy_key), summary in results.items():
+        turns = (
+            f"{summary['turns_p50']}/{summary['turns_p90']}"
+            if summary['turns_p50'] is not None else "-"
+        )
+        hp_left = f"{summary['hp_left_mean']:.0%}" if summary['hp_left_mean'] is not None else "-"
+        lines.append(
+            f"{label:28s} {enemy_key:16s} {summary['win_rate']:>8.1%} {turns:>15s} {hp_left:>9s}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula combates em massa para balanceamento")
+    parser.add_argument("--fights", type=int, default=1000, help="Combates por par classe × inimigo")
+    parser.add_argument("--classes", nargs="+", default=list(PLAYER_CLASSES), choices=PLAYER_CLASSES)
+    parser.add_argument("--enemies", nargs="+", default=sorted(ENEMY_REGISTRY), help="Chaves do registro de inimigos")
+    parser.add_argument("--level", type=int, default=1, help="Nível dos personagens")
+    parser.add_argument("--gear", nargs="*", default=[], help="Ids de itens para equipar")
+    parser.add_argument("--companion", nargs="*", default=[], help="Ids de companheiros recrutados")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pool (padrão: núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente base")
+    args = parser.parse_args()
+
+    loadouts = [
+        make_loadout(player_class, args.level, args.gear, args.companion)
+        for player_class in args.classes
+    ]
+    print(f"🎲 Simulando {args.fights} combates por par ({len(loadouts)} × {len(args.enemies)})\n")
+    results = simulate(loadouts, args.enemies, args.fights, args.workers, args.seed)
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
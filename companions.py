@@ -237,10 +237,13 @@ def unlock_companion_skill(companion, skill_id, player_level):
 
 
 def tick_companion_cooldowns(companion):
-    """Reduz o cooldown das skills do companheiro em 1 turno."""
+    """Reduz o cooldown das skills do companheiro em 1 turno. True se algum baixou."""
+    changed = False
     for skill_id, cooldown in list(companion.get('skill_cooldowns', {}).items()):
         if cooldown > 0:
             companion['skill_cooldowns'][skill_id] = cooldown - 1
+            changed = True
+    return changed
 
 
 def choose_companion_skill(companion):
@@ -313,4 +316,44 @@ def hydrate_companion(companion_data, player_level=1):
     hydrated['skill_priority'] = list(template.get('skill_priority', []))
     hydrated['unlocked_skills'] = list(companion_data.get('unlocked_skills', hydrated.get('unlocked_skills', [])))
     hydrated['skill_cooldowns'] = dict(companion_data.get('skill_cooldowns', hydrated.get('skill_cooldowns', {})))
-    return sync_companion_progress(hydrated, player_level)
\ No newline at end of file
+    return sync_companion_progress(hydrated, player_level)
+
+# Campos sempre vindos do template (nunca vão para o save)
+TEMPLATE_ONLY_FIELDS = {'skills', 'skill_priority'}
+
+
+def companion_delta(companion):
+    """Só o que difere do template: id, progresso de skills e campos alterados (ex.: arma)."""
+    companion_id = companion.get('id')
+    template = COMPANION_TEMPLATES.get(companion_id)
+    if not template:
+        return copy.deepcopy(companion)
+
+    delta = {'id': companion_id}
+    for key, value in companion.items():
+        if key in TEMPLATE_ONLY_FIELDS or key in {'id', 'unlocked_skills', 'skill_cooldowns'}:
+            continue
+        if template.get(key) != value:
+            delta[key] = copy.deepcopy(value)
+
+    unlocked = companion.get('unlocked_skills', [])
+    if unlocked:
+        delta['unlocked_skills'] = list(unlocked)
+    cooldowns = {skill_id: turns for skill_id, turns in companion.get('skill_cooldowns', {}).items() if turns}
+    if cooldowns:
+        delta['skill_cooldowns'] = cooldowns
+    return delta
+
+
+def restore_companion(delta, player_level=1):
+    """Recria um companheiro do save: template atual + diferenças salvas."""
+    companion = build_companion(delta.get('id'), player_level)
+    if companion is None:
+        # Template removido: mantém os dados como estão
+        return copy.deepcopy(delta)
+
+    for key, value in delta.items():
+        if key not in TEMPLATE_ONLY_FIELDS:
+            companion[key] = copy.deepcopy(value)
+    companion['skill_cooldowns'] = dict(delta.get('skill_cooldowns', {}))
+    return sync_companion_progress(companion, player_level)
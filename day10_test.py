@@ -0,0 +1,238 @@
+from player import Player
+from world import World
+from session_store import MemorySessionStore, DiskSessionStore
+import os
+import tempfile
+import threading
+import time
+
+
+def make_game_data(name="Arthon"):
+    """Monta os dados de um jogo ativo como o app_web faz"""
+    return {
+        'player': Player(name),
+        'world': World(),
+        'save_filename': None,
+    }
+
+
+def test_memory_store_basic():
+    """Testa operações estilo dicionário do store em memória"""
+    print("=== Teste 1: Store em Memória ===")
+    store = MemorySessionStore()
+    game_data = make_game_data()
+
+    store['abc'] = game_data
+    assert 'abc' in store
+    assert store['abc'] is game_data
+    assert 'xyz' not in store
+
+    assert store.pop('abc') is game_data
+    assert 'abc' not in store
+    assert store.pop('abc', None) is None
+    print("✅ Store em memória funcionando!\n")
+
+
+def test_memory_store_lru_limit():
+    """Testa limite LRU sem store de apoio"""
+    print("=== Teste 2: Limite LRU ===")
+    store = MemorySessionStore(max_games=2)
+
+    store['a'] = make_game_data("A")
+    store['b'] = make_game_data("B")
+    store['a']  # 'a' passa a ser o mais recente
+    store['c'] = make_game_data("C")
+
+    assert len(store) == 2
+    assert 'a' in store
+    assert 'b' not in store
+    assert 'c' in store
+    print("✅ Jogo menos usado foi despejado!\n")
+
+
+def test_disk_store_roundtrip():
+    """Testa snapshot em disco e recarga sob demanda"""
+    print("=== Teste 3: Store em Disco ===")
+    session_dir = tempfile.mkdtemp()
+    store = DiskSessionStore(session_dir)
+
+    game_data = make_game_data()
+    game_data['player'].position = "4"
+    game_data['world'].visited_rooms.update({"1", "2", "4"})
+    store['abc'] = game_data
+    store.flush()
+
+    # Outro processo/worker enxerga o mesmo jogo
+    other_store = DiskSessionStore(session_dir)
+    loaded = other_store['abc']
+    assert loaded['player'].name == "Arthon"
+    assert loaded['player'].position == "4"
+    assert loaded['world'].visited_rooms == {"1", "2", "4"}
+
+    # Alterações feitas no request são gravadas no flush
+    loaded['player'].position = "5"
+    other_store.flush()
+    assert store['abc']['player'].position == "5"
+
+    store.pop('abc')
+    store.flush()
+    assert 'abc' not in DiskSessionStore(session_dir)
+    print("✅ Store em disco funcionando!\n")
+
+
+def test_memory_store_with_backing():
+    """Testa despejo para disco e reidratação"""
+    print("=== Teste 4: LRU com Store de Apoio ===")
+    backing = DiskSessionStore(tempfile.mkdtemp())
+    store = MemorySessionStore(max_games=1, backing_store=backing)
+
+    store['a'] = make_game_data("A")
+    store['b'] = make_game_data("B")
+    assert len(store) == 1
+
+    # 'a' foi para o disco e volta ao ser acessado
+    assert store['a']['player'].name == "A"
+    assert store['b']['player'].name == "B"
+    print("✅ Jogos despejados são recarregados sob demanda!\n")
+
+
+def test_idle_eviction_and_counters():
+    """Testa despejo por inatividade e contadores"""
+    print("=== Teste 5: Despejo por Inatividade ===")
+    now = [0.0]
+    backing = DiskSessionStore(tempfile.mkdtemp())
+    store = MemorySessionStore(max_games=2, backing_store=backing, idle_ttl=60, clock=lambda: now[0])
+
+    store['a'] = make_game_data("A")
+    now[0] = 30
+    store['b'] = make_game_data("B")
+
+    # 'a' fica ocioso por mais de 60s e vai para o snapshot
+    now[0] = 70
+    store.evict_idle()
+    stats = store.stats()
+    assert stats['resident'] == 1
+    assert stats['expired'] == 1
+
+    # Limite de residentes despeja o menos usado
+    store['c'] = make_game_data("C")
+    store['d'] = make_game_data("D")
+    assert store.stats()['evicted'] == 1
+
+    # Jogador volta: jogo é reidratado do snapshot
+    assert store['a']['player'].name == "A"
+    stats = store.stats()
+    assert stats['rehydrated'] == 1
+    assert stats['resident'] == 2
+    print(f"Contadores: {stats}")
+    print("✅ Despejo e reidratação funcionando!\n")
+
+
+def test_disk_store_lost_updates():
+    """Testa que dois workers não perdem as ações um do outro"""
+    print("=== Teste 6: Trava entre Workers ===")
+    session_dir = tempfile.mkdtemp()
+    store = DiskSessionStore(session_dir)
+    store['abc'] = make_game_data()
+    store.flush()
+
+    # Dois workers somam XP no mesmo jogo ao mesmo tempo
+    def add_xp(worker_store):
+        game_data = worker_store['abc']
+        xp = game_data['player'].xp
+        time.sleep(0.02)
+        game_data['player'].xp = xp + 10
+        worker_store.flush()
+
+    workers = [threading.Thread(target=add_xp, args=(DiskSessionStore(session_dir),)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert DiskSessionStore(session_dir)['abc']['player'].xp == 40
+    # Um GET que só lê não regrava o snapshot
+    reader = DiskSessionStore(session_dir)
+    assert reader['abc']['player'].xp == 40
+    reader.flush()
+    assert reader.stats()['skipped_writes'] == 1
+    print("✅ Nenhuma ação perdida!\n")
+
+
+class SlowBackingStore(DiskSessionStore):
+    """Store de apoio com disco lento: o primeiro put espera até ser liberado"""
+
+    def __init__(self, session_dir):
+        super().__init__(session_dir)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def put(self, game_id, game_data):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        super().put(game_id, game_data)
+
+
+def test_eviction_outside_lock():
+    """Testa que gravar um jogo despejado não trava os outros requests"""
+    print("=== Teste 7: Despejo sem Travar o Store ===")
+    backing = SlowBackingStore(tempfile.mkdtemp())
+    store = MemorySessionStore(max_games=1, backing_store=backing)
+    store['a'] = make_game_data("A")
+
+    # 'b' despeja 'a', que fica gravando no disco lento
+    writer = threading.Thread(target=store.put, args=('b', make_game_data("B")))
+    writer.start()
+    assert backing.started.wait(5)
+
+    # Enquanto isso o store responde, e 'a' volta sem esperar o disco
+    started = time.monotonic()
+    assert store['b']['player'].name == "B"
+    assert store['a']['player'].name == "A"
+    assert time.monotonic() - started < 1
+    backing.release.set()
+    writer.join()
+
+    # A gravação terminou depois da volta de 'a': o snapshot antigo é descartado
+    assert 'a' not in backing
+    assert store['a']['player'].name == "A"
+    print("✅ Disco fora da trava do store!\n")
+
+
+def test_snapshot_ttl_sweep():
+    """Testa a varredura dos snapshots de jogos abandonados"""
+    print("=== Teste 8: Snapshots Vencidos ===")
+    session_dir = tempfile.mkdtemp()
+    store = DiskSessionStore(session_dir, snapshot_ttl=60)
+    store['velho'] = make_game_data("Velho")
+    store['novo'] = make_game_data("Novo")
+    store.flush()
+
+    old = os.path.getmtime(os.path.join(session_dir, "velho.session")) - 120
+    os.utime(os.path.join(session_dir, "velho.session"), (old, old))
+    assert store.sweep_expired() == 1
+    assert 'velho' not in store
+    assert store['novo']['player'].name == "Novo"
+    store.flush()
+    assert not os.path.exists(os.path.join(session_dir, "velho.session"))
+    assert not os.path.exists(os.path.join(session_dir, "velho.lock"))
+    assert store.stats()['swept'] == 1
+    print(f"Restantes: {sorted(os.listdir(session_dir))}")
+    print("✅ Abas abandonadas não ficam no disco!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 10 - Store de Jogos Ativos\n")
+
+    test_memory_store_basic()
+    test_memory_store_lru_limit()
+    test_disk_store_roundtrip()
+    test_memory_store_with_backing()
+    test_idle_eviction_and_counters()
+    test_disk_store_lost_updates()
+    test_eviction_outside_lock()
+    test_snapshot_ttl_sweep()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 10 CONCLUÍDOS!")
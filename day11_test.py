@@ -0,0 +1,50 @@
+from world import World, ROOM_TEMPLATES
+
+
+def test_worlds_share_room_templates():
+    """Testa que todos os mundos usam o mesmo template de salas"""
+    print("=== Teste 1: Template Compartilhado ===")
+    world_a = World()
+    world_b = World()
+
+    # Salas sem baú sorteado são o próprio template
+    assert world_a.get_room("2") is world_b.get_room("2")
+    assert world_a.get_room("2") is ROOM_TEMPLATES["2"]
+
+    # O template é somente leitura
+    try:
+        ROOM_TEMPLATES["2"]["name"] = "Outra Sala"
+        assert False, "Template não deveria aceitar alteração"
+    except TypeError:
+        pass
+    print("✅ Salas compartilhadas entre jogos!\n")
+
+
+def test_chest_overlay_per_world():
+    """Testa que o conteúdo dos baús é individual por jogo"""
+    print("=== Teste 2: Overlay de Baús ===")
+    world_a = World()
+    world_b = World()
+
+    world_a.chest_items["4"] = ["health_potion"]
+    world_b.chest_items["4"] = ["iron_shield", "exit_key"]
+
+    assert world_a.get_room("4")["items"] == ["health_potion"]
+    assert world_b.get_room("4")["items"] == ["iron_shield", "exit_key"]
+    assert world_a.get_room("4")["name"] == ROOM_TEMPLATES["4"]["name"]
+    assert len(world_a.rooms) == len(ROOM_TEMPLATES)
+
+    # Coletar em um jogo não afeta o outro
+    assert world_a.get_treasure("4") == ["health_potion"]
+    assert world_b.has_treasure("4")
+    print("✅ Baús independentes por jogo!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 11 - Mapa da Dungeon\n")
+
+    test_worlds_share_room_templates()
+    test_chest_overlay_per_world()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 11 CONCLUÍDOS!")
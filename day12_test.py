@@ -0,0 +1,98 @@
+from dungeon_loader import load_dungeon, DungeonDefinitionError, _validate
+from minimap import MiniMap
+from world import World
+
+
+def test_compiled_dungeon_shared():
+    """Testa que a dungeon é compilada uma vez e compartilhada"""
+    print("=== Teste 1: Dungeon Compilada ===")
+    dungeon = load_dungeon("forgotten")
+    assert load_dungeon("forgotten") is dungeon
+
+    world = World()
+    assert world.dungeon is dungeon
+    assert MiniMap(world).room_positions is dungeon.positions
+    assert len(dungeon.room_ids) == 31
+    assert dungeon.positions["1"] == (0, 4)
+
+    # Adjacência por índice inteiro espelha as conexões das salas
+    index = dungeon.room_index["2"]
+    targets = {direction: dungeon.room_ids[target] for direction, target in dungeon.adjacency[index]}
+    assert targets == dict(dungeon.rooms["2"]["connections"])
+    print(f"{dungeon}")
+    print("✅ Dungeon compilada e compartilhada!\n")
+
+
+def test_invalid_dungeon():
+    """Testa validação do arquivo de dungeon"""
+    print("=== Teste 2: Validação ===")
+    try:
+        load_dungeon("nao_existe")
+        assert False, "Dungeon inexistente deveria falhar"
+    except DungeonDefinitionError:
+        pass
+
+    broken = {
+        "start_room": "1",
+        "rooms": {
+            "1": {"name": "Sala", "type": "start", "connections": {"sul": "9"}, "position": [0, 0]},
+        },
+    }
+    try:
+        _validate("quebrada", broken)
+        assert False, "Conexão para sala inexistente deveria falhar"
+    except DungeonDefinitionError as e:
+        print(f"Erro esperado: {e}")
+    print("✅ Validação funcionando!\n")
+
+
+def test_route_shortest_path():
+    """Testa rotas pré-computadas entre salas"""
+    print("=== Teste 3: Rotas ===")
+    world = World()
+
+    assert world.route("1", "1") == []
+    assert world.route("1", "2") == [("sul", "2")]
+
+    # Seguir a rota com move() chega ao destino
+    steps = world.route("1", "31")
+    position = "1"
+    for direction, room_id in steps:
+        position = world.move(position, direction)
+        assert position == room_id
+    assert position == "31"
+    assert len(steps) == world.dungeon.distances[0][world.dungeon.room_index["31"]]
+    assert world.route("1", "999") is None
+    print(f"Rota 1 -> 31: {len(steps)} passos")
+    print("✅ Rotas funcionando!\n")
+
+
+def test_nearest_targets():
+    """Testa busca do alvo mais próximo respeitando o estado do jogo"""
+    print("=== Teste 4: Alvo Mais Próximo ===")
+    world = World()
+
+    enemy_room = world.nearest("1", "enemy")
+    assert world.has_enemy(enemy_room)
+    world.defeated_enemies.add(enemy_room)
+    assert world.nearest("1", "enemy") != enemy_room
+
+    treasure_room = world.nearest("1", "treasure")
+    assert world.has_treasure(treasure_room)
+    world.looted_rooms.add(treasure_room)
+    assert world.nearest("1", "treasure") != treasure_room
+
+    assert world.is_exit(world.nearest("1", "exit"))
+    print("✅ Alvos mais próximos encontrados!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 12 - Dungeons em Arquivo\n")
+
+    test_compiled_dungeon_shared()
+    test_invalid_dungeon()
+    test_route_shortest_path()
+    test_nearest_targets()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 12 CONCLUÍDOS!")
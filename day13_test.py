@@ -0,0 +1,103 @@
+from enemy import create_enemy, spawn_enemies, register_enemy, Enemy, OrcChief, PrisionGuard
+from world import World
+from item_registry import get_item_registry
+from save_manager import SaveManager
+
+
+def test_enemy_registry():
+    """Testa criação de inimigos pelo registro"""
+    print("=== Teste 1: Registro de Inimigos ===")
+    assert isinstance(create_enemy("orc_chief"), OrcChief)
+    assert isinstance(create_enemy("Orc_Chief"), OrcChief)
+
+    # Nomes alternativos apontam para a mesma classe
+    assert isinstance(create_enemy("prision_guard"), PrisionGuard)
+    assert isinstance(create_enemy("prisionguard"), PrisionGuard)
+
+    assert create_enemy("dragao_inexistente") is None
+    assert create_enemy(None) is None
+    print("✅ Registro de inimigos funcionando!\n")
+
+
+def test_enemy_clones_are_independent():
+    """Testa que cada inimigo criado tem seu próprio estado"""
+    print("=== Teste 2: Inimigos Independentes ===")
+    first = create_enemy("orc_chief")
+    second = create_enemy("orc_chief")
+    assert first is not second
+
+    first.take_damage(30)
+    first.get_attack_damage()
+    assert second.hp == second.max_hp
+    assert second.turn_counter == 0
+    print("✅ Inimigos não compartilham estado!\n")
+
+
+def test_register_new_enemy():
+    """Testa registrar um novo monstro sem mexer no World"""
+    print("=== Teste 3: Novo Monstro ===")
+
+    class Slime(Enemy):
+        def __init__(self):
+            super().__init__("Slime", 20, 5, 0, 10, "Uma gosma verde.")
+
+    register_enemy("slime", Slime, aliases=("gosma",))
+    assert create_enemy("gosma").name == "Slime"
+    assert World().create_enemy_by_name("slime").name == "Slime"
+    print("✅ Novo monstro registrado!\n")
+
+
+def test_spawn_room_enemies():
+    """Testa criação da fila de inimigos de uma sala múltipla"""
+    print("=== Teste 4: Fila de Inimigos ===")
+    world = World()
+    enemies = world.spawn_room_enemies("31")
+    assert [enemy.name for enemy in enemies] == ["Guerreiro Dragão", "mago das Sombras"]
+    assert spawn_enemies(["goblin", "nao_existe"])[0].name == "Goblin"
+
+    world.defeated_enemies.add("31")
+    assert world.spawn_room_enemies("31") == []
+    print("✅ Fila de inimigos criada de uma vez!\n")
+
+
+def test_item_registry_cached():
+    """Testa o registro de itens compartilhado"""
+    print("=== Teste 5: Registro de Itens ===")
+    registry = get_item_registry()
+    assert get_item_registry() is registry
+    assert registry.get("health_potion").name == "Poção de Cura"
+    assert registry.get("lightning_rod") is registry.get("arcane_staff")
+    assert SaveManager()._get_item_registry() is registry.by_name
+
+    # Listas por classe pré-calculadas
+    assert "battle_axe" in registry.allowed_ids("chest", "guerreiro")
+    assert "battle_axe" not in registry.allowed_ids("chest", "mago")
+    assert "health_potion" in registry.allowed_ids("chest", "Mago")
+    assert "health_potion" not in registry.allowed_ids("boss", "mago")
+    assert registry.allowed_ids("any", "mago") is None
+    print("✅ Registro de itens funcionando!\n")
+
+
+def test_chest_loot_filtered_by_class():
+    """Testa o filtro de classe usando o registro"""
+    print("=== Teste 6: Loot por Classe ===")
+    world = World()
+    world.chest_items["4"] = ["battle_axe", "crystal_orb", "fireball"]
+
+    items = world.get_item_from_room("4", player_class="mago", source="chest")
+    assert [item.name for item in items] == [get_item_registry().get("crystal_orb").name]
+    print("✅ Loot filtrado por classe!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 13 - Registros de Inimigos e Itens\n")
+
+    test_enemy_registry()
+    test_enemy_clones_are_independent()
+    test_register_new_enemy()
+    test_spawn_room_enemies()
+    test_item_registry_cached()
+    test_chest_loot_filtered_by_class()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 13 CONCLUÍDOS!")
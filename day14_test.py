@@ -0,0 +1,138 @@
+from player import Player
+from world import World
+from save_manager import SaveManager
+from items import health_potion, rusty_sword, fireball, iron_armor
+import json
+import os
+import pickle
+import tempfile
+
+
+def test_inventory_shares_base_items():
+    """Testa que o inventário guarda os itens base, sem cópias"""
+    print("=== Teste 1: Itens Compartilhados ===")
+    player = Player("Arthon", "mago")
+    other = Player("Lyra", "mago")
+
+    assert player.inventory[0].item is health_potion
+    assert other.inventory[0].item is player.inventory[0].item
+
+    player.add_to_inventory(rusty_sword)
+    assert player.inventory[-1].item is rusty_sword
+
+    # Snapshots (pickle) também devolvem a instância base
+    restored = pickle.loads(pickle.dumps(player))
+    assert restored.inventory[-1].item is rusty_sword
+    print("✅ Inventário sem cópias!\n")
+
+
+def test_save_uses_item_ids():
+    """Testa que o save guarda ids estáveis"""
+    print("=== Teste 2: Save com Ids ===")
+    save_manager = SaveManager(tempfile.mkdtemp())
+    player = Player("Arthon", "mago")
+    player.known_spells.append(fireball)
+    player.equipped_armor = iron_armor
+
+    filepath = save_manager.save_game(player, World(), "ids.json")
+    with open(filepath, "r") as f:
+        player_data = json.load(f)["player"]
+
+    assert player_data["inventory"] == [["health_potion", 2]]
+    assert player_data["spells"] == ["fireball"]
+    assert player_data["equipment"][2] == "iron_armor"
+
+    loaded_player, _ = save_manager.load_game("ids.json")
+    assert loaded_player.known_spells[0] is fireball
+    assert loaded_player.equipped_armor is iron_armor
+    print("✅ Save com ids funcionando!\n")
+
+
+def test_load_name_based_save():
+    """Testa compatibilidade com saves antigos (itens pelo nome)"""
+    print("=== Teste 3: Save Antigo ===")
+    save_dir = tempfile.mkdtemp()
+    save_manager = SaveManager(save_dir)
+    # Formato 1.0: JSON indentado, itens pelo nome exibido
+    save_data = {
+        "version": "1.0",
+        "timestamp": "2025-01-01T00:00:00",
+        "player": {
+            "name": "Arthon", "player_class": "guerreiro", "level": 1, "xp": 0,
+            "max_hp": 100, "hp": 100, "strength": 5, "vitality": 5, "agility": 5,
+            "position": "1",
+            "inventory": [health_potion.name, rusty_sword.name],
+            "equipped_weapon": rusty_sword.name,
+        },
+        "world": {"visited_rooms": ["1"], "defeated_enemies": [], "looted_rooms": []},
+    }
+    with open(os.path.join(save_dir, "old.json"), "w") as f:
+        json.dump(save_data, f, indent=2)
+
+    loaded_player, _ = save_manager.load_game("old.json")
+    assert [entry.item for entry in loaded_player.inventory] == [health_potion, rusty_sword]
+    assert loaded_player.equipped_weapon is rusty_sword
+    print("✅ Saves antigos continuam carregando!\n")
+
+
+def test_consumables_stack():
+    """Testa pilhas de consumíveis no inventário"""
+    print("=== Teste 4: Pilhas de Poções ===")
+    player = Player("Arthon", "guerreiro")
+    for _ in range(5):
+        player.add_to_inventory(health_potion)
+
+    # Poção inicial + 5: uma única entrada, índices estáveis
+    assert len(player.inventory) == 2
+    assert player.count_item(health_potion) == 6
+    shield_index = 1
+    assert player.inventory[shield_index].name == "Escudo Simples"
+
+    player.take_damage(40)
+    assert player.use_item(0)
+    assert player.count_item(health_potion) == 5
+    assert player.inventory[shield_index].name == "Escudo Simples"
+
+    # Equipamentos continuam sem duplicar
+    assert not player.add_to_inventory(player.inventory[shield_index].item)
+
+    # Save/load preserva a quantidade
+    save_manager = SaveManager(tempfile.mkdtemp())
+    save_manager.save_game(player, World(), "stack.json")
+    loaded_player, _ = save_manager.load_game("stack.json")
+    assert loaded_player.count_item(health_potion) == 5
+    assert len(loaded_player.inventory) == 2
+    print("✅ Poções empilhadas!\n")
+
+
+def test_models_use_slots():
+    """Testa que itens, inimigos e skills não carregam __dict__"""
+    print("=== Teste 5: Modelos Compactos ===")
+    from enemy import create_enemy
+    from skill_tree import SkillTree
+
+    enemy = create_enemy("orc_chief")
+    skill = next(iter(SkillTree("guerreiro").skills.values()))
+    for obj in (health_potion, rusty_sword, fireball, enemy, skill):
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+    # Estado do inimigo sobrevive ao snapshot
+    enemy.take_damage(10)
+    enemy.get_attack_damage()
+    restored = pickle.loads(pickle.dumps(enemy))
+    assert restored.hp == enemy.hp
+    assert restored.turn_counter == 1
+    print("✅ Modelos com __slots__!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 14 - Itens por Id\n")
+
+    test_inventory_shares_base_items()
+    test_save_uses_item_ids()
+    test_load_name_based_save()
+    test_consumables_stack()
+    test_models_use_slots()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 14 CONCLUÍDOS!")
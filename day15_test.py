@@ -0,0 +1,133 @@
+from player import Player
+from skill_tree import get_skill_tree
+import pickle
+
+
+def test_skill_tree_shared_per_class():
+    """Testa que a árvore de habilidades é compartilhada por classe"""
+    print("=== Teste 1: Árvore Compartilhada ===")
+    warrior_a = Player("Arthon", "guerreiro")
+    warrior_b = Player("Brom", "guerreiro")
+    mage = Player("Lyra", "mago")
+
+    assert warrior_a.skill_tree is warrior_b.skill_tree
+    assert warrior_a.skill_tree is get_skill_tree("guerreiro")
+    assert mage.skill_tree is not warrior_a.skill_tree
+    assert len(warrior_a.skill_cooldowns) == len(warrior_a.skill_tree.slot_ids)
+
+    # Snapshot não copia a árvore
+    restored = pickle.loads(pickle.dumps(warrior_a))
+    assert restored.skill_tree is warrior_a.skill_tree
+    print("✅ Árvore compartilhada entre jogadores!\n")
+
+
+def test_cooldowns_per_player():
+    """Testa que cooldowns ficam no jogador, não na skill"""
+    print("=== Teste 2: Cooldown por Jogador ===")
+    player = Player("Arthon", "guerreiro")
+    other = Player("Brom", "guerreiro")
+
+    skill_id = next(
+        skill_id for skill_id, skill in player.skill_tree.skills.items()
+        if not skill.is_passive and not skill.requirements and skill.cooldown > 0
+    )
+    cooldown = player.skill_tree.get_skill(skill_id).cooldown
+    for hero in (player, other):
+        hero.skill_points = 1
+        hero.unlock_skill(skill_id)
+
+    success, _ = player.use_skill(skill_id)
+    assert success
+    assert player.get_skill_cooldown(skill_id) == cooldown
+    assert other.get_skill_cooldown(skill_id) == 0
+
+    success, message = player.use_skill(skill_id)
+    assert not success
+    print(f"Bloqueado: {message}")
+
+    player.tick_skill_cooldowns()
+    assert player.get_skill_cooldown(skill_id) == cooldown - 1
+    print("✅ Cooldowns independentes!\n")
+
+
+def test_passive_bonus_profile():
+    """Testa o perfil de bônus passivos em cache"""
+    print("=== Teste 3: Bônus Passivos ===")
+    from skill_tree import PASSIVE_EFFECTS
+
+    # Toda skill passiva tem um efeito conhecido
+    for player_class in ("guerreiro", "mago", "druida"):
+        for skill in get_skill_tree(player_class).skills.values():
+            if skill.is_passive:
+                assert skill.effect_kind in PASSIVE_EFFECTS, skill.skill_id
+
+    player = Player("Arthon", "guerreiro")
+    player.skill_points = 10
+    for skill_id in ("w_dps_1", "w_dps_2", "w_berserk_1"):
+        success, message = player.unlock_skill(skill_id)
+        assert success, message
+
+    bonuses = player.get_passive_bonuses()
+    crit = player.skill_tree.get_skill("w_dps_2").power
+    assert bonuses['crit_chance'] == crit
+    assert bonuses['damage_multiplier'] == 1.0
+
+    # Fúria Crescente continua acompanhando o HP a cada consulta
+    fury = player.skill_tree.get_skill("w_berserk_1").power
+    player.hp = player.max_hp // 2
+    expected = 1.0 + (1.0 - player.hp / player.max_hp) * fury / 100
+    assert abs(player.get_passive_bonuses()['damage_multiplier'] - expected) < 1e-9
+
+    # O perfil devolvido é uma cópia
+    bonuses['crit_chance'] = 999
+    assert player.get_passive_bonuses()['crit_chance'] == crit
+
+    # Desbloquear uma passiva invalida o cache
+    assert player.unlock_skill("w_berserk_2")[0]
+    assert player.unlock_skill("w_berserk_3")[0]
+    lifesteal = player.skill_tree.get_skill("w_berserk_3").power
+    assert player.get_passive_bonuses()['lifesteal'] == lifesteal
+    print("✅ Bônus passivos em cache!\n")
+
+
+def test_skill_handlers_registered():
+    """Testa o despacho de efeitos por id de habilidade"""
+    print("=== Teste 4: Efeitos por Id ===")
+    from combat_pa import (
+        CombatPA, SkillHandlerError, get_skill_handlers,
+        register_skill_handler, validate_skill_handlers,
+    )
+    from enemy import create_enemy
+
+    # Toda skill ativa das três classes tem handler
+    validate_skill_handlers()
+    assert get_skill_handlers("mago", "m_fire_1") is not None
+    assert get_skill_handlers("mago", "w_dps_1") is None
+
+    try:
+        register_skill_handler("mago", "m_fire_1", "efeito_inexistente")
+        assert False, "efeito desconhecido deveria falhar"
+    except SkillHandlerError:
+        pass
+
+    # Bola de Fogo: dano + queimadura, sem olhar o nome da skill
+    player = Player("Lyra", "mago")
+    enemy = create_enemy("goblin")
+    combat = CombatPA(player, enemy)
+    damage = combat.apply_skill_effects(player.skill_tree.get_skill("m_fire_1"), player, enemy)
+    assert damage > 0
+    assert enemy.hp == enemy.max_hp - damage
+    assert combat.enemy_status[0]['type'] == 'burning'
+    print("✅ Efeitos despachados por id!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 15 - Habilidades Compartilhadas\n")
+
+    test_skill_tree_shared_per_class()
+    test_cooldowns_per_player()
+    test_passive_bonus_profile()
+    test_skill_handlers_registered()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 15 CONCLUÍDOS!")
@@ -0,0 +1,210 @@
+from player import Player
+from enemy import create_enemy
+from combat_pa import CombatPA
+from combat_events import JsonEventCollector, NULL_SINK
+import contextlib
+import io
+import json
+
+
+def test_null_sink_is_silent():
+    """Testa que o motor não escreve nada com o NullSink"""
+    print("=== Teste 1: Combate Silencioso ===")
+    player = Player("Arthon", "guerreiro")
+    enemy = create_enemy("goblin")
+    combat = CombatPA(player, enemy, sink=NULL_SINK)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        combat.player_attack()
+        combat.enemy_status.append({'type': 'burning', 'damage': 2, 'duration': 1})
+        combat.start_player_turn()
+        combat.attempt_flee()
+    assert output.getvalue() == ""
+    print("✅ Nenhuma saída no terminal!\n")
+
+
+def test_json_collector_events():
+    """Testa os eventos estruturados coletados para a web"""
+    print("=== Teste 2: Eventos JSON ===")
+    player = Player("Arthon", "guerreiro")
+    enemy = create_enemy("orc_chief")
+    events = JsonEventCollector()
+    combat = CombatPA(player, enemy, sink=events)
+
+    assert combat.player_attack()
+    damage_events = [event for event in events.events if event['type'] == 'damage']
+    assert damage_events[0]['amount'] == enemy.max_hp - enemy.hp
+    assert damage_events[0]['target'] == enemy.name
+
+    combat.enemy_status.append({'type': 'poison', 'damage': 3, 'duration': 1})
+    combat.reset_enemy_pa()
+    tick = next(event for event in events.events if event['type'] == 'status_tick')
+    assert tick['status'] == 'poison' and tick['amount'] == 3
+
+    # PA insuficiente vira evento de erro, sem exceção
+    combat.player_pa = 0
+    assert not combat.player_defend()
+    assert events.events[-1]['type'] == 'error'
+
+    # Tudo serializável e sem quebras de linha sobrando
+    json.dumps(events.events)
+    assert all(message == message.strip() for message in events.messages())
+    print(f"{len(events.events)} eventos coletados")
+    print("✅ Eventos estruturados funcionando!\n")
+
+
+def test_console_sink_default():
+    """Testa que o terminal continua recebendo as mensagens"""
+    print("=== Teste 3: Console ===")
+    player = Player("Arthon", "guerreiro")
+    combat = CombatPA(player, create_enemy("goblin"))
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        combat.player_defend()
+    assert "postura defensiva" in output.getvalue()
+    print("✅ Console renderizando eventos!\n")
+
+
+def test_enemy_specials_as_events():
+    """Testa ataques especiais, magias e poções como eventos, sem print"""
+    print("=== Teste 4: Especiais e Itens sem Print ===")
+    from items import fireball, health_potion
+    player = Player("Lyra", "mago")
+    player.max_hp = player.hp = 1000
+    player.known_spells.append(fireball)
+    player.inventory.clear()
+    player.add_to_inventory(health_potion)
+    enemy = create_enemy("necromancer")
+    enemy.hp = 50
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        silent = CombatPA(player, enemy, sink=NULL_SINK)
+        for _ in range(3):
+            silent.enemy_attack()
+        silent.player_use_spell(0)
+        silent.player_use_item(0)
+    assert output.getvalue() == ""
+
+    events = JsonEventCollector()
+    combat = CombatPA(player, create_enemy("necromancer"), sink=events)
+    combat.enemy.hp = 50
+    for _ in range(3):
+        combat.enemy_attack()
+    special = next(event for event in events.events if event['type'] == 'special')
+    assert special['attack'] == "DRENAGEM DE ALMA" and special['actor'] == "Necromante"
+    heal = next(event for event in events.events if event['type'] == 'heal')
+    assert heal['target'] == "Necromante" and heal['amount'] == combat.enemy.hp - 50
+    print(f"{special['message']} / {heal['message']}")
+    print("✅ Especiais do inimigo chegam ao sink!\n")
+
+
+def test_simulator_reproducible():
+    """Testa o simulador Monte Carlo (mesma semente, mesmo resultado)"""
+    print("=== Teste 5: Simulador de Combate ===")
+    from combat_simulator import make_loadout, simulate
+
+    loadouts = [make_loadout("guerreiro"), make_loadout("mago", level=2, companions=["mage_companion"])]
+    inline = simulate(loadouts, ["goblin"], fights=40, workers=1, seed=7, batch_size=10)
+    pooled = simulate(loadouts, ["goblin"], fights=40, workers=2, seed=7, batch_size=10)
+    assert inline == pooled
+
+    summary = inline[("guerreiro nv1", "goblin")]
+    assert summary['fights'] == 40
+    assert 0.0 <= summary['win_rate'] <= 1.0
+    assert sum(summary['hp_left_histogram']) == round(summary['win_rate'] * 40)
+    print(f"Guerreiro x Goblin: {summary['win_rate']:.0%} de vitórias")
+    print("✅ Simulação reprodutível!\n")
+
+
+def test_vectorized_estimator():
+    """Testa o estimador vetorizado contra combates reais"""
+    print("=== Teste 6: Estimador Vetorizado ===")
+    import combat_estimator
+    if not combat_estimator.is_available():
+        print("⚠️ numpy não instalado, teste ignorado\n")
+        return
+    import copy
+    import random
+    from combat_simulator import play_fight
+
+    # Ciclo do Orc Chief: ataque poderoso a cada 3 ataques
+    cycle = combat_estimator.enemy_attack_cycle("orc_chief")
+    assert [damage for damage, _ in cycle[:3]] == [28, 28, 56]
+    assert any(heal > 0 for _, heal in combat_estimator.enemy_attack_cycle("necromancer"))
+
+    player = Player("Lyra", "mago")
+    estimate = combat_estimator.estimate_fight(player, "goblin", seed=1)
+    assert abs(estimate['win_chance'] + estimate['loss_chance'] + estimate['timeout_chance'] - 1.0) < 1e-9
+
+    # Mesmo modelo do CombatPA com apenas ataques básicos
+    random.seed(3)
+    fights = 600
+    with contextlib.redirect_stdout(io.StringIO()):
+        wins = sum(
+            play_fight(copy.deepcopy(player), create_enemy("goblin"), policy=lambda combat: combat.player_attack())[0] == 'victory'
+            for _ in range(fights)
+        )
+    print(f"Estimado {estimate['win_chance']:.1%} x simulado {wins / fights:.1%}")
+    assert abs(estimate['win_chance'] - wins / fights) < 0.06
+
+    # Regeneração passiva (Escudo Vivo) entra no modelo e no combate simulado
+    tank = Player("Arthon", "guerreiro")
+    tank.unlocked_skills.extend(["w_tank_1", "w_tank_2"])
+    stats = combat_estimator.player_combat_stats(tank)
+    assert stats['hp_regen'] == int(0.03 * tank.max_hp) > 0
+    with_regen = combat_estimator.estimate_outcome(stats, "goblin", seed=1)
+    without_regen = combat_estimator.estimate_outcome({**stats, 'hp_regen': 0}, "goblin", seed=1)
+    assert with_regen['hp_left_mean'] > without_regen['hp_left_mean']
+    tank.hp = tank.max_hp - 10
+    with contextlib.redirect_stdout(io.StringIO()):
+        combat = CombatPA(tank, create_enemy("goblin"), sink=NULL_SINK)
+        combat.end_player_turn()
+    assert tank.hp == tank.max_hp - 10 + stats['hp_regen']
+    print(f"HP restante com regeneração: {without_regen['hp_left_mean']:.1%} -> {with_regen['hp_left_mean']:.1%}")
+    print("✅ Estimativa consistente com o combate!\n")
+
+
+def test_web_log_from_events():
+    """Testa que o log da web sai dos eventos do motor, sem mensagens duplicadas"""
+    from day18_test import temporary_action_log
+    from day22_test import temporary_autosave
+    import app_web
+
+    print("=== Teste 7: Log de Combate na Web ===")
+    with temporary_autosave(), temporary_action_log():
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = client.post('/new_game', json={'name': 'Arthon', 'class': 'guerreiro', 'seed': 2024}).get_json()['game_id']
+            app_web.active_games[game_id]['player'].recruit_companion('warrior_companion')
+            client.post('/api/move', json={'direction': 'sul'})
+            client.post('/api/move', json={'direction': 'leste'})
+            assert client.post('/api/combat/start').get_json()['success']
+            data = client.post('/api/combat/action', json={'action': 'attack'}).get_json()
+            client.get('/exit')
+
+    collector = JsonEventCollector()
+    collector.events = data['events']
+    assert data['messages'] == collector.messages()
+    companion = [event['message'] for event in data['events'] if event['type'] == 'companion']
+    assert len(companion) == 1 and data['messages'].count(companion[0]) == 1
+    assert not any(message.strip(" =") == "" for message in data['messages'])
+    print(f"{len(data['messages'])} linhas no log")
+    print("✅ Um único canal de mensagens!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 16 - Motor de Combate\n")
+
+    test_null_sink_is_silent()
+    test_json_collector_events()
+    test_console_sink_default()
+    test_enemy_specials_as_events()
+    test_simulator_reproducible()
+    test_vectorized_estimator()
+    test_web_log_from_events()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 16 CONCLUÍDOS!")
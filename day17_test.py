@@ -0,0 +1,82 @@
+from player import Player
+from world import World
+from save_manager import SaveManager
+from enemy import create_enemy
+from combat_pa import CombatPA
+from combat_events import NULL_SINK
+from game_rng import GameRNG, daily_seed, derive_seed
+from datetime import date
+import json
+import tempfile
+
+
+def test_same_seed_same_world():
+    """Testa que a semente da partida reproduz os baús"""
+    print("=== Teste 1: Mesma Semente, Mesmo Mundo ===")
+    first = World(seed=1234)
+    second = World(seed=1234)
+    other = World(seed=4321)
+    assert first.chest_items == second.chest_items
+    assert first.chest_items != other.chest_items
+
+    # Fluxos independentes entre si e estáveis entre processos
+    assert derive_seed(1234, "loot") != derive_seed(1234, "combat")
+    assert derive_seed(1234, "loot") == derive_seed(1234, "loot")
+    assert daily_seed(date(2026, 1, 1)) == daily_seed(date(2026, 1, 1))
+    print("✅ Mundo reproduzível pela semente!\n")
+
+
+def test_combat_uses_game_streams():
+    """Testa que o combate usa o RNG da partida e não o global"""
+    print("=== Teste 2: Combate Determinístico ===")
+
+    def fight(seed):
+        world = World(seed=seed)
+        player = Player("Arthon", "guerreiro")
+        combat = CombatPA(player, create_enemy("orc_chief"), sink=NULL_SINK, rng=world.rng)
+        log = []
+        for _ in range(6):
+            combat.player_attack()
+            combat.attempt_flee()
+            combat.enemy_turn()
+            combat.start_player_turn()
+            log.append((player.hp, combat.enemy.hp, combat.combat_active))
+        return log
+
+    assert fight(99) == fight(99)
+    print("✅ Críticos e fugas reproduzíveis!\n")
+
+
+def test_rng_state_saved():
+    """Testa que a semente e a posição dos fluxos vão para o save"""
+    print("=== Teste 3: RNG no Save ===")
+    save_manager = SaveManager(tempfile.mkdtemp())
+    world = World(seed=777)
+    world.rng.combat.random()
+    filepath = save_manager.save_game(Player("Arthon", "mago"), world, "rng.json")
+
+    with open(filepath, "r") as f:
+        world_data = json.load(f)["world"]
+    assert world_data["rng"]["run_seed"] == 777
+
+    _, loaded_world = save_manager.load_game("rng.json")
+    assert loaded_world.rng.run_seed == 777
+    assert loaded_world.chest_items == world.chest_items
+    assert loaded_world.rng.combat.random() == world.rng.combat.random()
+    assert loaded_world.rng.loot.random() == world.rng.loot.random()
+
+    # Estado completo sobrevive ao formato JSON
+    restored = GameRNG.from_state(json.loads(json.dumps(world.rng.get_state())))
+    assert restored.ai.random() == world.rng.ai.random()
+    print("✅ Fluxos restaurados do save!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 17 - Sementes por Partida\n")
+
+    test_same_seed_same_world()
+    test_combat_uses_game_streams()
+    test_rng_state_saved()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 17 CONCLUÍDOS!")
@@ -0,0 +1,156 @@
+from action_log import ActionLog, read_log, replay_entries
+from day22_test import temporary_autosave
+import app_web
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+
+@contextlib.contextmanager
+def temporary_action_log(snapshot_interval=0, **limits):
+    """Log de ações do app_web num diretório temporário durante o teste"""
+    original = app_web.action_log
+    with tempfile.TemporaryDirectory() as tmp:
+        app_web.action_log = ActionLog(tmp, snapshot_interval=snapshot_interval, **limits)
+        try:
+            yield app_web.action_log
+        finally:
+            app_web.action_log = original
+
+
+def play_logged_game(client, actions):
+    """Cria um jogo com semente fixa e executa uma lista de (rota, corpo)"""
+    response = client.post('/new_game', json={'name': 'Arthon', 'class': 'guerreiro', 'seed': 2024})
+    game_id = response.get_json()['game_id']
+    for path, body in actions:
+        client.post(path, json=body)
+    return game_id
+
+
+def game_signature(game_data):
+    """Resumo comparável do estado de um jogo"""
+    player = game_data['player']
+    world = game_data['world']
+    combat = game_data.get('combat')
+    return (
+        player.hp, player.xp, player.position, [item.name for item in player.inventory],
+        sorted(world.visited_rooms), sorted(world.looted_rooms), sorted(world.defeated_enemies),
+        bool(game_data.get('in_combat')), combat.enemy.hp if combat else None,
+        world.rng.get_state(), game_data.get('action_seq'),
+    )
+
+
+ACTIONS = [
+    ('/api/move', {'direction': 'sul'}),
+    ('/api/collect_treasure', {}),
+    ('/api/move', {'direction': 'leste'}),
+    ('/api/combat/start', {}),
+    ('/api/combat/action', {'action': 'attack'}),
+    ('/api/combat/action', {'action': 'end_turn'}),
+    ('/api/combat/action', {'action': 'attack'}),
+]
+
+
+def test_actions_are_logged():
+    """Testa o formato compacto do log de ações"""
+    print("=== Teste 1: Log de Ações ===")
+    with temporary_autosave(), temporary_action_log(snapshot_interval=3) as action_log:
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = play_logged_game(client, ACTIONS)
+            client.get('/api/game_state')  # Leituras não entram no log
+
+        entries = read_log(action_log.log_path(game_id))
+        assert entries[0][:2] == [0, 'start']
+        assert entries[0][2]['seed'] == 2024
+        assert [entry[0] for entry in entries] == list(range(len(ACTIONS) + 1))
+        assert entries[1] == [1, '/api/move', {'direction': 'sul'}, 200]
+
+        # Snapshot periódico no seq 6 (intervalo 3)
+        snapshot = action_log.save_manager.load_snapshot(game_id)
+        assert snapshot['action_seq'] == 6
+        print(f"{len(entries)} entradas registradas")
+    print("✅ Ações registradas!\n")
+
+
+def test_rebuild_from_snapshot_tail():
+    """Testa a reconstrução de um jogo perdido (snapshot + cauda do log)"""
+    print("=== Teste 2: Reconstrução ===")
+    with temporary_autosave(), temporary_action_log(snapshot_interval=3) as action_log:
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = play_logged_game(client, ACTIONS)
+            expected = game_signature(app_web.active_games[game_id])
+
+            # Simula a queda do servidor: o jogo some do store
+            app_web.active_games.pop(game_id)
+            response = client.get('/api/game_state')
+        assert response.status_code == 200
+        assert game_signature(app_web.active_games[game_id]) == expected
+
+        # O jogo reconstruído continua registrando do ponto onde parou
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.post('/api/combat/action', json={'action': 'defend'})
+        entries = action_log.read(game_id)
+        assert entries[-1][0] == len(ACTIONS) + 1
+    print("✅ Jogo reconstruído pela cauda do log!\n")
+
+
+def test_full_replay_is_deterministic():
+    """Testa o replay completo do log sem servidor"""
+    print("=== Teste 3: Replay Determinístico ===")
+    with temporary_autosave(), temporary_action_log(snapshot_interval=0) as action_log:
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = play_logged_game(client, ACTIONS * 3)
+            expected = game_signature(app_web.active_games[game_id])
+            entries = action_log.read(game_id)
+            game_data, mismatches = replay_entries(app_web.app, app_web.active_games, entries)
+
+        assert mismatches == []
+        assert game_signature(game_data) == expected
+        # O replay não escreve no log nem deixa jogos no store
+        assert action_log.read(game_id) == entries
+        print(f"{len(entries)} ações reexecutadas")
+    print("✅ Replay idêntico!\n")
+
+
+def test_logs_are_bounded():
+    """Testa apagar o log ao sair, compactar logs grandes e varrer os abandonados"""
+    print("=== Teste 4: Limites do Log ===")
+    with temporary_autosave(), temporary_action_log(max_bytes=200, max_age=60) as action_log:
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = play_logged_game(client, ACTIONS)
+            expected = game_signature(app_web.active_games[game_id])
+            assert os.path.getsize(action_log.log_path(game_id)) <= 200
+            assert action_log.read(game_id)[0][1] == 'load'
+
+            # Compactado, o log ainda reconstrói o jogo
+            app_web.active_games.pop(game_id)
+            assert client.get('/api/game_state').status_code == 200
+            assert game_signature(app_web.active_games[game_id]) == expected
+
+            client.get('/exit')
+            assert not action_log.has_log(game_id)
+
+            abandoned = play_logged_game(client, ACTIONS[:2])
+            assert action_log.sweep_expired(now=time.time() + 30) == 0
+            assert action_log.sweep_expired(now=time.time() + 120) == 1
+            assert not action_log.has_log(abandoned)
+            assert os.listdir(action_log.log_dir) == []
+    print("✅ Log apagado, compactado e varrido!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 18 - Log de Ações\n")
+
+    test_actions_are_logged()
+    test_rebuild_from_snapshot_tail()
+    test_full_replay_is_deterministic()
+    test_logs_are_bounded()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 18 CONCLUÍDOS!")
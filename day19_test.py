@@ -0,0 +1,113 @@
+from player import Player
+from world import World
+from enemy import create_enemy, restore_enemy
+from combat_pa import CombatPA
+from combat_events import NULL_SINK
+from day18_test import temporary_action_log
+from day22_test import temporary_autosave
+import app_web
+import contextlib
+import io
+import json
+import pickle
+
+
+def test_enemy_state_roundtrip():
+    """Testa o estado compacto dos inimigos"""
+    print("=== Teste 1: Estado do Inimigo ===")
+    orc = create_enemy("orc_chief")
+    assert orc.get_state() == {'key': 'orc_chief'}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        orc.get_attack_damage()
+        orc.get_attack_damage()
+    orc.take_damage(40)
+    state = json.loads(json.dumps(orc.get_state()))
+    assert state == {'key': 'orc_chief', 'hp': 50, 'turn_counter': 2}
+
+    restored = restore_enemy(state)
+    assert restored.hp == 50 and restored.turn_counter == 2
+    # Terceiro ataque continua sendo o ATAQUE PODEROSO
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert restored.get_attack_damage() == restored.attack * 2
+    assert restore_enemy({'key': 'inimigo_removido'}) is None
+    print("✅ Inimigo restaurado do ponto onde parou!\n")
+
+
+def test_combat_state_resumes_identically():
+    """Testa que um combate retomado segue exatamente igual ao original"""
+    print("=== Teste 2: Combate Retomado ===")
+
+    def play_turns(combat, turns):
+        log = []
+        for _ in range(turns):
+            combat.player_attack()
+            if not combat.is_combat_over():
+                combat.enemy_turn()
+            if not combat.is_combat_over():
+                combat.start_player_turn()
+            log.append((combat.player.hp, combat.enemy.hp, combat.player_pa, len(combat.enemy_status)))
+        return log
+
+    world = World(seed=77)
+    player = Player("Lyra", "mago")
+    combat = CombatPA(player, create_enemy("blackwarrior"), sink=NULL_SINK, rng=world.rng)
+    with contextlib.redirect_stdout(io.StringIO()):
+        play_turns(combat, 2)
+        combat.enemy_status.append({'type': 'burning', 'damage': 4, 'duration': 2})
+
+        saved = json.dumps(combat.get_state())
+        saved_rng = world.rng.get_state()
+        saved_player = pickle.dumps(player)
+        expected = play_turns(combat, 3)
+
+        world.rng = world.rng.from_state(saved_rng)
+        resumed = CombatPA.from_state(pickle.loads(saved_player), json.loads(saved), sink=NULL_SINK, rng=world.rng)
+        assert play_turns(resumed, 3) == expected
+    print(f"Estado do combate: {len(saved)} bytes")
+    print("✅ Combate retomado de forma idêntica!\n")
+
+
+def test_save_and_load_mid_fight():
+    """Testa salvar e carregar no meio da sala de vários inimigos"""
+    print("=== Teste 3: Save no Meio da Luta ===")
+    client = app_web.app.test_client()
+    with temporary_autosave(), temporary_action_log(), contextlib.redirect_stdout(io.StringIO()):
+        game_id = client.post('/new_game', json={'name': 'Arthon', 'class': 'guerreiro', 'seed': 5}).get_json()['game_id']
+        game_data = app_web.active_games[game_id]
+        game_data['player'].position = '31'
+        assert client.post('/api/combat/start').get_json()['success']
+        client.post('/api/combat/action', json={'action': 'attack'})
+        client.post('/api/combat/action', json={'action': 'end_turn'})
+
+        combat = game_data['combat']
+        expected = (combat.enemy.name, combat.enemy.hp, combat.player_pa, game_data['player'].hp)
+        queue = [enemy.name for enemy in game_data['multi_enemy_queue']]
+
+        response = client.post('/api/save', json={'filename': 'day19_mid_fight'})
+        filename = response.get_json()['filename']
+        response = client.post(f'/api/load/{filename}')
+        assert response.get_json()['redirect_url'] == '/combat'
+        state = client.get('/api/combat/state').get_json()
+
+    assert state['enemy']['name'] == expected[0]
+    assert state['enemy']['hp'] == expected[1]
+    assert state['player_pa'] == expected[2]
+    assert state['player']['hp'] == expected[3]
+    with client.session_transaction() as client_session:
+        loaded = app_web.active_games[client_session['game_id']]
+    assert [enemy.name for enemy in loaded['multi_enemy_queue']] == queue
+    assert loaded['multi_enemy_progress'] == 1 and loaded['multi_enemy_total'] == 2
+    print(f"Retomado contra {expected[0]} ({expected[1]} HP), fila: {queue}")
+    print("✅ Combate salvo e retomado!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 19 - Combate Persistente\n")
+
+    test_enemy_state_roundtrip()
+    test_combat_state_resumes_identically()
+    test_save_and_load_mid_fight()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 19 CONCLUÍDOS!")
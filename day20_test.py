@@ -0,0 +1,111 @@
+from player import Player
+from world import World
+from save_manager import SaveManager
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+
+def create_saves(save_mgr, levels):
+    """Grava um save por nível informado (jogadores em ordem alfabética inversa)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, level in enumerate(levels):
+            player = Player(f"Heroi{len(levels) - index}")
+            player.level = level
+            save_mgr.save_game(player, World(seed=index), f"slot_{index}.json")
+
+
+def test_index_updated_on_save_and_delete():
+    """Testa que o índice acompanha saves gravados e apagados"""
+    print("=== Teste 1: Índice de Saves ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SaveManager(save_dir=tmp)
+        create_saves(save_mgr, [3, 7, 1])
+
+        # Gravar só acrescenta ao diário; o manifesto não é reescrito a cada save
+        with open(os.path.join(tmp, "index.journal"), encoding="utf-8") as f:
+            assert [json.loads(line)[0] for line in f] == ["slot_0.json", "slot_1.json", "slot_2.json"]
+        assert not os.path.exists(os.path.join(tmp, "index.manifest"))
+
+        # A listagem incorpora o diário ao manifesto
+        save_mgr.list_saves()
+        with open(os.path.join(tmp, "index.manifest"), encoding="utf-8") as f:
+            index = json.load(f)
+        assert sorted(index["saves"]) == ["slot_0.json", "slot_1.json", "slot_2.json"]
+        assert index["saves"]["slot_1.json"]["level"] == 7
+        assert not os.path.exists(os.path.join(tmp, "index.journal"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_mgr.delete_save("slot_0.json")
+        assert sorted(save_mgr._read_index()[0]) == ["slot_1.json", "slot_2.json"]
+        assert [save["filename"] for save in save_mgr.list_saves(sort_by="level")] == ["slot_1.json", "slot_2.json"]
+    print("✅ Índice atualizado!\n")
+
+
+def test_listing_reads_only_changed_files():
+    """Testa que a listagem só relê saves novos ou alterados por fora"""
+    print("=== Teste 2: Validação por mtime/tamanho ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SaveManager(save_dir=tmp)
+        create_saves(save_mgr, [2, 4])
+
+        parsed = []
+        original = save_mgr._summarize_save_file
+        save_mgr._summarize_save_file = lambda path, stat: parsed.append(path) or original(path, stat)
+
+        assert len(save_mgr.list_saves()) == 2
+        assert parsed == []
+
+        # Arquivo editado por fora, arquivo copiado para a pasta e arquivo corrompido
+        path = os.path.join(tmp, "slot_0.json")
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["player"]["level"] = 42
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        with open(os.path.join(tmp, "copia.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        with open(os.path.join(tmp, "quebrado.json"), "w", encoding="utf-8") as f:
+            f.write("{")
+
+        saves = save_mgr.list_saves(sort_by="level")
+        assert [save["level"] for save in saves] == [42, 42, 4]
+        assert len(parsed) == 3
+
+        parsed.clear()
+        save_mgr.list_saves()
+        assert parsed == []
+    print("✅ Só os arquivos alterados foram relidos!\n")
+
+
+def test_sort_and_pagination():
+    """Testa ordenação por jogador/nível e paginação"""
+    print("=== Teste 3: Ordenação e Páginas ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SaveManager(save_dir=tmp)
+        create_saves(save_mgr, [5, 1, 9, 3, 7])
+
+        by_player = [save["player"] for save in save_mgr.list_saves(sort_by="player")]
+        assert by_player == sorted(by_player)
+        assert [save["level"] for save in save_mgr.list_saves(sort_by="level", limit=2)] == [9, 7]
+        assert [save["level"] for save in save_mgr.list_saves(sort_by="level", descending=False, offset=1, limit=2)] == [3, 5]
+
+        page = save_mgr.list_saves_page(page=3, per_page=2, sort_by="level")
+        assert page["total"] == 5 and page["pages"] == 3
+        assert [save["level"] for save in page["saves"]] == [1]
+        # Página fora do intervalo cai na última
+        assert save_mgr.list_saves_page(page=99, per_page=2)["page"] == 3
+    print("✅ Listagem paginada!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 20 - Índice de Saves\n")
+
+    test_index_updated_on_save_and_delete()
+    test_listing_reads_only_changed_files()
+    test_sort_and_pagination()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 20 CONCLUÍDOS!")
@@ -0,0 +1,134 @@
+from player import Player
+from world import World
+from save_manager import SaveManager, decode_save, migrate_save
+from companions import COMPANION_TEMPLATES, build_companion, companion_delta, restore_companion
+from game_rng import GameRNG
+from items import iron_armor
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+
+def test_compact_rng_state():
+    """Testa o RNG salvo como semente + posição de cada fluxo"""
+    print("=== Teste 1: RNG Compacto ===")
+    rng = GameRNG(31337)
+    rng.loot.random()
+    for _ in range(3000):
+        rng.combat.randint(1, 100)
+
+    compact = rng.get_compact_state()
+    assert compact['offsets']['ai'] == 0
+    assert compact['offsets']['loot'] == 2  # random() consome 2 palavras
+    restored = GameRNG.from_compact_state(json.loads(json.dumps(compact)))
+    assert restored.get_state() == rng.get_state()
+    print(f"Estado completo: {len(json.dumps(rng.get_state()))} bytes, compacto: {len(json.dumps(compact))} bytes")
+    print("✅ RNG reduzido a semente + posição!\n")
+
+
+def test_companion_delta():
+    """Testa companheiros salvos como diferença do template"""
+    print("=== Teste 2: Companheiro como Delta ===")
+    companion = build_companion('warrior_companion', 5)
+    companion['weapon_name'] = 'Lança do Dragão'
+    companion['skill_cooldowns']['warrior_strike_1'] = 2
+
+    delta = companion_delta(companion)
+    assert 'skills' not in delta and 'description' not in delta
+    assert delta['weapon_name'] == 'Lança do Dragão'
+    assert restore_companion(delta, 5) == companion
+    print(f"Delta: {delta}")
+    print("✅ Só as diferenças vão para o save!\n")
+
+
+def build_v1_save(player, world):
+    """Save no formato 1.4 (JSON indentado, companheiros e RNG completos)"""
+    companions = [build_companion(companion['id'], player.level) for companion in player.companions]
+    # Template antigo: descrição de skill que já mudou no jogo
+    next(iter(companions[0]['skills'].values()))['description'] = 'Texto antigo'
+    return {
+        "version": "1.4",
+        "timestamp": "2026-03-26T14:36:01",
+        "player": {
+            "name": player.name, "player_class": player.player_class, "level": player.level,
+            "xp": player.xp, "max_hp": player.max_hp, "hp": player.hp, "mana": player.mana,
+            "max_mana": player.max_mana, "bonus_mana": 0, "strength": player.strength,
+            "vitality": player.vitality, "agility": player.agility, "skill_points": 1,
+            "attribute_points": 0, "unlocked_skills": [], "known_spells": [], "max_pa": 6,
+            "position": player.position, "inventory": [["health_potion", 2]],
+            "companions": companions, "equipped_weapon": "rusty_sword",
+            "equipped_shield": None, "equipped_armor": "Armadura de Ferro",
+        },
+        "world": {
+            "dungeon_id": world.dungeon_id, "visited_rooms": ["1"], "defeated_enemies": [],
+            "looted_rooms": [], "rng": world.rng.get_state(),
+        },
+    }
+
+
+def test_v1_migration():
+    """Testa a migração de um save 1.4 na leitura"""
+    print("=== Teste 3: Migração v1 -> v2 ===")
+    save_dir = tempfile.mkdtemp()
+    save_manager = SaveManager(save_dir)
+    player = Player("Arthon", "guerreiro")
+    player.recruit_companion('warrior_companion')
+    world = World(seed=99)
+    world.rng.combat.random()
+
+    with open(os.path.join(save_dir, "antigo.json"), "w") as f:
+        json.dump(build_v1_save(player, world), f, indent=2)
+
+    with open(os.path.join(save_dir, "antigo.json"), "rb") as f:
+        migrated = migrate_save(decode_save(f.read()))
+    assert migrated["version"] == 2
+    assert migrated["player"]["equipment"] == ["rusty_sword", None, "iron_armor"]
+    assert "offsets" in migrated["world"]["rng"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded_player, loaded_world = save_manager.load_game("antigo.json")
+    assert loaded_player.equipped_armor is iron_armor
+    assert loaded_world.rng.get_state() == world.rng.get_state()
+    # Skills do companheiro vêm sempre do template atual
+    skills = loaded_player.companions[0]['skills']
+    assert skills == COMPANION_TEMPLATES['warrior_companion']['skills']
+    print("✅ Save antigo migrado na leitura!\n")
+
+
+def test_binary_encoding():
+    """Testa o formato binário (msgpack ou JSON + zlib) e o tamanho dos saves"""
+    print("=== Teste 4: Save Binário ===")
+    save_dir = tempfile.mkdtemp()
+    player = Player("Lyra", "mago")
+    player.recruit_companion('mage_companion')
+    world = World(seed=5)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        text_path = SaveManager(save_dir).save_game(player, world, "texto.json")
+        binary_manager = SaveManager(save_dir, encoding="binary")
+        binary_path = binary_manager.save_game(player, world, "binario.json")
+        assert binary_path.endswith("binario.sav")
+        loaded_player, loaded_world = binary_manager.load_game("binario.sav")
+
+    assert loaded_player.companions == player.companions
+    assert loaded_world.rng.get_state() == world.rng.get_state()
+    assert sorted(save["filename"] for save in binary_manager.list_saves()) == ["binario.sav", "texto.json"]
+
+    v1_size = len(json.dumps(build_v1_save(player, world), indent=2, ensure_ascii=False))
+    print(f"v1: {v1_size} bytes, v2 texto: {os.path.getsize(text_path)}, v2 binário: {os.path.getsize(binary_path)}")
+    assert os.path.getsize(text_path) * 10 < v1_size
+    print("✅ Saves compactos!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 21 - Formato de Save v2\n")
+
+    test_compact_rng_state()
+    test_companion_delta()
+    test_v1_migration()
+    test_binary_encoding()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 21 CONCLUÍDOS!")
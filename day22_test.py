@@ -0,0 +1,144 @@
+from player import Player
+from world import World
+from save_manager import SaveManager, read_save_file
+from autosave import AutosaveService
+import app_web
+import contextlib
+import io
+import os
+import tempfile
+import threading
+
+
+class SlowSaveManager(SaveManager):
+    """SaveManager que segura a escrita até o teste liberar"""
+
+    def __init__(self, save_dir):
+        super().__init__(save_dir)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.writes = []
+
+    def write_save(self, filename, save_data, mark=None):
+        self.started.set()
+        self.release.wait(5)
+        self.writes.append((filename, save_data["player"]["position"]))
+        return super().write_save(filename, save_data, mark)
+
+
+@contextlib.contextmanager
+def temporary_autosave(save_dir=None, delay=0.05):
+    """Autosave (e saves) do app_web num diretório temporário durante o teste"""
+    original = app_web.autosave
+    with contextlib.ExitStack() as stack:
+        if save_dir is None:
+            save_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        app_web.autosave = AutosaveService(SaveManager(save_dir), delay=delay)
+        try:
+            yield app_web.autosave
+        finally:
+            app_web.autosave.stop()
+            app_web.autosave = original
+
+
+def test_atomic_write():
+    """Testa a gravação atômica (sem temporários nem arquivo pela metade)"""
+    print("=== Teste 1: Escrita Atômica ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SaveManager(tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_mgr.save_game(Player("Arthon"), World(seed=1), "slot.json")
+            # Falha no meio da escrita: o save anterior continua válido
+            broken = save_mgr.build_save_data(Player("Quebrado"), World(seed=2))
+            broken["world"]["rng"] = object()
+            assert save_mgr.write_save("slot.json", broken) is None
+
+        assert sorted(os.listdir(tmp)) == ["index.journal", "slot.json"]
+        assert read_save_file(os.path.join(tmp, "slot.json"))["player"]["name"] == "Arthon"
+    print("✅ Save anterior preservado!\n")
+
+
+def test_bursts_are_coalesced():
+    """Testa que pedidos seguidos do mesmo arquivo viram uma única escrita"""
+    print("=== Teste 2: Agrupamento de Saves ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SlowSaveManager(tmp)
+        service = AutosaveService(save_mgr, delay=0.01)
+        player = Player("Lyra", "mago")
+        world = World(seed=3)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Primeira escrita presa no disco; as próximas chegam enquanto isso
+            service.schedule(player, world, "auto.json", immediate=True)
+            assert save_mgr.started.wait(5)
+            for position in ["2", "3", "4", "5"]:
+                player.position = position
+                service.schedule(player, world, "auto.json")
+            service.schedule(player, world, "outro.json")
+            assert service.stats()["queue_depth"] >= 2
+
+            save_mgr.release.set()
+            assert service.flush(timeout=5)
+            service.stop()
+
+        stats = service.stats()
+        assert save_mgr.writes[0] == ("auto.json", Player("Lyra", "mago").position)
+        assert ("auto.json", "5") in save_mgr.writes and len(save_mgr.writes) <= 3
+        assert stats["queue_depth"] == 0 and stats["failed"] == 0
+        assert stats["written"] + stats["coalesced"] == 6
+        assert read_save_file(os.path.join(tmp, "auto.json"))["player"]["position"] == "5"
+        print(f"Estatísticas: {stats}")
+    print("✅ Rajada gravada com o estado mais recente!\n")
+
+
+def test_web_autosave_on_events():
+    """Testa o autosave da web nos eventos, o save manual síncrono e a limpeza ao sair"""
+    from day18_test import temporary_action_log
+
+    print("=== Teste 3: Autosave na Web ===")
+    with tempfile.TemporaryDirectory() as tmp, temporary_autosave(tmp) as service, temporary_action_log():
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = client.post('/new_game', json={'name': 'Arthon', 'class': 'guerreiro', 'seed': 2024}).get_json()['game_id']
+            client.post('/api/collect_treasure')  # Sem evento: nada a gravar
+            assert service.flush(timeout=5)
+            assert os.listdir(tmp) == []
+
+            client.post('/api/move', json={'direction': 'sul'})
+            assert service.flush(timeout=5)
+            position = app_web.active_games[game_id]['player'].position
+            autosave_path = os.path.join(tmp, f"autosave_{game_id}.json")
+            assert read_save_file(autosave_path)["player"]["position"] == position
+
+            # Save manual gravado no request: o arquivo já existe quando a resposta chega
+            response = client.post('/api/save', json={'filename': 'manual'}).get_json()
+            assert response['success'] and response['filename'] == 'manual.json'
+            assert read_save_file(os.path.join(tmp, "manual.json"))["player"]["position"] == position
+
+            # Falha de escrita vira erro na resposta, não um sucesso otimista
+            write_save = service.save_manager.write_save
+            service.save_manager.write_save = lambda filename, save_data, mark=None: None
+            response = client.post('/api/save', json={'filename': 'falhou'}).get_json()
+            service.save_manager.write_save = write_save
+            assert not response['success']
+
+            stats = client.get('/api/autosave/stats').get_json()
+            client.get('/exit')
+
+        # Sair apaga o autosave do jogo; o save manual fica
+        assert not os.path.exists(autosave_path)
+        assert os.path.exists(os.path.join(tmp, "manual.json"))
+        assert stats['enabled'] and stats['written'] == 2 and stats['failed'] == 1 and stats['queue_depth'] == 0
+        print(f"Latência média: {stats['avg_write_ms']} ms")
+    print("✅ Autosave disparado pelos eventos do jogo!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 22 - Autosave em Segundo Plano\n")
+
+    test_atomic_write()
+    test_bursts_are_coalesced()
+    test_web_autosave_on_events()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 22 CONCLUÍDOS!")
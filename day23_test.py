@@ -0,0 +1,190 @@
+from player import Player
+from world import World
+from items import iron_armor, health_potion
+from save_manager import SaveManager, apply_save_delta, changed_sections, state_versions
+from session_store import DiskSessionStore
+from autosave import AutosaveService
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+
+
+def test_sections_marked_dirty():
+    """Testa que cada alteração marca só a sua seção"""
+    print("=== Teste 1: Seções Alteradas ===")
+    player = Player("Arthon", "guerreiro")
+    world = World(seed=8)
+    base = state_versions(player, world)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.take_damage(5)
+        player.add_to_inventory(health_potion)
+        player.equip_armor(iron_armor)
+        player.recruit_companion('warrior_companion')
+        world.visit_room("2")
+        world.defeat_enemy("2")
+    assert changed_sections(base, state_versions(player, world)) == {
+        ("player", "stats"), ("player", "inventory"), ("player", "equipment"),
+        ("player", "companions"), ("world", "visited_rooms"), ("world", "defeated_enemies"),
+    }
+
+    # Sorteios do RNG e salas já visitadas
+    base = state_versions(player, world)
+    world.visit_room("2")
+    assert changed_sections(base, state_versions(player, world)) == set()
+    world.rng.combat.random()
+    assert changed_sections(base, state_versions(player, world)) == {("world", "rng")}
+
+    # Sincronizar companheiros ou passar turno sem cooldowns não altera nada
+    base = state_versions(player, world)
+    player.sync_companion_progression()
+    player.tick_companion_cooldowns()
+    assert changed_sections(base, state_versions(player, world)) == set()
+    print("✅ Alterações rastreadas por seção!\n")
+
+
+def test_unchanged_save_is_noop():
+    """Testa que salvar sem mudanças não reescreve o arquivo"""
+    print("=== Teste 2: Save Sem Mudanças ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        save_mgr = SaveManager(tmp)
+        player = Player("Lyra", "mago")
+        world = World(seed=4)
+        written = []
+        original = save_mgr.write_save
+        save_mgr.write_save = lambda *args: written.append(args[0]) or original(*args)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_mgr.save_game(player, world, "slot.json")
+            save_mgr.save_game(player, world, "slot.json")
+            assert written == ["slot.json"]
+
+            player.gain_xp(10)
+            save_mgr.save_game(player, world, "slot.json")
+            assert len(written) == 2
+
+            # Outro jogo salvou por cima: o arquivo não tem mais este estado
+            save_mgr.save_game(Player("Outro"), World(seed=1), "slot.json")
+            save_mgr.save_game(player, world, "slot.json")
+            assert len(written) == 4
+
+            # Carregar e salvar de novo sem jogar também é um no-op
+            loaded_player, loaded_world = save_mgr.load_game("slot.json")
+            save_mgr.save_game(loaded_player, loaded_world, "slot.json")
+            assert len(written) == 4
+    print("✅ Nada regravado sem mudanças!\n")
+
+
+def test_delta_has_only_changed_sections():
+    """Testa o delta com as seções alteradas desde o save anterior"""
+    print("=== Teste 3: Delta de Seções ===")
+    save_mgr = SaveManager(tempfile.mkdtemp())
+    player = Player("Arthon", "guerreiro")
+    world = World(seed=12)
+
+    base = save_mgr.build_save_delta(player, world, None)
+    assert save_mgr.build_save_delta(player, world, base["versions"]) is None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.add_to_inventory(health_potion, 3)
+    # Alteração no lugar fora dos métodos do World: marcada à mão
+    world.looted_rooms.add("3")
+    world.mark_dirty("looted_rooms")
+    delta = save_mgr.build_save_delta(player, world, base["versions"])
+    assert set(delta["player"]) == {"inventory"}
+    assert set(delta["world"]) == {"looted_rooms"}
+
+    rebuilt = apply_save_delta(base, delta)
+    expected = save_mgr.build_save_data(player, world)
+    assert rebuilt["player"] == expected["player"] and rebuilt["world"] == expected["world"]
+    assert "versions" not in rebuilt
+
+    # Saves seguidos no mesmo arquivo remontam só as seções do delta
+    with contextlib.redirect_stdout(io.StringIO()):
+        save_mgr.save_game(player, world, "slot.json")
+        slot_path = os.path.join(save_mgr.save_dir, "slot.json")
+        previous = save_mgr._baselines[slot_path][1]
+        player.take_damage(5)
+        save_data, _ = save_mgr.prepare_save(player, world, "slot.json")
+    assert save_data["player"]["hp"] == player.hp
+    assert save_data["player"]["inventory"] is previous["player"]["inventory"]
+    assert save_data["world"] == save_mgr.build_save_data(player, world)["world"]
+    # A base do delta fica no SaveManager: o pickle do player só leva as marcas
+    assert set(player.save_marks[slot_path]) == {"id", "token", "stat"}
+
+    # Player de outro processo/pickle com marca antiga: monta o save inteiro de novo
+    copy = pickle.loads(pickle.dumps(player))
+    copy.take_damage(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh, _ = SaveManager(save_mgr.save_dir).prepare_save(copy, world, "slot.json")
+    assert fresh["player"] == save_mgr.build_save_data(copy, world)["player"]
+    print(f"Delta: {sorted(delta['player'])} + {sorted(delta['world'])}")
+    print("✅ Só as seções alteradas no delta!\n")
+
+
+def test_stores_skip_unchanged_games():
+    """Testa o store em disco e o autosave descartando jogos sem mudanças"""
+    print("=== Teste 4: Store e Autosave ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DiskSessionStore(tmp)
+        store["jogo"] = {'player': Player("Arthon"), 'world': World(seed=1), 'save_filename': None}
+        store.flush()
+
+        store.get("jogo")  # Request que só lê o estado
+        store.flush()
+        assert store.stats()['skipped_writes'] == 1
+
+        store.get("jogo")['player'].heal(1)
+        store["jogo"]['player'].take_damage(7)
+        store.flush()
+        assert store.stats()['skipped_writes'] == 1
+        assert store.get("jogo")['player'].hp == Player("Arthon").hp - 7
+
+        service = AutosaveService(SaveManager(tmp), delay=0)
+        game_data = store.get("jogo")
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(3):
+                service.schedule(game_data['player'], game_data['world'], "auto.json")
+                service.flush(timeout=5)
+            service.stop()
+        stats = service.stats()
+        assert stats['written'] == 1 and stats['skipped'] == 2
+    print("✅ Jogos sem mudanças não são regravados!\n")
+
+
+def test_web_reads_keep_versions():
+    """Testa que consultar o estado pela web não marca nenhuma seção"""
+    from day18_test import temporary_action_log
+    from day22_test import temporary_autosave
+    import app_web
+
+    print("=== Teste 5: Leituras da Web ===")
+    with temporary_autosave(), temporary_action_log():
+        client = app_web.app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_id = client.post('/new_game', json={'name': 'Lyra', 'class': 'druida', 'seed': 3}).get_json()['game_id']
+            app_web.active_games[game_id]['player'].recruit_companion('mage_companion')
+            client.get('/api/game_state')  # Primeira visita da sala inicial
+            game_data = app_web.active_games[game_id]
+            base = state_versions(game_data['player'], game_data['world'])
+            for _ in range(3):
+                client.get('/api/game_state')
+            game_data = app_web.active_games[game_id]
+            assert state_versions(game_data['player'], game_data['world']) == base
+            client.get('/exit')
+    print("✅ Leituras não alteram o jogo!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 23 - Rastreamento de Alterações\n")
+
+    test_sections_marked_dirty()
+    test_unchanged_save_is_noop()
+    test_delta_has_only_changed_sections()
+    test_stores_skip_unchanged_games()
+    test_web_reads_keep_versions()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 23 CONCLUÍDOS!")
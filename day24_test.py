@@ -0,0 +1,111 @@
+from player import Player
+from world import World
+from save_manager import SAVE_MAGIC, SaveManager, encode_save, read_save_file
+import save_validator
+from save_validator import STATUS_DRIFT, STATUS_INVALID, STATUS_OK, STATUS_OUTDATED, validate_directory
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+
+
+def create_save_dir(tmp):
+    """Pasta com um save de cada situação"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        SaveManager(tmp).save_game(Player("Arthon"), World(seed=1), "atual.json")
+        SaveManager(tmp, encoding="binary").save_game(Player("Lyra", "mago"), World(seed=2), "binario.json")
+    shutil.copy(os.path.join("saves", "theo1.json"), os.path.join(tmp, "antigo.json"))
+
+    with open(os.path.join(tmp, "atual.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    data["player"]["inventory"].append(["espada_removida", 1])
+    data["player"]["apelido"] = "Tuco"
+    with open(os.path.join(tmp, "divergente.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    with open(os.path.join(tmp, "quebrado.json"), "w", encoding="utf-8") as f:
+        f.write("{")
+
+
+def test_directory_report():
+    """Testa o status de cada save da pasta"""
+    print("=== Teste 1: Relatório da Pasta ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        create_save_dir(tmp)
+        reports, summary = validate_directory(tmp)
+
+    status = {report["file"]: report["status"] for report in reports}
+    assert status == {
+        "atual.json": STATUS_OK,
+        "binario.sav": STATUS_OK,
+        "antigo.json": STATUS_OUTDATED,
+        "divergente.json": STATUS_DRIFT,
+        "quebrado.json": STATUS_INVALID,
+    }
+    drift = next(report for report in reports if report["file"] == "divergente.json")
+    assert "campo desconhecido: player.apelido" in drift["issues"]
+    assert summary["unknown_items"] == {"espada_removida": 1}
+    print(f"Resumo: {dict(summary['status'])}")
+    print("✅ Saves classificados!\n")
+
+
+def test_repair_rewrites_current_format():
+    """Testa o reparo no lugar (formato atual, mesma codificação)"""
+    print("=== Teste 2: Reparo ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        create_save_dir(tmp)
+        with open(os.path.join(tmp, "antigo.json"), encoding="utf-8") as f:
+            timestamp = json.load(f)["timestamp"]
+
+        reports, summary = validate_directory(tmp, repair=True)
+        assert summary["repaired"] == 2
+        assert sorted(report["file"] for report in reports if report["repaired"]) == ["antigo.json", "divergente.json"]
+
+        reports, summary = validate_directory(tmp)
+        assert summary["status"][STATUS_OK] == 4 and summary["status"][STATUS_INVALID] == 1
+        assert read_save_file(os.path.join(tmp, "antigo.json"))["timestamp"] == timestamp
+        # Índice acompanhou os arquivos reescritos
+        listed = {save["filename"] for save in SaveManager(tmp).list_saves()}
+        assert {"antigo.json", "divergente.json"} <= listed
+    print("✅ Saves reescritos no formato atual!\n")
+
+
+def test_parallel_matches_serial():
+    """Testa a validação em vários processos"""
+    print("=== Teste 3: Validação em Paralelo ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        create_save_dir(tmp)
+        for index in range(40):
+            shutil.copy(os.path.join(tmp, "antigo.json"), os.path.join(tmp, f"copia_{index}.json"))
+
+        # Save antigo em binário: o reparo mantém a codificação
+        binary_path = os.path.join(tmp, "antigo_binario.sav")
+        with open(binary_path, "wb") as f:
+            f.write(encode_save(read_save_file(os.path.join(tmp, "antigo.json")), "binary"))
+        serial, _ = validate_directory(tmp, workers=1)
+        original = save_validator.PARALLEL_MIN_FILES
+        save_validator.PARALLEL_MIN_FILES = 0
+        try:
+            parallel, summary = validate_directory(tmp, repair=True, workers=2)
+        finally:
+            save_validator.PARALLEL_MIN_FILES = original
+
+        assert summary["workers"] == 2 and summary["repaired"] == 43
+        assert [report["status"] for report in parallel] == [report["status"] for report in serial]
+        with open(binary_path, "rb") as f:
+            assert f.read().startswith(SAVE_MAGIC)
+        assert read_save_file(binary_path)["version"] == 2
+        print(f"{summary['total']} saves em {summary['seconds']}s")
+    print("✅ Mesmo resultado em paralelo!\n")
+
+
+if __name__ == "__main__":
+    print("🎮 TESTES DO DIA 24 - Validador de Saves\n")
+
+    test_directory_report()
+    test_repair_rewrites_current_format()
+    test_parallel_matches_serial()
+
+    print("="*50)
+    print("✅ TODOS OS TESTES DO DIA 24 CONCLUÍDOS!")
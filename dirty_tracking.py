@@ -0,0 +1,55 @@
+"""
+Rastreamento barato de alterações em Player e World.
+
+Cada objeto guarda um contador de versão por seção do save (stats,
+inventário, equipamento, companheiros, salas visitadas...). Reatribuir um
+atributo incrementa a versão da sua seção automaticamente (__setattr__);
+alterações no lugar (lista.append, set.add, dict[chave] = ...) precisam
+chamar mark_dirty(seção) - os métodos de Player/World já fazem isso.
+
+Quem grava (SaveManager, autosave, store de sessões) guarda as versões do
+último write e compara depois: versões iguais = nada mudou, e só as
+seções com versão diferente precisam ser regravadas. Os contadores são do
+objeto (sobrevivem a pickle), então nunca colidem entre processos.
+"""
+
+# Seção dos atributos que não estão no mapa da classe (nunca fica sem rastrear)
+OTHER_SECTION = "state"
+
+
+class DirtyTracking:
+    """Mixin com versões por seção, incrementadas a cada alteração"""
+
+    # atributo -> seção; atributos começados com "_" (caches) não contam
+    DIRTY_SECTIONS = {}
+
+    def __setattr__(self, name, value):
+        state = self.__dict__
+        if name[0] != "_":
+            # mark_dirty em linha: roda a cada atribuição (hp, mana, posição...)
+            versions = state.get("_section_versions")
+            if versions is None:
+                versions = state["_section_versions"] = {}
+            section = self.DIRTY_SECTIONS.get(name, OTHER_SECTION)
+            versions[section] = versions.get(section, 0) + 1
+        object.__setattr__(self, name, value)
+
+    def mark_dirty(self, *sections):
+        """Marca seções como alteradas (use após mudanças no lugar)"""
+        versions = self.__dict__.get("_section_versions")
+        if versions is None:
+            versions = self.__dict__["_section_versions"] = {}
+        for section in sections:
+            versions[section] = versions.get(section, 0) + 1
+
+    def section_versions(self):
+        """Cópia das versões atuais de cada seção"""
+        return dict(self.__dict__.get("_section_versions", {}))
+
+    @property
+    def save_marks(self):
+        """Marcas dos últimos saves deste objeto, por caminho do arquivo"""
+        marks = self.__dict__.get("_save_marks")
+        if marks is None:
+            marks = self.__dict__["_save_marks"] = {}
+        return marks
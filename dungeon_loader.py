@@ -0,0 +1,178 @@
+"""
+Carregador das definições de dungeon.
+
+Cada dungeon é um arquivo JSON em `dungeons/<id>.json` com as salas, suas
+conexões e a posição (linha, coluna) no minimapa. O arquivo é validado uma
+única vez por processo e compilado em uma estrutura somente leitura
+compartilhada por World, MiniMap e pela rota /api/map:
+- ids de sala internados (mesmo objeto str em todos os jogos)
+- índice inteiro das salas e arrays de adjacência (direção, índice destino)
+- coordenadas do minimapa
+- tabelas de rotas mais curtas entre todos os pares de salas
+"""
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+DUNGEONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dungeons")
+DEFAULT_DUNGEON_ID = "forgotten"
+
+
+class DungeonDefinitionError(ValueError):
+    """Arquivo de dungeon inválido ou inexistente"""
+
+
+def _freeze(value):
+    """Converte dicts/listas em estruturas somente leitura (compartilháveis entre jogos)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class CompiledDungeon:
+    """Forma compilada de uma dungeon (imutável e compartilhada)"""
+
+    def __init__(self, dungeon_id, name, start_room, rooms, positions):
+        self.dungeon_id = dungeon_id
+        self.name = name
+        self.start_room = start_room
+        self.rooms = rooms  # {room_id: template somente leitura}
+        self.positions = positions  # {room_id: (linha, coluna)}
+        self.room_ids = tuple(rooms)  # índice inteiro -> room_id
+        self.room_index = MappingProxyType({room_id: index for index, room_id in enumerate(self.room_ids)})
+        # adjacency[i] = ((direção, índice destino), ...)
+        self.adjacency = tuple(
+            tuple((direction, self.room_index[target]) for direction, target in rooms[room_id]["connections"].items())
+            for room_id in self.room_ids
+        )
+        self.treasure_room_ids = tuple(
+            room_id for room_id, room in rooms.items() if room.get("type") == "treasure"
+        )
+        # Tabelas de todos os pares (BFS, grafo sem pesos): distância em salas,
+        # primeiro passo de cada rota e salas alcançáveis em ordem de distância
+        self.distances, self.next_hops, self.by_distance = _all_pairs_bfs(self.adjacency)
+
+    def path(self, from_room, to_room):
+        """Rota mais curta como [(direção, room_id), ...] ou None se não houver caminho.
+
+        Cada passo vem da tabela pré-computada, sem busca por request.
+        """
+        source = self.room_index.get(from_room)
+        target = self.room_index.get(to_room)
+        if source is None or target is None or self.distances[source][target] < 0:
+            return None
+
+        steps = []
+        while source != target:
+            direction, source = self.next_hops[source][target]
+            steps.append((direction, self.room_ids[source]))
+        return steps
+
+    def __repr__(self):
+        return f"<CompiledDungeon {self.dungeon_id!r} ({len(self.room_ids)} salas)>"
+
+
+def _all_pairs_bfs(adjacency):
+    """BFS a partir de cada sala.
+
+    Retorna (distances, next_hops, by_distance), indexados por índice de sala:
+    distances[i][j] é -1 quando j é inalcançável; next_hops[i][j] é o par
+    (direção, índice vizinho) do primeiro passo de i até j.
+    """
+    room_count = len(adjacency)
+    distances = []
+    next_hops = []
+    by_distance = []
+
+    for source in range(room_count):
+        distance = [-1] * room_count
+        first_step = [None] * room_count
+        distance[source] = 0
+        order = [source]
+
+        # A fila é a própria lista de visitados (ordem de descoberta = ordem de distância)
+        for current in order:
+            for direction, neighbor in adjacency[current]:
+                if distance[neighbor] >= 0:
+                    continue
+                distance[neighbor] = distance[current] + 1
+                first_step[neighbor] = (direction, neighbor) if current == source else first_step[current]
+                order.append(neighbor)
+
+        distances.append(tuple(distance))
+        next_hops.append(tuple(first_step))
+        by_distance.append(tuple(order))
+
+    return tuple(distances), tuple(next_hops), tuple(by_distance)
+
+
+def _validate(dungeon_id, data):
+    """Confere a consistência do arquivo antes de compilar"""
+    rooms = data.get("rooms")
+    if not isinstance(rooms, dict) or not rooms:
+        raise DungeonDefinitionError(f"Dungeon '{dungeon_id}' não possui salas")
+
+    start_room = data.get("start_room")
+    if start_room not in rooms:
+        raise DungeonDefinitionError(f"Dungeon '{dungeon_id}': sala inicial '{start_room}' não existe")
+
+    for room_id, room in rooms.items():
+        for field in ("name", "type", "connections", "position"):
+            if field not in room:
+                raise DungeonDefinitionError(f"Dungeon '{dungeon_id}': sala '{room_id}' sem o campo '{field}'")
+
+        for direction, target in room["connections"].items():
+            if target not in rooms:
+                raise DungeonDefinitionError(
+                    f"Dungeon '{dungeon_id}': sala '{room_id}' conecta ao {direction} com sala inexistente '{target}'"
+                )
+
+        position = room["position"]
+        if len(position) != 2 or not all(isinstance(coord, int) for coord in position):
+            raise DungeonDefinitionError(f"Dungeon '{dungeon_id}': posição inválida na sala '{room_id}'")
+
+
+@lru_cache(maxsize=None)
+def load_dungeon(dungeon_id=DEFAULT_DUNGEON_ID):
+    """Carrega, valida e compila uma dungeon (uma única vez por processo)"""
+    path = os.path.join(DUNGEONS_DIR, f"{dungeon_id}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise DungeonDefinitionError(f"Dungeon '{dungeon_id}' não encontrada em {DUNGEONS_DIR}") from None
+    except json.JSONDecodeError as e:
+        raise DungeonDefinitionError(f"Dungeon '{dungeon_id}' com JSON inválido: {e}") from None
+
+    _validate(dungeon_id, data)
+
+    rooms = {}
+    positions = {}
+    for room_id, room in data["rooms"].items():
+        room_id = sys.intern(room_id)
+        room = dict(room)
+        positions[room_id] = tuple(room.pop("position"))
+        rooms[room_id] = _freeze(room)
+
+    return CompiledDungeon(
+        dungeon_id=sys.intern(data.get("id", dungeon_id)),
+        name=data.get("name", dungeon_id),
+        start_room=sys.intern(data["start_room"]),
+        rooms=MappingProxyType(rooms),
+        positions=MappingProxyType(positions),
+    )
+
+
+def list_dungeons():
+    """Ids das dungeons disponíveis em dungeons/"""
+    if not os.path.isdir(DUNGEONS_DIR):
+        return []
+    return sorted(
+        filename[:-len(".json")] for filename in os.listdir(DUNGEONS_DIR) if filename.endswith(".json")
+    )
@@ -1,5 +1,13 @@
-class Enemy:
+import copy
+
+
+def special_attack(name, message, heal=0):
+    """Descrição de um ataque especial (segundo valor de Enemy.next_attack)"""
+    return {'attack': name, 'message': message, 'heal': heal}
 
+
+class Enemy:
+    __slots__ = ("name", "max_hp", "hp", "attack", "defense", "xp_reward", "description", "can_flee")
     
     def __init__(self, name, hp, attack, defense, xp_reward, description):
         self.name = name
@@ -20,10 +28,31 @@ class Enemy:
         return self.hp > 0
     
     def get_attack_damage(self):
-        return self.attack
+        return self.next_attack()[0]
 
+    def next_attack(self):
+        """Próximo ataque: (dano, ataque especial ou None).
 
-class 43(Enemy):
+        O ataque especial é um dict com o nome ('attack'), o texto para o
+        jogador ('message') e a cura própria do inimigo ('heal'); quem
+        conduz o combate decide como mostrar (nada é impresso aqui).
+        """
+        return self.attack, None
+
+    def get_state(self):
+        """Estado serializável em JSON: o tipo + só o que mudou desde a criação"""
+        key = enemy_key_for(self)
+        prototype = _get_prototype(key)
+        state = {'key': key}
+        for field in _state_fields(type(self)):
+            value = getattr(self, field, None)
+            if value != getattr(prototype, field, None):
+                state[field] = value
+        return state
+
+
+class Goblin(Enemy):
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -38,6 +67,7 @@ class 43(Enemy):
 
 
 class OrcChief(Enemy):
+    __slots__ = ("turn_counter",)
     
     def __init__(self):
         super().__init__(
@@ -51,18 +81,18 @@ class OrcChief(Enemy):
         self.can_flee = False
         self.turn_counter = 0
     
-    def get_attack_damage(self):
+    def next_attack(self):
         self.turn_counter += 1
         
         if self.turn_counter % 3 == 0:
-            print(f"\n⚠️  {self.name} usa ATAQUE PODEROSO!")
-            return self.attack * 2
+            return self.attack * 2, special_attack("ATAQUE PODEROSO", f"\n⚠️  {self.name} usa ATAQUE PODEROSO!")
         
-        return self.attack
+        return self.attack, None
 
 
 class MestreButcher(Enemy):
     """Chefe de cozinha esqueleto que ataca invasores"""
+    __slots__ = ("turn_counter",)
     
     def __init__(self):
         super().__init__(
@@ -76,18 +106,18 @@ class MestreButcher(Enemy):
         self.can_flee = True
         self.turn_counter = 0
     
-    def get_attack_damage(self):
+    def next_attack(self):
         self.turn_counter += 1
         
         if self.turn_counter % 4 == 0:
-            print(f"\n🔪 {self.name} arremessa facas de açougueiro!")
-            return int(self.attack * 1.5)
+            return int(self.attack * 1.5), special_attack("FACAS DE AÇOUGUEIRO", f"\n🔪 {self.name} arremessa facas de açougueiro!")
         
-        return self.attack
+        return self.attack, None
 
 
 class Spaghettus(Enemy):
     """Macarrão vivo criado pelo Mestre Butcher"""
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -103,6 +133,7 @@ class Spaghettus(Enemy):
 
 class Blackwarrior(Enemy):
     """Guerreiro sombrio invocável no Altar"""
+    __slots__ = ("turn_counter",)
     
     def __init__(self):
         super().__init__(
@@ -116,17 +147,17 @@ class Blackwarrior(Enemy):
         self.can_flee = False
         self.turn_counter = 0
     
-    def get_attack_damage(self):
+    def next_attack(self):
         self.turn_counter += 1
         
         if self.turn_counter % 3 == 0:
-            print(f"\n⚫ 💥 {self.name} libera sua FÚria Sombria!")
-            return int(self.attack * 2.5)
+            return int(self.attack * 2.5), special_attack("FÚRIA SOMBRIA", f"\n⚫ 💥 {self.name} libera sua FÚria Sombria!")
         
-        return self.attack
+        return self.attack, None
 
 class Necromancer(Enemy):
     """Necromante que usa magias sombrias"""
+    __slots__ = ("turn_counter",)
     
     def __init__(self):
         super().__init__(
@@ -140,24 +171,25 @@ class Necromancer(Enemy):
         self.can_flee = False
         self.turn_counter = 0
     
-    def get_attack_damage(self):
+    def next_attack(self):
         self.turn_counter += 1
         
         if self.turn_counter % 3 == 0:
-            print(f"\n💀 {self.name} lança DRENAGEM DE ALMA!")
-            print(f"⚫ Você sente sua força vital sendo sugada!")
             # Dano 2x e cura o necromante em 20% do dano causado
             damage = int(self.attack * 2)
-            heal_amount = int(damage * 0.2)
-            self.hp = min(self.hp + heal_amount, self.max_hp)
-            if heal_amount > 0:
-                print(f"💚 {self.name} recuperou {heal_amount} HP!")
-            return damage
+            old_hp = self.hp
+            self.hp = min(self.hp + int(damage * 0.2), self.max_hp)
+            return damage, special_attack(
+                "DRENAGEM DE ALMA",
+                f"\n💀 {self.name} lança DRENAGEM DE ALMA!\n⚫ Você sente sua força vital sendo sugada!",
+                heal=self.hp - old_hp,
+            )
         
-        return self.attack
+        return self.attack, None
 
 class esqueleto(Enemy):
     """Esqueleto reanimado pelo Necromante"""
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -172,6 +204,7 @@ class esqueleto(Enemy):
 
 class PrisionGuard(Enemy):
     """O Guarda de prisão corrompido"""
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -186,6 +219,7 @@ class PrisionGuard(Enemy):
 
 class Shadowmage(Enemy):
     """mago das sombras que habita as câmara"""
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -200,6 +234,7 @@ class Shadowmage(Enemy):
 
 class Dragonwarrior(Enemy):
     """Guerreiro dragão que protege a câmara"""
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -210,4 +245,99 @@ class Dragonwarrior(Enemy):
             xp_reward=280,
             description="Um guerreiro dragão que protege a câmara com sua força imensa."
         )
-        self.can_flee = False
\ No newline at end of file
+        self.can_flee = False
+
+# Registro de inimigos: nome usado no mapa -> classe.
+# Criar um inimigo é uma única busca no dicionário em vez de uma cadeia de if/elif.
+ENEMY_REGISTRY = {
+    "goblin": Goblin,
+    "orc_chief": OrcChief,
+    "mestre_butcher": MestreButcher,
+    "spaghettus": Spaghettus,
+    "blackwarrior": Blackwarrior,
+    "esqueleto": esqueleto,
+    "necromancer": Necromancer,
+    "prision_guard": PrisionGuard,
+    "shadowmage": Shadowmage,
+    "dragonwarrior": Dragonwarrior,
+}
+
+# Nomes alternativos aceitos nos arquivos de dungeon
+ENEMY_ALIASES = {
+    "prisionguard": "prision_guard",
+}
+
+# Protótipos com os atributos iniciais de cada tipo (criados sob demanda)
+_PROTOTYPES = {}
+
+
+def register_enemy(key, enemy_class, aliases=()):
+    """Registra um novo tipo de inimigo (e seus nomes alternativos)"""
+    key = key.lower()
+    ENEMY_REGISTRY[key] = enemy_class
+    _PROTOTYPES.pop(key, None)
+    for alias in aliases:
+        ENEMY_ALIASES[alias.lower()] = key
+
+
+def resolve_enemy_key(enemy_name):
+    """Normaliza o nome do inimigo para a chave do registro (ou None)"""
+    if not isinstance(enemy_name, str):
+        return None
+    key = enemy_name.lower()
+    key = ENEMY_ALIASES.get(key, key)
+    return key if key in ENEMY_REGISTRY else None
+
+
+def create_enemy(enemy_name):
+    """Cria um inimigo novo a partir do nome do mapa (None se desconhecido).
+
+    O inimigo é uma cópia rasa do protótipo do tipo: os atributos são todos
+    valores simples, então cada combate recebe seu próprio estado.
+    """
+    key = resolve_enemy_key(enemy_name)
+    if key is None:
+        return None
+
+    return copy.copy(_get_prototype(key))
+
+
+def _get_prototype(key):
+    prototype = _PROTOTYPES.get(key)
+    if prototype is None:
+        prototype = _PROTOTYPES[key] = ENEMY_REGISTRY[key]()
+    return prototype
+
+
+def _state_fields(enemy_class):
+    """Atributos (slots) de um tipo de inimigo, incluindo os herdados"""
+    fields = []
+    for cls in reversed(enemy_class.__mro__):
+        fields.extend(getattr(cls, "__slots__", ()))
+    return fields
+
+
+def enemy_key_for(enemy):
+    """Chave do registro de um inimigo já criado"""
+    for key, enemy_class in ENEMY_REGISTRY.items():
+        if type(enemy) is enemy_class:
+            return key
+    raise ValueError(f"Inimigo fora do registro: {type(enemy).__name__}")
+
+
+def restore_enemy(state):
+    """Recria um inimigo a partir de Enemy.get_state() (None se o tipo não existir mais)"""
+    enemy = create_enemy(state.get('key'))
+    if enemy is None:
+        return None
+    # Campos que o tipo não tem mais (saves antigos) são ignorados
+    for field in _state_fields(type(enemy)):
+        if field in state:
+            setattr(enemy, field, state[field])
+    return enemy
+
+
+def spawn_enemies(enemy_names):
+    """Cria de uma vez a fila de inimigos de uma sala com vários inimigos"""
+    enemies = [create_enemy(enemy_name) for enemy_name in enemy_names]
+    return [enemy for enemy in enemies if enemy is not None]
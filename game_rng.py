@@ -0,0 +1,141 @@
+"""
+Fluxos de números aleatórios por partida.
+
+Cada jogo tem uma semente de partida (run seed) e dela deriva fluxos
+independentes (random.Random próprios):
+    loot   - conteúdo dos baús (World.randomize_treasure_loot)
+    combat - críticos e fugas do CombatPA
+    ai     - dano dos companheiros
+
+Sessões simultâneas não compartilham mais o RNG global, e a mesma semente
+reproduz a mesma partida (replays, desafios diários, benchmarks). A semente
+e o estado dos fluxos vão para o save.
+"""
+import hashlib
+import random
+from datetime import date
+
+RNG_STREAMS = ("loot", "combat", "ai")
+
+# Palavras de 32 bits por bloco do Mersenne Twister
+MT_BLOCK_WORDS = 624
+
+# Limite da busca pela posição de um fluxo (blocos de 624 palavras)
+MAX_OFFSET_BLOCKS = 4096
+
+
+def new_run_seed():
+    """Semente nova para uma partida (63 bits, cabe em JSON/SQLite)"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def daily_seed(day=None):
+    """Semente do desafio diário: a mesma para todos os jogadores no dia"""
+    day = day or date.today()
+    return derive_seed(0, f"daily:{day.isoformat()}")
+
+
+def derive_seed(run_seed, stream):
+    """Semente de um fluxo, estável entre processos e versões do Python"""
+    digest = hashlib.sha256(f"{run_seed}:{stream}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") >> 1
+
+
+def stream_offset(stream, seed):
+    """Quantas palavras de 32 bits o fluxo consumiu desde a semente (None se não achar).
+
+    O estado do Mersenne Twister são 625 números; a posição (offset) é um só.
+    Depois de k palavras o índice interno vale ((k - 1) % 624) + 1, então só
+    é preciso testar um candidato por bloco, avançando um gerador novo com
+    getrandbits (que consome exatamente uma palavra a cada 32 bits).
+    """
+    target = stream.getstate()
+    if target[2] is not None:  # gauss() guardou um valor: não dá para reduzir
+        return None
+
+    probe = random.Random(seed)
+    if probe.getstate() == target:
+        return 0
+
+    offset = target[1][-1]
+    probe.getrandbits(32 * offset)
+    for _ in range(MAX_OFFSET_BLOCKS):
+        if probe.getstate() == target:
+            return offset
+        probe.getrandbits(32 * MT_BLOCK_WORDS)
+        offset += MT_BLOCK_WORDS
+    return None
+
+
+def advance_stream(stream, offset):
+    """Avança um fluxo recém-semeado `offset` palavras de 32 bits"""
+    chunk = MT_BLOCK_WORDS * 1024
+    while offset > 0:
+        words = min(offset, chunk)
+        stream.getrandbits(32 * words)
+        offset -= words
+
+
+class GameRNG:
+    """Fluxos aleatórios independentes de uma partida"""
+
+    def __init__(self, run_seed=None):
+        self.run_seed = new_run_seed() if run_seed is None else int(run_seed)
+        for stream in RNG_STREAMS:
+            setattr(self, stream, random.Random(derive_seed(self.run_seed, stream)))
+
+    def get_state(self):
+        """Estado serializável em JSON (semente + posição de cada fluxo)"""
+        streams = {}
+        for stream in RNG_STREAMS:
+            version, internal_state, gauss_next = getattr(self, stream).getstate()
+            streams[stream] = [version, list(internal_state), gauss_next]
+        return {'run_seed': self.run_seed, 'streams': streams}
+
+    @classmethod
+    def from_state(cls, state):
+        """Recria os fluxos exatamente onde o save parou"""
+        rng = cls(state['run_seed'])
+        for stream, (version, internal_state, gauss_next) in state.get('streams', {}).items():
+            if stream in RNG_STREAMS:
+                getattr(rng, stream).setstate((version, tuple(internal_state), gauss_next))
+        return rng
+
+    def fingerprint(self):
+        """Hash do estado dos fluxos: muda a cada número sorteado (rastreamento de saves)"""
+        return hash(tuple(getattr(self, stream).getstate() for stream in RNG_STREAMS))
+
+    def get_compact_state(self):
+        """Semente + posição de cada fluxo (poucos bytes), ou None se algum
+        fluxo não puder ser reduzido a uma posição"""
+        offsets = {}
+        for stream in RNG_STREAMS:
+            offset = stream_offset(getattr(self, stream), derive_seed(self.run_seed, stream))
+            if offset is None:
+                return None
+            offsets[stream] = offset
+        return {'run_seed': self.run_seed, 'offsets': offsets}
+
+    @classmethod
+    def from_compact_state(cls, state):
+        """Recria os fluxos a partir de get_compact_state()"""
+        rng = cls(state['run_seed'])
+        for stream, offset in state.get('offsets', {}).items():
+            if stream in RNG_STREAMS:
+                advance_stream(getattr(rng, stream), offset)
+        return rng
+
+
+class SharedRNG:
+    """Todos os fluxos no módulo random global.
+
+    Padrão de quem não tem partida (combates avulsos, simulações que
+    controlam o RNG com random.seed).
+    """
+    run_seed = None
+    loot = random
+    combat = random
+    ai = random
+
+
+SHARED_RNG = SharedRNG()
@@ -0,0 +1,107 @@
+"""
+Registro único dos itens do jogo.
+
+Montado uma única vez por processo (sob demanda) a partir das instâncias
+definidas em items.py. As chaves são os nomes das variáveis do módulo
+(ex.: "health_potion"), que é o id estável (`item.item_id`) usado nos
+baús, nas recompensas e nos saves. As instâncias são compartilhadas
+(flyweight): inventários e equipamentos apontam para elas sem cópias.
+As listas de itens permitidos por classe para baús e chefes também são
+pré-calculadas aqui, em vez de serem remontadas a cada recompensa.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+# Itens que qualquer classe pode encontrar nos baús
+NEUTRAL_ITEM_IDS = frozenset({
+    "health_potion",
+    "simple_shield", "iron_shield", "rusty_sword", "exit_key",
+})
+
+# Armas dos companheiros (aparecem para qualquer classe)
+COMPANION_ITEM_IDS = frozenset({
+    "warden_blade", "ember_focus", "grove_totem",
+})
+
+# Itens exclusivos de cada classe
+CLASS_ITEM_IDS = {
+    "guerreiro": frozenset({
+        "battle_axe", "flaming_sword", "war_hammer", "dragon_lance",
+        "leather_armor", "iron_armor", "Blackwarrior_sword",
+        "Blackwarrior_armor", "butcher_spatula", "summoning_rune",
+    }),
+    "mago": frozenset({
+        "crystal_orb", "ice_wand", "ancient_staff", "shadow_grimoire",
+        "fire_staff", "lightning_rod", "necromancer_robe", "necromancer_rune",
+        "necromancer_curser",
+    }),
+    "druida": frozenset({
+        "druid_staff", "thorn_sickle", "moonbranch_crook", "root_spear",
+        "druid_armor", "bark_mail", "moonweave_cloak",
+    }),
+}
+
+# Garantia de baú nunca vazio: primeiro item disponível da classe
+CHEST_FALLBACK_IDS = {
+    "guerreiro": ("battle_axe", "iron_armor"),
+    "mago": ("crystal_orb", "ancient_staff"),
+    "druida": ("thorn_sickle", "moonbranch_crook", "bark_mail", "moonweave_cloak"),
+}
+
+
+class ItemRegistry:
+    """Itens base indexados por id e por nome de exibição (somente leitura)"""
+
+    def __init__(self, items_by_id):
+        self.by_id = MappingProxyType(items_by_id)
+        # Nome de exibição -> item, usado pelos saves que guardam item.name
+        self.by_name = MappingProxyType({item.name: item for item in items_by_id.values()})
+
+        chest_base = NEUTRAL_ITEM_IDS | COMPANION_ITEM_IDS
+        self._chest_allowed = {
+            player_class: chest_base | class_ids for player_class, class_ids in CLASS_ITEM_IDS.items()
+        }
+        self._chest_default = chest_base
+
+    def get(self, item_id):
+        """Item base pelo id (ou None)"""
+        return self.by_id.get(item_id)
+
+    def resolve(self, key):
+        """Item base pelo id ou, para saves antigos, pelo nome de exibição"""
+        return self.by_id.get(key) or self.by_name.get(key)
+
+    def get_by_name(self, name):
+        """Item base pelo nome de exibição (ou None)"""
+        return self.by_name.get(name)
+
+    def allowed_ids(self, source, player_class=None):
+        """Ids permitidos para uma recompensa, ou None quando não há filtro.
+
+        source "chest": neutros + companheiros + itens da classe
+        source "boss": apenas itens da classe (sem filtro para classe desconhecida)
+        """
+        normalized_class = (player_class or "").lower()
+        if source == "chest":
+            return self._chest_allowed.get(normalized_class, self._chest_default)
+        if source == "boss":
+            return CLASS_ITEM_IDS.get(normalized_class)
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_item_registry():
+    """Registro de itens do processo (montado na primeira chamada)"""
+    import items as items_module
+
+    items_by_id = {
+        item_id: value
+        for item_id, value in vars(items_module).items()
+        if isinstance(value, items_module.Item)
+    }
+    return ItemRegistry(items_by_id)
+
+
+def lookup_item(item_id):
+    """Instância compartilhada de um item pelo id (usada também pelo pickle)"""
+    return get_item_registry().get(item_id)
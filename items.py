@@ -1,13 +1,26 @@
 class Item:
+    __slots__ = ("name", "item_type", "description", "item_id")
     
     def __init__(self, name, item_type, description):
         self.name = name
         self.item_type = item_type  # "weapon", "shield", "consumable"
         self.description = description
+        # Id estável (nome da variável em items.py), independente do nome exibido
+        self.item_id = None
+
+    def __reduce_ex__(self, protocol):
+        """Itens do registro são compartilhados (flyweight): pickle e deepcopy
+        guardam só o id e devolvem a mesma instância base."""
+        if self.item_id is not None:
+            from item_registry import lookup_item
+            if lookup_item(self.item_id) is self:
+                return (lookup_item, (self.item_id,))
+        return super().__reduce_ex__(protocol)
 
 
 class Weapon(Item):
     """Armas que aumentam ataque"""
+    __slots__ = ("attack_bonus", "elemental_bonus", "elemental_type", "is_magical", "intended_user", "companion_class")
     
     def __init__(self, name, attack_bonus, description, elemental_bonus=0, elemental_type=None, is_magical=False, intended_user="player", companion_class=None):
         super().__init__(name, "weapon", description)
@@ -21,6 +34,7 @@ class Weapon(Item):
 
 class DruidWeapon(Weapon):
     """Armas druídicas com afinidade natural para futuras interações da classe."""
+    __slots__ = ("nature_bonus", "weapon_school")
 
     def __init__(self, name, attack_bonus, description, nature_bonus=0, elemental_bonus=0, elemental_type="all", is_magical=False, intended_user="player", companion_class=None):
         super().__init__(
@@ -39,6 +53,7 @@ class DruidWeapon(Weapon):
 
 class Shield(Item):
     """Escudos que aumentam defesa"""
+    __slots__ = ("defense_bonus",)
     
     def __init__(self, name, defense_bonus, description):
         super().__init__(name, "shield", description)
@@ -47,6 +62,7 @@ class Shield(Item):
 
 class Armor(Item):
     """Armaduras que aumentam defesa e opcionalmente mana"""
+    __slots__ = ("defense_bonus", "mana_bonus")
     
     def __init__(self, name, defense_bonus, description, mana_bonus=0):
         super().__init__(name, "armor", description)
@@ -56,28 +72,30 @@ class Armor(Item):
 
 class Potion(Item):
     """Poções consumíveis que curam HP"""
+    __slots__ = ("heal_amount",)
     
     def __init__(self, name, heal_amount, description):
         super().__init__(name, "consumable", description)
         self.heal_amount = heal_amount
     
-    def use(self, player):
-        """Usa a poção no jogador"""
+    def use(self, player, report=print):
+        """Usa a poção no jogador (mensagens vão para `report`)"""
         if player.hp >= player.max_hp:
-            print(f"\n❌ Seu HP já está cheio!")
+            report(f"\n❌ Seu HP já está cheio!")
             return False
         
         old_hp = player.hp
         player.heal(self.heal_amount)
         healed = player.hp - old_hp
         
-        print(f"\n✅ Você usou {self.name}!")
-        print(f"💚 Curou {healed} HP (HP: {player.hp}/{player.max_hp})")
+        report(f"\n✅ Você usou {self.name}!")
+        report(f"💚 Curou {healed} HP (HP: {player.hp}/{player.max_hp})")
         return True
 
 
 class Key(Item):
     """Chave especial necessária para sair da dungeon"""
+    __slots__ = ()
     
     def __init__(self, name, description):
         super().__init__(name, "key", description)
@@ -85,6 +103,7 @@ class Key(Item):
 
 class Rune(Item):
     """Runa mágica que pode invocar entidades no altar"""
+    __slots__ = ("summon_entity",)
     
     def __init__(self, name, description, summon_entity):
         super().__init__(name, "rune", description)
@@ -93,6 +112,7 @@ class Rune(Item):
 
 class Spell(Item):
     """Magias que podem ser aprendidas e usadas em combate"""
+    __slots__ = ("mana_cost", "power", "spell_type")
     
     def __init__(self, name, description, mana_cost, power, spell_type):
         super().__init__(name, "spell", description)
@@ -115,13 +135,13 @@ class Spell(Item):
 
         return None
     
-    def cast(self, caster, target=None):
-        """Lança a magia"""
+    def cast(self, caster, target=None, report=print):
+        """Lança a magia (mensagens vão para `report`)"""
         if not caster.use_mana(self.mana_cost):
-            print(f"\n❌ Mana insuficiente! Necessário: {self.mana_cost}, Disponível: {caster.mana}")
+            report(f"\n❌ Mana insuficiente! Necessário: {self.mana_cost}, Disponível: {caster.mana}")
             return False
         
-        print(f"\n✨ {caster.name} lançou {self.name}!")
+        report(f"\n✨ {caster.name} lançou {self.name}!")
         
         if self.spell_type == "damage":
             if target:
@@ -137,7 +157,7 @@ class Spell(Item):
                         spell_element = self._get_spell_element()
                         if weapon.elemental_type == "all" or weapon.elemental_type == spell_element:
                             weapon_bonus = 1.0 + (weapon.elemental_bonus / 100.0)
-                            print(f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
+                            report(f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
 
                 base_damage = int(base_damage * weapon_bonus)
                 
@@ -145,8 +165,8 @@ class Spell(Item):
                 magic_defense = target.defense // 2
                 damage = max(1, base_damage - magic_defense)
                 target.take_damage(damage)
-                print(f"💥 {target.name} recebeu {damage} de dano mágico!")
-                print(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
+                report(f"💥 {target.name} recebeu {damage} de dano mágico!")
+                report(f"🩸 {target.name} HP: {target.hp}/{target.max_hp}")
                 return True
         
         elif self.spell_type == "heal":
@@ -159,16 +179,53 @@ class Spell(Item):
                 spell_element = self._get_spell_element()
                 if weapon.elemental_bonus > 0 and (weapon.elemental_type == "all" or weapon.elemental_type == spell_element):
                     heal_amount = int(heal_amount * (1.0 + (weapon.elemental_bonus / 100.0)))
-                    print(f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
+                    report(f"⚡ Bônus da {weapon.name}: +{weapon.elemental_bonus}%!")
             
             old_hp = caster.hp
             caster.heal(heal_amount)
             healed = caster.hp - old_hp
-            print(f"💚 Você curou {healed} HP! (HP: {caster.hp}/{caster.max_hp})")
+            report(f"💚 Você curou {healed} HP! (HP: {caster.hp}/{caster.max_hp})")
             return True
 
         return False
         
+class InventoryStack:
+    """Entrada do inventário: item base compartilhado + quantidade.
+
+    Consumíveis iguais ocupam uma única entrada (count > 1); equipamentos
+    ficam sempre com count 1. Atributos do item (name, item_type, use...)
+    são lidos direto da entrada.
+    """
+    __slots__ = ("item", "count")
+
+    def __init__(self, item, count=1):
+        self.item = item
+        self.count = count
+
+    @property
+    def item_id(self):
+        return self.item.item_id
+
+    def __getattr__(self, name):
+        # Só é chamado para o que não é slot; evita recursão durante o unpickle
+        if name.startswith("__") or name in InventoryStack.__slots__:
+            raise AttributeError(name)
+        return getattr(self.item, name)
+
+    def __repr__(self):
+        return f"InventoryStack({self.item.name!r}, {self.count})"
+
+
+def unwrap_item(entry):
+    """Item base de uma entrada do inventário (ou o próprio item)"""
+    if isinstance(entry, InventoryStack):
+        return entry.item
+    return entry
+
+
+STACKABLE_TYPES = frozenset({"consumable"})
+
+
 # Instâncias dos itens do jogo
 rusty_sword = Weapon(
     name="Espada Enferrujada",
@@ -487,4 +544,12 @@ arcane_staff = Weapon(
     is_magical=True
 )
 
-lightning_rod = arcane_staff
\ No newline at end of file
+lightning_rod = arcane_staff
+
+
+# Atribui os ids estáveis: o primeiro nome de variável de cada instância
+# (apelidos como lightning_rod continuam resolvendo para o mesmo item)
+for _item_id, _item in list(globals().items()):
+    if isinstance(_item, Item) and _item.item_id is None:
+        _item.item_id = _item_id
+del _item_id, _item
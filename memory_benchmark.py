@@ -0,0 +1,126 @@
+"""
+Benchmark de memória por sessão de jogo.
+
+Simula N jogadores simultâneos (como o store de jogos ativos do app_web
+mantém em memória) e mede com tracemalloc quanto cada sessão ocupa:
+Player (com árvore de habilidades e inventário), World e o inimigo do
+combate atual.
+
+Com --compare mede também o layout antigo (antes / depois): cada objeto
+com __slots__ da sessão é copiado para uma classe comum, com os mesmos
+atributos guardados em __dict__.
+
+Uso:
+    python memory_benchmark.py --players 500 [--compare]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from enemy import create_enemy
+from items import health_potion
+from player import Player
+from world import World
+
+PLAYER_CLASSES = ("guerreiro", "mago", "druida")
+LAYOUTS = ("__slots__", "__dict__")
+
+# Classe com __dict__ equivalente a cada modelo com __slots__
+_dict_classes = {}
+
+
+def with_dict_layout(obj):
+    """Cópia de um objeto com __slots__ no layout antigo (atributos em __dict__)"""
+    cls = type(obj)
+    dict_class = _dict_classes.get(cls)
+    if dict_class is None:
+        dict_class = _dict_classes[cls] = type(cls.__name__, (), {})
+    copy = dict_class()
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if hasattr(obj, name):
+                setattr(copy, name, getattr(obj, name))
+    return copy
+
+
+def build_session(index, layout="__slots__"):
+    """Monta os dados de um jogo ativo como o app_web faz"""
+    player = Player(f"Jogador {index}", PLAYER_CLASSES[index % len(PLAYER_CLASSES)])
+    enemy = create_enemy("goblin")
+    if layout == "__dict__":
+        # Objetos próprios da sessão (itens e skills base são compartilhados)
+        enemy = with_dict_layout(enemy)
+        player.inventory = [with_dict_layout(entry) for entry in player.inventory]
+    return {
+        'player': player,
+        'world': World(),
+        'enemy': enemy,
+        'save_filename': None,
+    }
+
+
+def measure_sessions(player_count, layout="__slots__"):
+    """Bytes alocados para manter `player_count` sessões vivas"""
+    # Aquece caches compartilhados (dungeon, registros) fora da medição
+    build_session(0, layout)
+    gc.collect()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = [build_session(index, layout) for index in range(player_count)]
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'players': len(sessions),
+        'total_bytes': after - before,
+        'peak_bytes': peak - before,
+        'per_session_bytes': (after - before) // max(1, len(sessions)),
+    }
+
+
+def object_sizes(layout="__slots__"):
+    """Tamanho raso de uma instância de cada modelo (sem e com __dict__)"""
+    session = build_session(0)
+    skill = next(iter(session['player'].skill_tree.skills.values()))
+    sizes = {}
+    for label, obj in (("Item", health_potion), ("Enemy", session['enemy']), ("Skill", skill)):
+        if layout == "__dict__":
+            obj = with_dict_layout(obj)
+        instance_dict = getattr(obj, '__dict__', None)
+        sizes[label] = {
+            'slots': not hasattr(obj, '__dict__'),
+            'bytes': sys.getsizeof(obj) + (sys.getsizeof(instance_dict) if instance_dict is not None else 0),
+        }
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a memória por sessão de jogo")
+    parser.add_argument("--players", type=int, default=500, help="Quantidade de jogadores simultâneos")
+    parser.add_argument("--compare", action="store_true", help="Mede também o layout antigo (__dict__)")
+    args = parser.parse_args()
+
+    print(f"🧪 Benchmark de memória com {args.players} jogadores simultâneos\n")
+
+    results = {}
+    for layout in (LAYOUTS if args.compare else LAYOUTS[:1]):
+        for label, info in object_sizes(layout).items():
+            instance_layout = "__slots__" if info['slots'] else "__dict__"
+            print(f"{label:6s} {instance_layout:10s} {info['bytes']:6d} bytes por instância")
+
+        result = results[layout] = measure_sessions(args.players, layout)
+        print(f"Memória total: {result['total_bytes'] / 1024:.1f} KiB (pico {result['peak_bytes'] / 1024:.1f} KiB)")
+        print(f"Por sessão:    {result['per_session_bytes'] / 1024:.1f} KiB\n")
+
+    if args.compare:
+        after, before = (results[layout]['per_session_bytes'] for layout in LAYOUTS)
+        saved = before - after
+        print(f"📉 Antes: {before / 1024:.2f} KiB, depois: {after / 1024:.2f} KiB por sessão "
+              f"({saved} bytes a menos, {saved / max(1, before):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,49 +3,8 @@ class MiniMap:
     
     def __init__(self, world):
         self.world = world
-        # Define posições das salas no grid do mapa (linha, coluna)
-        self.room_positions = {
-            # Área inicial (canto superior esquerdo)
-            "1": (0, 4),
-            "2": (2, 4),
-            "3": (2, 8),
-            "4": (4, 4),
-            "5": (4, 8),
-            "6": (4, 12),
-            "7": (2, 0),
-            
-            # Área da cozinha (lado esquerdo)
-            "8": (0, 0),
-            "9": (4, 0),
-            "10": (6, 0),
-            "11": (6, 4),
-            
-            # Área central
-            "12": (8, 4),
-            "13": (8, 8),
-            "14": (6, 8),
-            "15": (8, 12),
-            
-            # Área direita (catacumbas/cripta)
-            "16": (10, 12),
-            "17": (12, 12),
-            "18": (10, 8),
-            "19": (12, 8),
-            "20": (12, 10),
-            "21": (14, 10),
-            
-            # Área inferior (túneis/torre)
-            "22": (14, 8),
-            "23": (14, 12),
-            "24": (16, 12),
-            "25": (16, 14),
-            "26": (18, 12),
-            "27": (20, 12),
-            "28": (20, 14),
-            "29": (22, 14),
-            "30": (22, 12),
-            "31": (24, 12),
-        }
+        # Posições das salas no grid do mapa (linha, coluna), vindas da dungeon compilada
+        self.room_positions = world.dungeon.positions
     
     def get_room_icon(self, room_id, player_pos):
         """Retorna o ícone apropriado para a sala"""
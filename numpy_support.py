@@ -0,0 +1,16 @@
+"""
+Importação opcional do numpy.
+
+Só as ferramentas vetorizadas (combat_estimator, save_analytics) usam
+numpy; sem ele is_available() retorna False, essas ferramentas avisam que
+estão indisponíveis e o resto do jogo funciona normalmente.
+"""
+try:
+    import numpy as np
+except ImportError:  # Jogo, web e saves não dependem do numpy
+    np = None
+
+
+def is_available():
+    """True quando o numpy está instalado"""
+    return np is not None
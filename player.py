@@ -1,5 +1,28 @@
-class Player:
+from dirty_tracking import DirtyTracking
+from items import InventoryStack, STACKABLE_TYPES, unwrap_item
+
+
+# Seções do save marcadas como alteradas quando o atributo é reatribuído
+# (os demais atributos públicos caem na seção "state")
+PLAYER_DIRTY_SECTIONS = {
+    **dict.fromkeys((
+        "name", "player_class", "level", "xp", "hp", "max_hp", "mana", "max_mana",
+        "bonus_mana", "strength", "vitality", "agility", "skill_points",
+        "attribute_points", "max_pa", "position", "unlocked_skills", "known_spells",
+    ), "stats"),
+    "inventory": "inventory",
+    "equipped_weapon": "equipment",
+    "equipped_shield": "equipment",
+    "equipped_armor": "equipment",
+    "companions": "companions",
+    "skill_cooldowns": "cooldowns",
+}
+
+
+class Player(DirtyTracking):
     """Classe que representa o jogador"""
+
+    DIRTY_SECTIONS = PLAYER_DIRTY_SECTIONS
     
     def __init__(self, name, player_class="guerreiro"):
         self.name = name
@@ -51,8 +74,12 @@ class Player:
         self.mana = self.max_mana
         
         # Sistema de Árvore de Habilidades (NOVO)
-        from skill_tree import SkillTree
-        self.skill_tree = SkillTree(player_class)
+        # A árvore é compartilhada por classe; o jogador guarda só os cooldowns
+        from skill_tree import get_skill_tree
+        self.skill_tree = get_skill_tree(self.player_class)
+        self.skill_cooldowns = [0] * len(self.skill_tree.slot_ids)
+        # Perfil de bônus passivos (ver get_passive_bonuses)
+        self._passive_profile = None
         self.skill_points = 0  # Pontos disponíveis para gastar
         self.attribute_points = 0  # Pontos de atributo para distribuir
         self.unlocked_skills = []  # IDs das skills desbloqueadas
@@ -91,24 +118,31 @@ class Player:
             return False, None
 
         self.companions.append(companion)
+        self.mark_dirty("companions")
         return True, companion
 
     def sync_companion_progression(self):
         """Atualiza companions com skills e progressão compatíveis com o nível atual."""
         from companions import hydrate_companion
 
-        self.companions = [
+        companions = [
             hydrate_companion(companion, self.level)
             for companion in self.companions
             if companion
         ]
+        # Só reatribui se algo mudou: a atribuição marca a seção como alterada
+        if companions != self.companions:
+            self.companions = companions
 
     def tick_companion_cooldowns(self):
         """Reduz os cooldowns das skills dos companions."""
         from companions import tick_companion_cooldowns
 
+        changed = False
         for companion in self.companions:
-            tick_companion_cooldowns(companion)
+            changed = tick_companion_cooldowns(companion) or changed
+        if changed:
+            self.mark_dirty("companions")
 
     def get_active_companion(self):
         """Retorna o primeiro companheiro ativo."""
@@ -119,29 +153,26 @@ class Player:
     
     def _equip_starting_gear(self):
         """Equipa arma e armadura inicial baseado na classe escolhida"""
-        import copy
         from items import health_potion, simple_shield
         
         if self.player_class == "mago":
             from items import mage_staff, mage_robe
             self.equipped_weapon = mage_staff
             self.equipped_armor = mage_robe
-            # Mago começa com 2 poções no inventário (cópias independentes)
-            self.inventory.append(copy.deepcopy(health_potion))
-            self.inventory.append(copy.deepcopy(health_potion))
+            # Mago começa com 2 poções no inventário (uma pilha)
+            self.inventory.append(InventoryStack(health_potion, 2))
         elif self.player_class == "druida":
             from items import druid_staff, druid_armor
             self.equipped_weapon = druid_staff
             self.equipped_armor = druid_armor
-            self.inventory.append(copy.deepcopy(health_potion))
-            self.inventory.append(copy.deepcopy(health_potion))
+            self.inventory.append(InventoryStack(health_potion, 2))
         else:  # guerreiro
             from items import warrior_sword, warrior_armor
             self.equipped_weapon = warrior_sword
             self.equipped_armor = warrior_armor
             # Guerreiro começa com 1 poção e 1 escudo simples no inventário
-            self.inventory.append(copy.deepcopy(health_potion))
-            self.inventory.append(copy.deepcopy(simple_shield))
+            self.inventory.append(InventoryStack(health_potion))
+            self.inventory.append(InventoryStack(simple_shield))
     
     def calculate_max_hp(self):
         """Calcula HP máximo baseado em vitalidade"""
@@ -187,22 +218,23 @@ class Player:
         """Calcula XP necessário para próximo nível"""
         return self.level * 100
     
-    def gain_xp(self, amount, auto_distribute=False):
+    def gain_xp(self, amount, auto_distribute=False, report=print):
         """Ganha XP e verifica se subiu de nível.
 
-        auto_distribute=True evita prompts interativos (uso web/API).
+        auto_distribute=True evita prompts interativos (uso web/API); as
+        mensagens desse caminho vão para `report`.
         """
         self.xp += amount
-        print(f"\n+{amount} XP")
+        report(f"\n+{amount} XP")
         
         # Verifica se subiu de nível
         while self.xp >= self.get_xp_needed():
             if auto_distribute:
-                self.level_up_auto()
+                self.level_up_auto(report)
             else:
                 self.level_up()
 
-    def level_up_auto(self):
+    def level_up_auto(self, report=print):
         """Sobe de nível sem interação (para web/API).
 
         Em vez de distribuir automaticamente, acumula pontos para o jogador escolher.
@@ -221,7 +253,7 @@ class Player:
         # Recupera recursos ao subir de nível
         self.hp = self.max_hp
         self.mana = self.max_mana
-        print(f"\n✨ Nível {self.level} (web). +1 PA Máx, +1 skill e +3 pontos de atributo.")
+        report(f"\n✨ Nível {self.level} (web). +1 PA Máx, +1 skill e +3 pontos de atributo.")
 
     def spend_attribute_point(self, attribute):
         """Gasta 1 ponto de atributo (uso web/API)."""
@@ -438,6 +470,7 @@ class Player:
         """Aprende uma nova magia"""
         if spell not in self.known_spells:
             self.known_spells.append(spell)
+            self.mark_dirty("stats")
             print(f"\n✨ Você aprendeu a magia: {spell.name}!")
             print(f"📖 {spell.description}")
             print(f"💙 Custo de mana: {spell.mana_cost}")
@@ -476,26 +509,53 @@ class Player:
                 print(f"   💚 Cura: {spell.power} HP")
             print()
     
-    def add_to_inventory(self, item):
-        """Adiciona item ao inventário"""
-        import copy
+    def _find_stack(self, item):
+        """Entrada do inventário que guarda o item base (ou None)"""
+        item = unwrap_item(item)
+        return next((entry for entry in self.inventory if entry.item is item), None)
+
+    def count_item(self, item):
+        """Quantidade de um item no inventário"""
+        entry = self._find_stack(item)
+        return entry.count if entry else 0
 
-        stackable_types = {"consumable"}
-        should_prevent_duplicate = item.item_type not in stackable_types
+    def add_to_inventory(self, item, count=1):
+        """Adiciona item ao inventário (referência ao item base, sem cópia).
+
+        Consumíveis iguais são empilhados na mesma entrada.
+        """
+        item = unwrap_item(item)
+
+        if item.item_type in STACKABLE_TYPES:
+            entry = self._find_stack(item)
+            if entry:
+                entry.count += count
+            else:
+                self.inventory.append(InventoryStack(item, count))
+            self.mark_dirty("inventory")
+            print(f"\n{item.name} adicionado ao inventário! (x{self.count_item(item)})")
+            return True
 
-        if should_prevent_duplicate and self.has_item_named(item.name):
+        if self.has_item_named(item.name):
             print(f"\n⚠️  {item.name} já está com você e não foi duplicado.")
             return False
 
-        item_copy = copy.deepcopy(item)
-        self.inventory.append(item_copy)
-        print(f"\n{item_copy.name} adicionado ao inventário!")
+        self.inventory.append(InventoryStack(item))
+        self.mark_dirty("inventory")
+        print(f"\n{item.name} adicionado ao inventário!")
         return True
     
-    def remove_from_inventory(self, item):
-        """Remove item do inventário"""
-        if item in self.inventory:
-            self.inventory.remove(item)
+    def remove_from_inventory(self, item, count=1):
+        """Remove item do inventário (a entrada some quando a pilha zera)"""
+        entry = self._find_stack(item)
+        if not entry:
+            return False
+
+        entry.count -= count
+        if entry.count <= 0:
+            self.inventory.remove(entry)
+        self.mark_dirty("inventory")
+        return True
     
     def show_inventory(self):
         """Exibe inventário formatado"""
@@ -509,7 +569,8 @@ class Player:
         
         for i, item in enumerate(self.inventory, 1):
             icon = "⚔️" if item.item_type == "weapon" else "🛡️" if item.item_type == "shield" else "🧪"
-            print(f"{i}. {icon} {item.name}")
+            quantity = f" x{item.count}" if item.count > 1 else ""
+            print(f"{i}. {icon} {item.name}{quantity}")
             print(f"   {item.description}")
             
             if item.item_type == "weapon":
@@ -522,21 +583,21 @@ class Player:
         
         print(f"{'='*40}")
     
-    def use_item(self, item_index):
-        """Usa um item consumível do inventário"""
+    def use_item(self, item_index, report=print):
+        """Usa um item consumível do inventário (mensagens vão para `report`)"""
         if item_index < 0 or item_index >= len(self.inventory):
-            print("\n❌ Item não encontrado no inventário!")
+            report("\n❌ Item não encontrado no inventário!")
             return False
         
         item = self.inventory[item_index]
         
         if item.item_type != "consumable":
-            print(f"\n❌ {item.name} não pode ser usado! (Equipamentos devem ser equipados)")
+            report(f"\n❌ {item.name} não pode ser usado! (Equipamentos devem ser equipados)")
             return False
         
         # Usa o item (chama o método use do item)
-        if item.use(self):
-            # Remove do inventário após uso
+        if item.use(self, report=report):
+            # Consome uma unidade da pilha
             self.remove_from_inventory(item)
             return True
         
@@ -566,36 +627,39 @@ class Player:
     
     def equip_weapon(self, weapon):
         """Equipa uma arma (apenas uma por vez)"""
+        weapon = unwrap_item(weapon)
         # Se já tem arma equipada, devolve ao inventário
         if self.equipped_weapon:
             self.add_to_inventory(self.equipped_weapon)
             print(f"\n{self.equipped_weapon.name} foi desequipada e retornou ao inventário.")
         
         # Remove a nova arma do inventário se estiver lá
-        if weapon in self.inventory:
-            self.inventory.remove(weapon)
+        self.remove_from_inventory(weapon)
         
         self.equipped_weapon = weapon
+        self.invalidate_passive_bonuses()
         print(f"\n✅ {weapon.name} equipada!")
         print(f"Ataque agora: {self.get_total_attack()}")
     
     def equip_shield(self, shield):
         """Equipa um escudo"""
+        shield = unwrap_item(shield)
         # Se já tem escudo equipado, devolve ao inventário
         if self.equipped_shield:
             self.add_to_inventory(self.equipped_shield)
             print(f"\n{self.equipped_shield.name} foi desequipado e retornou ao inventário.")
         
         # Remove o novo escudo do inventário se estiver lá
-        if shield in self.inventory:
-            self.inventory.remove(shield)
+        self.remove_from_inventory(shield)
         
         self.equipped_shield = shield
+        self.invalidate_passive_bonuses()
         print(f"\n✅ {shield.name} equipado!")
         print(f"Defesa agora: {self.get_total_defense()}")
     
     def equip_armor(self, armor):
         """Equipa uma armadura"""
+        armor = unwrap_item(armor)
         old_max_mana = self.max_mana
         
         # Se já tem armadura equipada, devolve ao inventário
@@ -604,10 +668,10 @@ class Player:
             print(f"\n{self.equipped_armor.name} foi desequipada e retornou ao inventário.")
         
         # Remove a nova armadura do inventário se estiver lá
-        if armor in self.inventory:
-            self.inventory.remove(armor)
+        self.remove_from_inventory(armor)
         
         self.equipped_armor = armor
+        self.invalidate_passive_bonuses()
         
         # Recalcula mana máxima com novo equipamento
         new_max_mana = self.calculate_max_mana()
@@ -629,6 +693,7 @@ class Player:
             weapon = self.equipped_weapon
             self.add_to_inventory(weapon)
             self.equipped_weapon = None
+            self.invalidate_passive_bonuses()
             print(f"\n{weapon.name} foi desequipada e retornou ao inventário.")
             return weapon
         else:
@@ -641,6 +706,7 @@ class Player:
             shield = self.equipped_shield
             self.add_to_inventory(shield)
             self.equipped_shield = None
+            self.invalidate_passive_bonuses()
             print(f"\n{shield.name} foi desequipado e retornou ao inventário.")
             return shield
         else:
@@ -655,6 +721,7 @@ class Player:
             
             self.add_to_inventory(armor)
             self.equipped_armor = None
+            self.invalidate_passive_bonuses()
             
             # Recalcula mana máxima sem o equipamento
             new_max_mana = self.calculate_max_mana()
@@ -735,7 +802,8 @@ class Player:
             for skill_id in self.unlocked_skills:
                 skill = self.skill_tree.get_skill(skill_id)
                 if skill:
-                    cooldown_text = f" (CD: {skill.current_cooldown})" if skill.current_cooldown > 0 else ""
+                    current_cooldown = self.get_skill_cooldown(skill_id)
+                    cooldown_text = f" (CD: {current_cooldown})" if current_cooldown > 0 else ""
                     print(f"  ⚡ {skill.name}{cooldown_text}")
         
         if self.skill_points > 0:
@@ -767,7 +835,9 @@ class Player:
         
         # Desbloqueia
         self.unlocked_skills.append(skill_id)
+        self.mark_dirty("stats")
         self.skill_points -= 1
+        self.invalidate_passive_bonuses()
         
         return True, f"✨ {skill.name} desbloqueada!"
     
@@ -791,15 +861,40 @@ class Player:
         
         return True, skill
     
+    def get_skill_cooldown(self, skill_id):
+        """Turnos restantes de cooldown de uma skill"""
+        slot = self.skill_tree.slot_index.get(skill_id)
+        return self.skill_cooldowns[slot] if slot is not None else 0
+
+    def start_skill_cooldown(self, skill_id):
+        """Coloca a skill em cooldown após o uso"""
+        slot = self.skill_tree.slot_index.get(skill_id)
+        if slot is not None:
+            self.skill_cooldowns[slot] = self.skill_tree.skills[skill_id].cooldown
+            self.mark_dirty("cooldowns")
+
     def tick_skill_cooldowns(self):
         """Reduz cooldown de todas as skills em 1"""
-        for skill_id in self.unlocked_skills:
-            skill = self.skill_tree.get_skill(skill_id)
-            if skill:
-                skill.tick_cooldown()
-    
-    def get_passive_bonuses(self):
-        """Retorna todos os bônus passivos ativos"""
+        cooldowns = self.skill_cooldowns
+        for slot, remaining in enumerate(cooldowns):
+            if remaining > 0:
+                cooldowns[slot] = remaining - 1
+                self.mark_dirty("cooldowns")
+    
+    def invalidate_passive_bonuses(self):
+        """Descarta o perfil de bônus passivos (skill desbloqueada ou equipamento trocado)"""
+        self._passive_profile = None
+
+    def get_passive_profile(self):
+        """Bônus passivos fixos, recalculados só quando as skills mudam"""
+        profile = getattr(self, "_passive_profile", None)
+        # Guarda barata contra listas trocadas/alteradas sem passar por unlock_skill
+        profile_key = (id(self.unlocked_skills), len(self.unlocked_skills))
+        if profile is not None and profile[0] == profile_key:
+            return profile[1]
+
+        from skill_tree import PASSIVE_EFFECTS
+
         bonuses = {
             'crit_chance': 0,
             'damage_multiplier': 1.0,
@@ -807,37 +902,33 @@ class Player:
             'arcane_damage_multiplier': 1.0,
             'defense_multiplier': 1.0,
             'lifesteal': 0,
-            'hp_regen': 0,
-            'mana_cost_reduction': 0
+            'mana_cost_reduction': 0,
+            'regen_fraction': 0,
+            'fury_power': 0,
         }
-        
         for skill_id in self.unlocked_skills:
             skill = self.skill_tree.get_skill(skill_id)
             if skill and skill.is_passive:
-                # Aplicar bônus baseado na skill
-                if "Mestre de Armas" in skill.name:
-                    bonuses['crit_chance'] += skill.power
-                elif "Fúria Crescente" in skill.name:
-                    # HP baixo = mais dano
-                    hp_percent = self.hp / self.max_hp
-                    damage_bonus = (1.0 - hp_percent) * skill.power
-                    bonuses['damage_multiplier'] += damage_bonus / 100
-                elif "Sede de Sangue" in skill.name:
-                    bonuses['lifesteal'] += skill.power
-                elif "Escudo Vivo" in skill.name:
-                    bonuses['hp_regen'] = skill.power * self.max_hp
-                elif "Seiva Renovadora" in skill.name:
-                    bonuses['hp_regen'] += skill.power * self.max_hp
-                elif "Maestria Arcana" in skill.name:
-                    bonuses['mana_cost_reduction'] = skill.power
-                    bonuses['arcane_damage_multiplier'] += skill.power
-                elif "Combustão Interna" in skill.name:
-                    bonuses['fire_damage_multiplier'] += skill.power
-                elif "Ressonância Espiritual" in skill.name:
-                    bonuses['damage_multiplier'] += skill.power
-                elif "Pele de Casca" in skill.name:
-                    bonuses['defense_multiplier'] += skill.power
-        
+                for key in PASSIVE_EFFECTS.get(skill.effect_kind, ()):
+                    bonuses[key] += skill.power
+
+        self._passive_profile = (profile_key, bonuses)
+        return bonuses
+
+    def get_passive_bonuses(self):
+        """Retorna todos os bônus passivos ativos"""
+        profile = self.get_passive_profile()
+        bonuses = dict(profile)
+        regen_fraction = bonuses.pop('regen_fraction')
+        fury_power = bonuses.pop('fury_power')
+
+        # Únicos termos que dependem do HP atual/máximo
+        if fury_power:
+            # HP baixo = mais dano
+            hp_percent = self.hp / self.max_hp
+            bonuses['damage_multiplier'] += (1.0 - hp_percent) * fury_power / 100
+        bonuses['hp_regen'] = regen_fraction * self.max_hp
+
         return bonuses
     
     def show_skill_tree(self):
@@ -0,0 +1,286 @@
+"""
+Análise em massa dos saves em colunas NumPy.
+
+Responde perguntas sobre todos os saves de uma vez ("em que nível os
+jogadores param?", "que armas estão equipadas na morte?") sem reconstruir
+Player/World: cada arquivo é decodificado, só os campos usados viram uma
+linha e o dicionário do save é descartado em seguida (streaming). No fim,
+cada campo é um array NumPy com uma posição por save:
+
+    level, hp, max_hp, visited      inteiros
+    timestamp                       datetime64 (NaT se desconhecido)
+    player, player_class, position  códigos (int) + categorias
+    weapon, shield, armor           códigos, -1 = slot vazio
+    companions                      máscara de bits sobre as categorias
+                                    (uma palavra uint64 a cada 64 tipos)
+
+Saves de qualquer versão são lidos direto (1.x pelos nomes antigos dos
+campos), sem passar pela migração. A CLI recusa rodar sem numpy
+(numpy_support.py).
+
+Uso:
+    python save_analytics.py [pasta] [--top N] [--json]
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+from item_registry import get_item_registry
+from numpy_support import is_available, np
+from save_manager import SAVE_EXTENSIONS, read_save_file, save_format_version
+
+# Colunas categóricas: códigos inteiros + lista de categorias
+CATEGORICAL_COLUMNS = ("player", "player_class", "position", "weapon", "shield", "armor")
+NUMERIC_COLUMNS = {"level": "int32", "hp": "int32", "max_hp": "int32", "visited": "int32"}
+
+# Largura máxima das barras do histograma de níveis
+HISTOGRAM_WIDTH = 40
+
+# Companheiros por palavra da máscara (coluna companions: saves x palavras uint64)
+COMPANION_WORD_BITS = 64
+
+
+def _item_id(key):
+    """Id do item (saves 1.x guardam o nome ou o dicionário do item)"""
+    if isinstance(key, dict):
+        key = key.get("name")
+    if not key:
+        return None
+    item = get_item_registry().resolve(key)
+    return (item.item_id or item.name) if item else key
+
+
+def _parse_timestamp(value):
+    try:
+        return np.datetime64(datetime.fromisoformat(value), "s")
+    except (TypeError, ValueError):
+        return np.datetime64("NaT", "s")
+
+
+def extract_row(save_data):
+    """Campos analisados de um save (formato 2 ou 1.x), sem objetos do jogo"""
+    player = save_data["player"]
+    world = save_data.get("world", {})
+    if save_format_version(save_data) >= 2:
+        player_class = player.get("class", "guerreiro")
+        weapon, shield, armor = player.get("equipment", (None, None, None))
+    else:
+        player_class = player.get("player_class", "guerreiro")
+        weapon = player.get("equipped_weapon")
+        shield = player.get("equipped_shield")
+        armor = player.get("equipped_armor")
+
+    return {
+        "player": player.get("name", ""),
+        "player_class": player_class,
+        "position": str(player.get("position", "")),
+        "weapon": _item_id(weapon),
+        "shield": _item_id(shield),
+        "armor": _item_id(armor),
+        "level": player.get("level", 1),
+        "hp": player.get("hp", 0),
+        "max_hp": player.get("max_hp", 0),
+        "visited": len(world.get("visited_rooms", ())),
+        "timestamp": save_data.get("timestamp"),
+        "companions": [companion.get("id") for companion in player.get("companions", []) if companion],
+    }
+
+
+class SaveColumns:
+    """Saves como colunas NumPy (uma posição por save)"""
+
+    def __init__(self, files, columns, categories, skipped=()):
+        self.files = files
+        self.columns = columns
+        self.categories = categories  # coluna -> array de rótulos (o código é o índice)
+        self.skipped = list(skipped)  # Arquivos que não puderam ser lidos
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def labels(self, name):
+        """Rótulos de uma coluna categórica (None nos slots vazios)"""
+        codes = self.columns[name]
+        labels = np.append(self.categories[name], None)
+        return labels[np.where(codes < 0, len(labels) - 1, codes)]
+
+    def has_companion(self, companion_id):
+        """Máscara booleana dos saves com o companheiro"""
+        kinds = list(self.categories["companions"])
+        if companion_id not in kinds:
+            return np.zeros(len(self), dtype=bool)
+        word, bit = divmod(kinds.index(companion_id), COMPANION_WORD_BITS)
+        return (self.columns["companions"][:, word] >> np.uint64(bit)) & np.uint64(1) == 1
+
+    def counts(self, name, mask=None):
+        """[(rótulo, quantidade)] de uma coluna categórica, do mais comum ao menos"""
+        codes = self.columns[name] if mask is None else self.columns[name][mask]
+        codes = codes[codes >= 0]
+        totals = np.bincount(codes, minlength=len(self.categories[name]))
+        order = np.argsort(-totals, kind="stable")
+        return [(self.categories[name][code], int(totals[code])) for code in order if totals[code]]
+
+    def latest_per_player(self):
+        """Índices do save mais recente de cada jogador (pelo timestamp)"""
+        players = self.columns["player"]
+        if not len(players):
+            return np.array([], dtype=np.int64)
+        # NaT fica antes de qualquer data: ordena por jogador e depois por data
+        timestamps = self.columns["timestamp"].astype("int64")
+        order = np.lexsort((timestamps, players))
+        last_of_player = np.append(players[order][1:] != players[order][:-1], True)
+        return order[last_of_player]
+
+
+class _ColumnBuilder:
+    """Acumula linhas e monta as colunas (categorias na ordem em que aparecem)"""
+
+    def __init__(self):
+        self.files = []
+        self.values = {name: [] for name in (*CATEGORICAL_COLUMNS, *NUMERIC_COLUMNS, "timestamp", "companions")}
+        self.codes = {name: {} for name in (*CATEGORICAL_COLUMNS, "companions")}
+
+    def _code(self, name, label):
+        if label is None:
+            return -1
+        return self.codes[name].setdefault(label, len(self.codes[name]))
+
+    def add(self, filename, row):
+        self.files.append(filename)
+        for name in CATEGORICAL_COLUMNS:
+            self.values[name].append(self._code(name, row[name]))
+        for name in NUMERIC_COLUMNS:
+            self.values[name].append(row[name])
+        self.values["timestamp"].append(_parse_timestamp(row["timestamp"]))
+        self.values["companions"].append([self._code("companions", companion_id) for companion_id in row["companions"]])
+
+    def build(self, skipped):
+        columns = {name: np.array(self.values[name], dtype=np.int32) for name in CATEGORICAL_COLUMNS}
+        columns.update({name: np.array(self.values[name], dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()})
+        columns["timestamp"] = np.array(self.values["timestamp"], dtype="datetime64[s]")
+        columns["companions"] = self._companion_mask()
+        categories = {name: np.array(list(codes), dtype=object) for name, codes in self.codes.items()}
+        return SaveColumns(np.array(self.files, dtype=object), columns, categories, skipped)
+
+    def _companion_mask(self):
+        """Máscara saves x palavras: o bit `código % 64` da palavra `código // 64`"""
+        words = max(1, -(-len(self.codes["companions"]) // COMPANION_WORD_BITS))
+        mask = np.zeros((len(self.files), words), dtype=np.uint64)
+        rows = np.repeat(np.arange(len(self.files)), [len(codes) for codes in self.values["companions"]])
+        codes = np.array([code for codes in self.values["companions"] for code in codes], dtype=np.int64)
+        bits = np.left_shift(np.uint64(1), (codes % COMPANION_WORD_BITS).astype(np.uint64))
+        np.bitwise_or.at(mask, (rows, codes // COMPANION_WORD_BITS), bits)
+        return mask
+
+
+def iter_save_rows(save_dir="saves"):
+    """(arquivo, linha) de cada save legível; (arquivo, None) para os ilegíveis"""
+    with os.scandir(save_dir) as entries:
+        paths = sorted(entry.path for entry in entries if entry.is_file() and entry.name.endswith(SAVE_EXTENSIONS))
+    for path in paths:
+        try:
+            yield os.path.basename(path), extract_row(read_save_file(path))
+        except Exception:  # Arquivo corrompido ou sem os campos básicos
+            yield os.path.basename(path), None
+
+
+def load_save_columns(save_dir="saves"):
+    """Lê todos os saves da pasta em colunas NumPy (SaveColumns)"""
+    if np is None:
+        raise RuntimeError("numpy não está instalado")
+    builder = _ColumnBuilder()
+    skipped = []
+    for filename, row in iter_save_rows(save_dir):
+        if row is None:
+            skipped.append(filename)
+        else:
+            builder.add(filename, row)
+    return builder.build(skipped)
+
+
+def build_report(saves, top=5):
+    """Resumo das perguntas de balanceamento a partir das colunas"""
+    latest = saves.latest_per_player()
+    quit_levels = saves["level"][latest]
+    dead = saves["hp"] <= 0
+
+    levels, level_counts = np.unique(quit_levels, return_counts=True)
+    visited_by_class = {}
+    for code, label in enumerate(saves.categories["player_class"]):
+        mask = saves["player_class"] == code
+        visited_by_class[label] = round(float(saves["visited"][mask].mean()), 1)
+
+    return {
+        "saves": len(saves),
+        "players": int(len(latest)),
+        "skipped": saves.skipped,
+        "classes": saves.counts("player_class"),
+        "quit_levels": [(int(level), int(count)) for level, count in zip(levels, level_counts)],
+        "median_quit_level": float(np.median(quit_levels)) if len(quit_levels) else None,
+        "deaths": int(dead.sum()),
+        "weapons_at_death": saves.counts("weapon", dead)[:top],
+        "weapons": saves.counts("weapon")[:top],
+        "companions": [
+            (companion_id, int(saves.has_companion(companion_id).sum()))
+            for companion_id in saves.categories["companions"]
+        ],
+        "visited_by_class": visited_by_class,
+    }
+
+
+def _item_label(key):
+    item = get_item_registry().resolve(key)
+    return item.name if item else f"{key} (desconhecido)"
+
+
+def print_report(report):
+    print(f"📊 {report['saves']} saves de {report['players']} jogadores")
+    if report["skipped"]:
+        print(f"   ⚠️ {len(report['skipped'])} ilegíveis: {', '.join(report['skipped'])}")
+    print("   Classes: " + ", ".join(f"{label} {count}" for label, count in report["classes"]))
+
+    print(f"\n🚪 Nível em que os jogadores pararam (save mais recente, mediana {report['median_quit_level']}):")
+    largest = max((count for _, count in report["quit_levels"]), default=1)
+    for level, count in report["quit_levels"]:
+        bar = "█" * max(1, round(count / largest * HISTOGRAM_WIDTH))
+        print(f"   nv{level:>3}: {bar} {count}")
+
+    print(f"\n💀 Armas equipadas na morte ({report['deaths']} saves com HP 0):")
+    if not report["weapons_at_death"]:
+        print("   Nenhum save de personagem morto")
+    for key, count in report["weapons_at_death"]:
+        print(f"   {_item_label(key)}: {count}")
+
+    print("\n⚔️ Armas mais equipadas:")
+    for key, count in report["weapons"]:
+        print(f"   {_item_label(key)}: {count}")
+
+    if report["companions"]:
+        print("\n🤝 Companheiros: " + ", ".join(f"{companion_id} {count}" for companion_id, count in report["companions"]))
+    print("\n🗺️ Salas visitadas (média por classe): " + ", ".join(
+        f"{label} {average}" for label, average in report["visited_by_class"].items()
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório dos saves em massa (NumPy)")
+    parser.add_argument("save_dir", nargs="?", default="saves", help="Pasta dos saves (padrão: saves)")
+    parser.add_argument("--top", type=int, default=5, help="Itens por ranking (padrão: 5)")
+    parser.add_argument("--json", action="store_true", help="Relatório em JSON")
+    args = parser.parse_args()
+
+    if not is_available():
+        parser.error("numpy não está instalado")
+    report = build_report(load_save_columns(args.save_dir), top=args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,210 +1,763 @@
 import json
 import os
-import copy
+import pickle
+import secrets
+import threading
+import zlib
+from collections import OrderedDict
 from datetime import datetime
+from companions import companion_delta, restore_companion
+from dungeon_loader import DEFAULT_DUNGEON_ID
+from game_rng import GameRNG
+from item_registry import get_item_registry
+from items import InventoryStack
+
+try:
+    import msgpack
+except ImportError:  # Saves binários usam JSON dentro do zlib sem o msgpack
+    msgpack = None
+
+SAVE_FORMAT_VERSION = 2
+
+# Extensões reconhecidas como saves (.json texto, .sav binário)
+SAVE_EXTENSIONS = (".json", ".sav")
+
+# Cabeçalho dos saves binários, seguido de 1 byte do codec (M msgpack, J json)
+SAVE_MAGIC = b"EOTF2"
+
+# Índice dos saves (resumo de cada arquivo) para listar sem abrir todos os JSONs
+SAVE_INDEX_FILENAME = "index.manifest"
+SAVE_INDEX_VERSION = 1
+
+# Diário do índice: cada save gravado/apagado acrescenta uma linha em vez de
+# reescrever o manifesto; a listagem (ou um diário grande demais) o incorpora
+SAVE_INDEX_JOURNAL_FILENAME = "index.journal"
+SAVE_INDEX_JOURNAL_MAX_BYTES = 64 * 1024
+
+# Ordenações da lista de saves: campo -> (chave, decrescente por padrão)
+SAVE_SORT_KEYS = {
+    "timestamp": (lambda save: save["timestamp"], True),
+    "player": (lambda save: save["player"].lower(), False),
+    "level": (lambda save: save["level"], True),
+}
+
+# Leitura + reescrita do índice (e do diário) é uma seção crítica: o autosave grava em outra thread
+_index_lock = threading.Lock()
+
+# Últimos saves (por arquivo) guardados pelo SaveManager como base do próximo delta
+SAVE_BASELINE_CACHE_SIZE = 64
+
+# Seções de save_data["player"] e save_data["world"] (versionadas por dirty_tracking)
+PLAYER_SAVE_SECTIONS = ("stats", "inventory", "equipment", "companions")
+WORLD_SAVE_SECTIONS = ("dungeon", "visited_rooms", "defeated_enemies", "looted_rooms", "rng")
+
+
+def state_versions(player, world):
+    """Versões das seções de player e world ({"player": {...}, "world": {...}}).
+
+    Os sorteios do RNG não passam por atributos, então a seção "rng" usa o
+    hash do estado dos fluxos.
+    """
+    world_versions = world.section_versions() if hasattr(world, "section_versions") else {}
+    world_versions["rng"] = world.rng.fingerprint()
+    return {
+        "player": player.section_versions() if hasattr(player, "section_versions") else {},
+        "world": world_versions,
+    }
+
+
+def changed_sections(since, versions):
+    """Seções (dono, seção) com versão diferente entre dois state_versions"""
+    since = since or {}
+    changed = set()
+    for owner in ("player", "world"):
+        sections = versions.get(owner, {})
+        previous = since.get(owner, {})
+        for section in set(sections) | set(previous):
+            if sections.get(section) != previous.get(section):
+                changed.add((owner, section))
+    return changed
+
+
+def apply_save_delta(save_data, delta):
+    """Save completo = save base + seções de um delta (build_save_delta)"""
+    merged = {
+        **save_data,
+        "timestamp": delta.get("timestamp", save_data.get("timestamp")),
+        "player": {**save_data["player"], **delta.get("player", {})},
+        "world": {**save_data["world"], **delta.get("world", {})},
+    }
+    # Base que era ela mesma um delta: as versões dela não valem para o resultado
+    merged.pop("versions", None)
+    if "combat" in delta:
+        if delta["combat"]:
+            merged["combat"] = delta["combat"]
+        else:
+            merged.pop("combat", None)
+    return merged
+
+
+def write_file_atomic(filepath, payload):
+    """Grava bytes com temporário + fsync + rename (nunca deixa um arquivo pela metade)"""
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def encode_save(save_data, encoding="json"):
+    """Bytes do arquivo de save: JSON compacto ou binário (msgpack/JSON + zlib)"""
+    if encoding != "binary":
+        return json.dumps(save_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if msgpack is not None:
+        return SAVE_MAGIC + b"M" + zlib.compress(msgpack.packb(save_data), 6)
+    body = json.dumps(save_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return SAVE_MAGIC + b"J" + zlib.compress(body, 6)
+
+
+def decode_save(raw):
+    """Dados de um arquivo de save em qualquer codificação (ValueError se inválido)"""
+    if not raw.startswith(SAVE_MAGIC):
+        return json.loads(raw.decode('utf-8'))
+
+    codec = raw[len(SAVE_MAGIC):len(SAVE_MAGIC) + 1]
+    body = zlib.decompress(raw[len(SAVE_MAGIC) + 1:])
+    if codec == b"M":
+        if msgpack is None:
+            raise ValueError("Save em msgpack, mas o msgpack não está instalado")
+        return msgpack.unpackb(body)
+    return json.loads(body.decode('utf-8'))
+
+
+def read_save_file(filepath):
+    with open(filepath, 'rb') as f:
+        return decode_save(f.read())
+
+
+def save_format_version(save_data):
+    """Versão principal do save ("1.3" -> 1, 2 -> 2)"""
+    version = save_data.get("version", "1.0")
+    if isinstance(version, str):
+        return int(version.split(".")[0])
+    return int(version)
+
+
+def _migrate_v1(save_data):
+    """1.0-1.4 -> 2: itens por id, companheiros como delta do template e RNG
+    reduzido a semente + posição.
+
+    Cobre as variações da série 1 (1.0 itens pelo nome ou como dicionário
+    com todos os campos, 1.1 um id por item, 1.2 pilhas, 1.3 rng, 1.4 combate).
+    """
+    item_registry = get_item_registry()
+
+    def item_key(key):
+        if isinstance(key, dict):
+            key = key.get("name")
+        item = item_registry.resolve(key) if key else None
+        return (item.item_id or item.name) if item else key
+
+    old_player = save_data["player"]
+    inventory = []
+    for entry in old_player.get("inventory", []):
+        key, count = (entry, 1) if isinstance(entry, (str, dict)) else entry
+        inventory.append([item_key(key), count])
+
+    player_data = {
+        "name": old_player["name"],
+        "class": old_player.get("player_class", "guerreiro"),
+        "level": old_player["level"],
+        "xp": old_player["xp"],
+        "hp": old_player["hp"],
+        "max_hp": old_player["max_hp"],
+        "bonus_mana": old_player.get("bonus_mana", 0),
+        "attributes": [old_player["strength"], old_player["vitality"], old_player["agility"]],
+        "points": [old_player.get("skill_points", 0), old_player.get("attribute_points", 0)],
+        "position": old_player["position"],
+        "skills": list(old_player.get("unlocked_skills", [])),
+        "spells": [item_key(spell) for spell in old_player.get("known_spells", [])],
+        "inventory": inventory,
+        "equipment": [
+            item_key(old_player.get("equipped_weapon")),
+            item_key(old_player.get("equipped_shield")),
+            item_key(old_player.get("equipped_armor")),
+        ],
+        "companions": [companion_delta(companion) for companion in old_player.get("companions", []) if companion],
+    }
+    for optional in ("mana", "max_pa"):
+        if optional in old_player:
+            player_data[optional] = old_player[optional]
+
+    old_world = save_data["world"]
+    rng_state = old_world.get("rng")
+    if rng_state:
+        rng_state = GameRNG.from_state(rng_state).get_compact_state() or rng_state
+
+    migrated = {
+        "version": 2,
+        "timestamp": save_data.get("timestamp", "Desconhecido"),
+        "player": player_data,
+        "world": {
+            "dungeon_id": old_world.get("dungeon_id", DEFAULT_DUNGEON_ID),
+            "visited_rooms": old_world["visited_rooms"],
+            "defeated_enemies": old_world["defeated_enemies"],
+            "looted_rooms": old_world["looted_rooms"],
+            "rng": rng_state,
+        },
+    }
+    if save_data.get("combat"):
+        migrated["combat"] = save_data["combat"]
+    return migrated
+
+
+# Versão principal -> função que converte para a versão seguinte
+SAVE_MIGRATIONS = {
+    1: _migrate_v1,
+}
+
+
+def migrate_save(save_data):
+    """Atualiza dados de save de qualquer versão anterior para a atual"""
+    version = save_format_version(save_data)
+    while version < SAVE_FORMAT_VERSION:
+        migration = SAVE_MIGRATIONS.get(version)
+        if migration is None:
+            raise ValueError(f"Save na versão {version} sem migração disponível")
+        save_data = migration(save_data)
+        version = save_format_version(save_data)
+    if version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"Save de uma versão mais nova do jogo ({version})")
+    return save_data
+
 
 class SaveManager:
     """Gerencia slavar e carregar o jogo"""
-    def __init__(self,save_dir="saves"):
+    def __init__(self,save_dir="saves", snapshot_dir=None, encoding=None):
         self.save_dir = save_dir
+        # "json" (texto compacto) ou "binary" (msgpack/JSON + zlib, arquivos .sav)
+        self.encoding = encoding or os.environ.get("DUNGEON_SAVE_ENCODING", "json")
+        # Snapshots de sessões web despejadas da memória (não aparecem na lista de saves)
+        self.snapshot_dir = snapshot_dir or os.path.join(save_dir, "sessions")
+        # caminho -> (id da marca, save_data): base do delta do próximo save (LRU)
+        self._baselines = OrderedDict()
+        self._baselines_lock = threading.Lock()
 
         # Cria a pasta de saves se não existir
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
-    def save_game(self, player, world, filename=None):
-        """Salva o estado do jogo em JSON"""
+    def save_game(self, player, world, filename=None, combat_state=None):
+        """Salva o estado do jogo (formato 2: só ids e diferenças dos templates).
+
+        combat_state (opcional) é o combate em andamento, serializado em JSON
+        pelo app_web (CombatPA.get_state + fila de inimigos da sala).
+        """
+        filename = self.resolve_save_filename(filename)
+        prepared = self.prepare_save(player, world, filename, combat_state)
+        if prepared is None:
+            print(f"\n💾 Nada mudou desde o último save em: {filename}")
+            return os.path.join(self.save_dir, filename)
+        save_data, mark = prepared
+        return self.write_save(filename, save_data, mark)
+
+    def prepare_save(self, player, world, filename, combat_state=None):
+        """(save_data, marca) para gravar em `filename`, ou None se o arquivo já tem este estado.
+
+        Se este jogo foi o último a salvar no arquivo por este SaveManager, só
+        as seções alteradas desde então são montadas de novo (build_save_delta)
+        e aplicadas sobre os dados daquele save (apply_save_delta). A base
+        fica no SaveManager, não no player: não entra nos pickles das sessões.
+        """
+        if self.is_up_to_date(player, world, filename, combat_state):
+            return None
+        filepath = os.path.join(self.save_dir, filename)
+        previous = getattr(player, "save_marks", {}).get(filepath)
+        with self._baselines_lock:
+            baseline = self._baselines.get(filepath)
+        mark = self.new_save_mark(player, world, filename, combat_state)
+
+        if previous is not None and previous["token"] is not None and baseline is not None and baseline[0] == previous.get("id"):
+            versions, previous_combat = previous["token"]
+            delta = self.build_save_delta(player, world, {**versions, "combat": previous_combat}, combat_state)
+            # Sem delta: o arquivo mudou por fora, regrava o mesmo estado
+            save_data = apply_save_delta(baseline[1], delta or {"timestamp": datetime.now().isoformat()})
+        else:
+            save_data = self.build_save_data(player, world, combat_state)
+        if mark is not None:
+            with self._baselines_lock:
+                self._baselines[filepath] = (mark["id"], save_data)
+                self._baselines.move_to_end(filepath)
+                if len(self._baselines) > SAVE_BASELINE_CACHE_SIZE:
+                    self._baselines.popitem(last=False)
+        return save_data, mark
+
+    def resolve_save_filename(self, filename=None):
+        """Nome final do arquivo (timestamp se vazio, extensão do formato)"""
         if filename is None:
             #Gera nomee com timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"save_{timestamp}.json"
-        
-        # Prepara dados do player
-        player_data = {
-            "name": player.name,
-            "player_class": player.player_class,
-            "level": player.level,
-            "xp": player.xp,
-            "max_hp": player.max_hp,
-            "hp": player.hp,
-            "mana": player.mana,
-            "max_mana": player.max_mana,
-            "bonus_mana": getattr(player, "bonus_mana", 0),
-            "strength": player.strength,
-            "vitality": player.vitality,
-            "agility": player.agility,
-            "skill_points": getattr(player, "skill_points", 0),
-            "attribute_points": getattr(player, "attribute_points", 0),
-            "unlocked_skills": list(getattr(player, "unlocked_skills", [])),
-            "known_spells": [spell.name for spell in getattr(player, "known_spells", [])],
-            "max_pa": getattr(player, "max_pa", 6),
-            "position": player.position,
-            "inventory": [item.name for item in player.inventory],
-            "companions": copy.deepcopy(getattr(player, "companions", [])),
-            "equipped_weapon": player.equipped_weapon.name if player.equipped_weapon else None,
-            "equipped_shield": player.equipped_shield.name if player.equipped_shield else None,
-            "equipped_armor": player.equipped_armor.name if player.equipped_armor else None,
-        }
-        
-        # Prepara dados do world
-        world_data = {
-            "visited_rooms": list(world.visited_rooms),
-            "defeated_enemies": list(world.defeated_enemies),
-            "looted_rooms": list(world.looted_rooms)
-        }
-        
-        # Combina tudo
-        save_data = {
-            "version": "1.0",
-            "timestamp": datetime.now().isoformat(),
-            "player": player_data,
-            "world": world_data
-        }
-        
-        # Salva em arquivo
+        return self._filename_for_encoding(filename)
+
+    def write_save(self, filename, save_data, mark=None):
+        """Grava dados de save já montados.
+
+        Arquivo temporário + fsync + rename: uma queda no meio da escrita
+        deixa o save anterior intacto, nunca um arquivo pela metade.
+        `mark` (de new_save_mark) recebe o mtime/tamanho do arquivo gravado.
+        """
         filepath = os.path.join(self.save_dir, filename)
         
         try:
-            with open(filepath, 'w') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            write_file_atomic(filepath, encode_save(save_data, self.encoding))
+            self._index_save(filename, filepath, save_data)
+            if mark is not None:
+                stat = os.stat(filepath)
+                mark["stat"] = (stat.st_mtime_ns, stat.st_size)
             
             print(f"\n💾 Jogo salvo em: {filename}")
             return filepath
         
         except Exception as e:
             print(f"\n❌ Erro ao salvar: {e}")
+            if mark is not None:
+                mark["token"] = None
             return None
-    
+
+    def build_save_data(self, player, world, combat_state=None):
+        """Dados do save no formato atual (ids de itens, companheiros como delta)"""
+        save_data = {
+            "version": SAVE_FORMAT_VERSION,
+            "timestamp": datetime.now().isoformat(),
+            "player": self._build_sections(player, PLAYER_SAVE_SECTIONS, self._player_section),
+            "world": self._build_sections(world, WORLD_SAVE_SECTIONS, self._world_section),
+        }
+        if combat_state:
+            save_data["combat"] = combat_state
+        return save_data
+
+    def build_save_delta(self, player, world, since, combat_state=None):
+        """Só as seções alteradas desde `since` ("versions" do delta anterior,
+        ou None para um delta com tudo).
+
+        Retorna None se nada mudou. O delta guarda as versões atuais em
+        "versions" (base do próximo delta) e é aplicado com apply_save_delta.
+        """
+        since = since or {}
+        versions = state_versions(player, world)
+        if since:
+            changed = changed_sections(since, versions)
+        else:
+            changed = {("player", s) for s in PLAYER_SAVE_SECTIONS} | {("world", s) for s in WORLD_SAVE_SECTIONS}
+        combat_changed = combat_state != since.get("combat")
+        if not changed and not combat_changed:
+            return None
+        versions["combat"] = combat_state
+
+        delta = {
+            "version": SAVE_FORMAT_VERSION,
+            "timestamp": datetime.now().isoformat(),
+            "versions": versions,
+            "player": self._build_sections(player, [s for s in PLAYER_SAVE_SECTIONS if ("player", s) in changed], self._player_section),
+            "world": self._build_sections(world, [s for s in WORLD_SAVE_SECTIONS if ("world", s) in changed], self._world_section),
+        }
+        if combat_changed:
+            delta["combat"] = combat_state
+        return delta
+
+    def normalize_save_data(self, save_data):
+        """Save de qualquer versão reescrito no formato atual.
+
+        Passa pelos objetos do jogo (como carregar e salvar de novo): itens
+        fora do registro somem e os companheiros voltam a ser delta do
+        template atual. Data do save e combate em andamento são mantidos.
+        """
+        save_data = migrate_save(save_data)
+        player = self._build_player(save_data["player"])
+        world = self._build_world(save_data["world"])
+        normalized = self.build_save_data(player, world, save_data.get("combat"))
+        normalized["timestamp"] = save_data.get("timestamp", normalized["timestamp"])
+        return normalized
+
+    def _build_sections(self, obj, sections, build_section):
+        data = {}
+        for section in sections:
+            data.update(build_section(obj, section))
+        return data
+
+    def _player_section(self, player, section):
+        """Chaves do save de uma seção do player"""
+        if section == "stats":
+            return {
+                "name": player.name,
+                "class": player.player_class,
+                "level": player.level,
+                "xp": player.xp,
+                "hp": player.hp,
+                "max_hp": player.max_hp,
+                "mana": player.mana,
+                "bonus_mana": getattr(player, "bonus_mana", 0),
+                "attributes": [player.strength, player.vitality, player.agility],
+                "points": [getattr(player, "skill_points", 0), getattr(player, "attribute_points", 0)],
+                "max_pa": getattr(player, "max_pa", 6),
+                "position": player.position,
+                "skills": list(getattr(player, "unlocked_skills", [])),
+                "spells": [self._item_key(spell) for spell in getattr(player, "known_spells", [])],
+            }
+        if section == "inventory":
+            return {"inventory": [[self._item_key(entry), entry.count] for entry in player.inventory]}
+        if section == "equipment":
+            return {"equipment": [
+                self._item_key(player.equipped_weapon),
+                self._item_key(player.equipped_shield),
+                self._item_key(player.equipped_armor),
+            ]}
+        if section == "companions":
+            return {"companions": [companion_delta(companion) for companion in getattr(player, "companions", []) if companion]}
+        raise ValueError(f"Seção de save desconhecida: {section}")
+
+    def _world_section(self, world, section):
+        """Chaves do save de uma seção do world"""
+        if section == "dungeon":
+            return {"dungeon_id": world.dungeon_id}
+        if section in ("visited_rooms", "defeated_enemies", "looted_rooms"):
+            return {section: sorted(getattr(world, section))}
+        if section == "rng":
+            # Semente + posição de cada fluxo (estado completo só se não der para reduzir)
+            return {"rng": world.rng.get_compact_state() or world.rng.get_state()}
+        raise ValueError(f"Seção de save desconhecida: {section}")
+
+    def is_up_to_date(self, player, world, filename, combat_state=None):
+        """True se `filename` já tem exatamente este estado (save seria um no-op).
+
+        Compara as versões das seções com as do último save deste jogo no
+        arquivo, e o mtime/tamanho do arquivo com os de quando foi gravado
+        (outro jogo pode ter salvo por cima, ou o arquivo ter sido apagado).
+        """
+        filepath = os.path.join(self.save_dir, filename)
+        mark = getattr(player, "save_marks", {}).get(filepath)
+        if mark is None or mark["token"] != (state_versions(player, world), combat_state):
+            return False
+        if mark["stat"] is None:
+            # Gravação ainda na fila do autosave
+            return True
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+        return mark["stat"] == (stat.st_mtime_ns, stat.st_size)
+
+    def new_save_mark(self, player, world, filename, combat_state=None):
+        """Registra no player o estado que está sendo gravado em `filename`.
+
+        write_save completa a marca com o mtime/tamanho do arquivo gravado
+        (ou a invalida se a escrita falhar).
+        """
+        if not hasattr(player, "save_marks"):
+            return None
+        # id liga a marca (que viaja no pickle do player) à base do delta deste processo
+        mark = {"id": secrets.token_hex(8), "token": (state_versions(player, world), combat_state), "stat": None}
+        player.save_marks[os.path.join(self.save_dir, filename)] = mark
+        return mark
+
     def load_game(self, filename):
-        """Carrega o estado do jogo do JSON"""
+        """Carrega o estado do jogo do save"""
+        player, world, _ = self.load_game_session(filename)
+        return player, world
+
+    def load_game_session(self, filename):
+        """Carrega player, world e o combate em andamento salvo (ou None).
+
+        Saves de versões antigas são migrados em memória para o formato atual
+        antes da reconstrução (o arquivo só muda no próximo save).
+        """
         filepath = os.path.join(self.save_dir, filename)
         
         if not os.path.exists(filepath):
             print(f"\n❌ Arquivo não encontrado: {filename}")
-            return None, None
+            return None, None, None
         
         try:
-            with open(filepath, 'r') as f:
-                save_data = json.load(f)
-
-            item_registry = self._get_item_registry()
-            
-            # Reconstrói o player
-            from player import Player
-            
-            player_data = save_data["player"]
-            player = Player(player_data["name"], player_data.get("player_class", "guerreiro"))
-            player.inventory = []
-            player.companions = []
-            player.equipped_weapon = None
-            player.equipped_shield = None
-            player.equipped_armor = None
-            player.known_spells = []
-            
-            # Restaura atributos
-            player.level = player_data["level"]
-            player.xp = player_data["xp"]
-            player.max_hp = player_data["max_hp"]
-            player.hp = player_data["hp"]
-            player.mana = player_data.get("mana", player.mana)
-            player.max_mana = player_data.get("max_mana", player.max_mana)
-            player.bonus_mana = player_data.get("bonus_mana", 0)
-            player.strength = player_data["strength"]
-            player.vitality = player_data["vitality"]
-            player.agility = player_data["agility"]
-            player.skill_points = player_data.get("skill_points", 0)
-            player.attribute_points = player_data.get("attribute_points", 0)
-            player.unlocked_skills = list(player_data.get("unlocked_skills", []))
-            player.max_pa = player_data.get("max_pa", getattr(player, "max_pa", 6))
-            player.position = player_data["position"]
-            from companions import hydrate_companion
-            player.companions = [
-                hydrate_companion(companion, player.level)
-                for companion in player_data.get("companions", [])
-                if companion
-            ]
-            
-            # Recalcula stats (em caso de mudança no cálculo)
-            player.base_attack = player.calculate_attack()
-            player.base_defense = player.calculate_defense()
-            
-            # Restaura inventário
-            for item_name in player_data.get("inventory", []):
-                item = item_registry.get(item_name)
-                if item:
-                    player.inventory.append(copy.deepcopy(item))
-            
-            # Restaura equipamentos
-            equipped_weapon_name = player_data.get("equipped_weapon")
-            if equipped_weapon_name and equipped_weapon_name in item_registry:
-                player.equipped_weapon = copy.deepcopy(item_registry[equipped_weapon_name])
-
-            equipped_shield_name = player_data.get("equipped_shield")
-            if equipped_shield_name and equipped_shield_name in item_registry:
-                player.equipped_shield = copy.deepcopy(item_registry[equipped_shield_name])
-
-            equipped_armor_name = player_data.get("equipped_armor")
-            if equipped_armor_name and equipped_armor_name in item_registry:
-                player.equipped_armor = copy.deepcopy(item_registry[equipped_armor_name])
-
-            for spell_name in player_data.get("known_spells", []):
-                spell = item_registry.get(spell_name)
-                if spell:
-                    player.known_spells.append(copy.deepcopy(spell))
-
-            player.max_mana = player.calculate_max_mana()
-            player.mana = min(player_data.get("mana", player.max_mana), player.max_mana)
-            
-            # Reconstrói o world
-            from world import World
-            world = World()
-            
-            world_data = save_data["world"]
-            world.visited_rooms = set(world_data["visited_rooms"])
-            world.defeated_enemies = set(world_data["defeated_enemies"])
-            world.looted_rooms = set(world_data["looted_rooms"])
+            raw_data = read_save_file(filepath)
+            save_data = migrate_save(raw_data)
+            player = self._build_player(save_data["player"])
+            world = self._build_world(save_data["world"])
+            if save_format_version(raw_data) == SAVE_FORMAT_VERSION:
+                # Salvar de novo sem mudar nada não reescreve o arquivo
+                stat = os.stat(filepath)
+                mark = self.new_save_mark(player, world, filename, save_data.get("combat"))
+                mark["stat"] = (stat.st_mtime_ns, stat.st_size)
             
             print(f"\n📂 Jogo carregado de: {filename}")
-            return player, world
+            return player, world, save_data.get("combat")
         
-        except json.JSONDecodeError:
+        except (ValueError, zlib.error):
             print(f"\n❌ Arquivo corrompido: {filename}")
-            return None, None
+            return None, None, None
         
         except KeyError as e:
             print(f"\n❌ Dados inválidos no arquivo: {e}")
-            return None, None
+            return None, None, None
         
         except Exception as e:
             print(f"\n❌ Erro ao carregar: {e}")
-            return None, None
+            return None, None, None
+
+    def _build_player(self, player_data):
+        """Reconstrói o player a partir da seção "player" do formato atual"""
+        from player import Player
+
+        item_registry = get_item_registry()
+        player = Player(player_data["name"], player_data.get("class", "guerreiro"))
+        player.inventory = []
+        player.equipped_weapon = None
+        player.equipped_shield = None
+        player.equipped_armor = None
+        player.known_spells = []
+
+        # Restaura atributos
+        player.level = player_data["level"]
+        player.xp = player_data["xp"]
+        player.max_hp = player_data["max_hp"]
+        player.hp = player_data["hp"]
+        player.bonus_mana = player_data.get("bonus_mana", 0)
+        player.strength, player.vitality, player.agility = player_data["attributes"]
+        player.skill_points, player.attribute_points = player_data.get("points", (0, 0))
+        player.unlocked_skills = list(player_data.get("skills", []))
+        player.invalidate_passive_bonuses()
+        player.max_pa = player_data.get("max_pa", getattr(player, "max_pa", 6))
+        player.position = player_data["position"]
+
+        # Companheiros: template atual + diferenças salvas
+        player.companions = [
+            restore_companion(companion, player.level)
+            for companion in player_data.get("companions", [])
+            if companion
+        ]
+
+        # Recalcula stats (em caso de mudança no cálculo)
+        player.base_attack = player.calculate_attack()
+        player.base_defense = player.calculate_defense()
+
+        for item_key, count in player_data.get("inventory", []):
+            item = item_registry.resolve(item_key)
+            if not item:
+                continue
+            stack = player._find_stack(item)
+            if stack:
+                stack.count += count
+            else:
+                player.inventory.append(InventoryStack(item, count))
+
+        weapon_key, shield_key, armor_key = player_data.get("equipment", (None, None, None))
+        player.equipped_weapon = item_registry.resolve(weapon_key) if weapon_key else None
+        player.equipped_shield = item_registry.resolve(shield_key) if shield_key else None
+        player.equipped_armor = item_registry.resolve(armor_key) if armor_key else None
+
+        for spell_key in player_data.get("spells", []):
+            spell = item_registry.resolve(spell_key)
+            if spell:
+                player.known_spells.append(spell)
+
+        player.max_mana = player.calculate_max_mana()
+        player.mana = min(player_data.get("mana", player.max_mana), player.max_mana)
+        return player
+
+    def _build_world(self, world_data):
+        """Reconstrói o world a partir da seção "world" do formato atual"""
+        from world import World
+
+        rng_state = world_data.get("rng")
+        world = World(
+            world_data.get("dungeon_id", DEFAULT_DUNGEON_ID),
+            seed=rng_state["run_seed"] if rng_state else None,
+        )
+        if rng_state:
+            if "offsets" in rng_state:
+                world.rng = GameRNG.from_compact_state(rng_state)
+            else:
+                world.rng = GameRNG.from_state(rng_state)
+
+        world.visited_rooms = set(world_data["visited_rooms"])
+        world.defeated_enemies = set(world_data["defeated_enemies"])
+        world.looted_rooms = set(world_data["looted_rooms"])
+        return world
+
+    def _filename_for_encoding(self, filename):
+        """Ajusta a extensão ao formato gravado (.json texto, .sav binário)"""
+        stem, extension = os.path.splitext(filename)
+        if extension not in SAVE_EXTENSIONS:
+            return filename
+        return stem + (".sav" if self.encoding == "binary" else ".json")
     
-    def list_saves(self):
-        """Lista todos os saves disponíveis"""
-        saves = []
-        
+    def list_saves(self, sort_by="timestamp", descending=None, offset=0, limit=None):
+        """Lista os saves disponíveis a partir do índice.
+
+        sort_by: "timestamp" (padrão, mais recentes primeiro), "player" ou "level".
+        offset/limit recortam a lista já ordenada (paginação).
+        """
+        saves = self._sorted_saves(sort_by, descending)
+        end = None if limit is None else offset + limit
+        return saves[offset:end]
+
+    def list_saves_page(self, page=1, per_page=20, sort_by="timestamp", descending=None):
+        """Uma página da lista de saves com os totais para a navegação"""
+        saves = self._sorted_saves(sort_by, descending)
+        pages = max(1, -(-len(saves) // per_page))
+        page = min(max(1, page), pages)
+        start = (page - 1) * per_page
+        return {
+            "saves": saves[start:start + per_page],
+            "total": len(saves),
+            "page": page,
+            "pages": pages,
+        }
+
+    def _sorted_saves(self, sort_by, descending):
+        key, default_descending = SAVE_SORT_KEYS.get(sort_by, SAVE_SORT_KEYS["timestamp"])
+        saves = [
+            {
+                "filename": filename,
+                "player": entry["player"],
+                "level": entry["level"],
+                "timestamp": entry["timestamp"],
+            }
+            for filename, entry in sorted(self.refresh_index().items())
+            if not entry.get("invalid")
+        ]
+        saves.sort(key=key, reverse=default_descending if descending is None else descending)
+        return saves
+
+    def refresh_index(self):
+        """Sincroniza o índice com a pasta de saves e retorna {arquivo: resumo}.
+
+        Só a listagem da pasta é feita sempre; um save é relido apenas se for
+        novo ou se o mtime/tamanho não bater com o índice (arquivo alterado
+        por fora). Arquivos removidos saem do índice. O diário é incorporado
+        ao manifesto aqui, já que a listagem percorre a pasta inteira.
+        """
         if not os.path.exists(self.save_dir):
-            return saves
-        
-        for filename in os.listdir(self.save_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.save_dir, filename)
-                
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                    
-                    saves.append({
-                        "filename": filename,
-                        "player": data["player"]["name"],
-                        "level": data["player"]["level"],
-                        "timestamp": data.get("timestamp", "Desconhecido")
-                    })
-                except:
-                    pass
-        
-        return sorted(saves, key=lambda x: x["timestamp"], reverse=True)
-    
+            return {}
+
+        with _index_lock:
+            return self._refresh_index_locked()
+
+    def _refresh_index_locked(self):
+        indexed, journal_size = self._read_index()
+        current = {}
+        changed = False
+        with os.scandir(self.save_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(SAVE_EXTENSIONS) or not dir_entry.is_file():
+                    continue
+                stat = dir_entry.stat()
+                entry = indexed.get(dir_entry.name)
+                if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                    entry = self._summarize_save_file(dir_entry.path, stat)
+                    changed = True
+                current[dir_entry.name] = entry
+
+        if changed or journal_size or len(current) != len(indexed):
+            self._write_index(current)
+        return current
+
+    def _index_path(self):
+        return os.path.join(self.save_dir, SAVE_INDEX_FILENAME)
+
+    def _journal_path(self):
+        return os.path.join(self.save_dir, SAVE_INDEX_JOURNAL_FILENAME)
+
+    def _read_index(self):
+        """Entradas do manifesto + diário e o tamanho do diário em bytes.
+
+        Manifesto ausente, corrompido ou de outra versão conta como vazio;
+        uma linha incompleta do diário (queda no meio do append) é ignorada.
+        A listagem confere mtime/tamanho de todo jeito.
+        """
+        entries = {}
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+        if isinstance(index, dict) and index.get("version") == SAVE_INDEX_VERSION:
+            entries = index.get("saves", {})
+
+        journal_size = 0
+        try:
+            with open(self._journal_path(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        filename, entry = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    if entry is None:
+                        entries.pop(filename, None)
+                    else:
+                        entries[filename] = entry
+                journal_size = f.tell()
+        except OSError:
+            pass
+        return entries, journal_size
+
+    def _write_index(self, entries):
+        """Reescreve o manifesto inteiro e zera o diário"""
+        index_path = self._index_path()
+        temp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": SAVE_INDEX_VERSION, "saves": entries}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, index_path)
+            if os.path.exists(self._journal_path()):
+                os.remove(self._journal_path())
+        except OSError as e:
+            # Sem índice a listagem continua funcionando (relê os saves)
+            print(f"\n⚠️ Não foi possível atualizar o índice de saves: {e}")
+
+    def _append_index_journal(self, filename, entry):
+        """Registra uma alteração do índice (entry None = save apagado) no diário"""
+        with _index_lock:
+            try:
+                with open(self._journal_path(), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps([filename, entry], ensure_ascii=False, separators=(',', ':')) + "\n")
+                    journal_size = f.tell()
+            except OSError as e:
+                print(f"\n⚠️ Não foi possível atualizar o índice de saves: {e}")
+                return
+            if journal_size > SAVE_INDEX_JOURNAL_MAX_BYTES:
+                # Servidor que só grava (ninguém lista): incorpora o diário de vez em quando
+                self._write_index(self._read_index()[0])
+
+    def _summary_entry(self, save_data, stat):
+        return {
+            "player": save_data["player"]["name"],
+            "level": save_data["player"]["level"],
+            "timestamp": save_data.get("timestamp", "Desconhecido"),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def _summarize_save_file(self, filepath, stat):
+        """Resumo de um save lido do disco (arquivos inválidos ficam marcados)"""
+        try:
+            return self._summary_entry(read_save_file(filepath), stat)
+        except (OSError, ValueError, KeyError, TypeError, zlib.error):
+            return {"invalid": True, "mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _index_save(self, filename, filepath, save_data):
+        """Atualiza o índice com um save recém-gravado (sem reler o arquivo)"""
+        self._append_index_journal(filename, self._summary_entry(save_data, os.stat(filepath)))
+
+    def _unindex_save(self, filename):
+        self._append_index_journal(filename, None)
+
     def save_exists(self, filename):
         """Verifica se um save existe"""
         filepath = os.path.join(self.save_dir, filename)
@@ -217,6 +770,9 @@ class SaveManager:
         if os.path.exists(filepath):
             try:
                 os.remove(filepath)
+                self._unindex_save(filename)
+                with self._baselines_lock:
+                    self._baselines.pop(filepath, None)
                 print(f"\n🗑️  Save deletado: {filename}")
                 return True
             except Exception as e:
@@ -245,14 +801,57 @@ class SaveManager:
         
         print(f"\n{'='*60}")
 
-    def _get_item_registry(self):
-        """Cria um registro nome -> item base para reconstrução de saves."""
-        import items as items_module
-        from items import Item
+    def _snapshot_path(self, game_id, extension=".session"):
+        """Caminho do snapshot de uma sessão ativa"""
+        safe_id = "".join(char for char in str(game_id) if char.isalnum() or char in {"_", "-"})
+        return os.path.join(self.snapshot_dir, f"{safe_id}{extension}")
+
+    def snapshot_lock_path(self, game_id):
+        """Arquivo de trava entre processos de uma sessão ativa"""
+        return self._snapshot_path(game_id, ".lock")
+
+    def save_snapshot(self, game_id, game_data):
+        """Grava o jogo ativo completo (player, world, combate) em um snapshot compacto.
+
+        Diferente de save_game, preserva o estado exato da sessão web
+        (inclusive combate em andamento) para reidratação posterior.
+        """
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        filepath = self._snapshot_path(game_id)
+        temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        payload = zlib.compress(pickle.dumps(game_data, protocol=pickle.HIGHEST_PROTOCOL), 1)
 
-        registry = {}
-        for value in vars(items_module).values():
-            if isinstance(value, Item):
-                registry[value.name] = value
+        # Arquivo temporário + rename: nunca deixa um snapshot pela metade
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, filepath)
+        return filepath
 
-        return registry
\ No newline at end of file
+    def load_snapshot(self, game_id):
+        """Carrega um snapshot de sessão (ou None se não existir)"""
+        try:
+            with open(self._snapshot_path(game_id), 'rb') as f:
+                return pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError) as e:
+            print(f"\n❌ Snapshot corrompido {game_id}: {e}")
+            return None
+
+    def delete_snapshot(self, game_id):
+        """Remove o snapshot de uma sessão"""
+        try:
+            os.remove(self._snapshot_path(game_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _item_key(self, item):
+        """Chave de um item no save: id estável (ou o nome, para itens fora do registro)"""
+        if item is None:
+            return None
+        return item.item_id or item.name
+
+    def _get_item_registry(self):
+        """Registro nome -> item base para reconstrução de saves (cacheado por processo)."""
+        return get_item_registry().by_name
@@ -0,0 +1,327 @@
+"""
+Validador (e reparo) da pasta de saves.
+
+Verifica todos os saves de uma pasta em paralelo (um processo por núcleo)
+contra o registro de itens, os templates de companheiros, as árvores de
+habilidades e as dungeons atuais, sem esperar alguém tentar carregar um
+arquivo quebrado pela tela de saves.
+
+Cada arquivo recebe um status:
+    ok           formato atual, tudo reconhecido
+    desatualizado  formato antigo (migrável na leitura)
+    divergente   campos ausentes/desconhecidos, tipos errados ou referências
+                 a itens, skills, companheiros ou salas que não existem mais
+    inválido     não dá para ler, migrar ou reconstruir o jogo
+
+Com --repair, os saves desatualizados/divergentes que ainda carregam são
+reescritos no formato atual (como carregar e salvar de novo), de forma
+atômica e mantendo a codificação (texto ou binário) de cada arquivo.
+Itens fora do registro são descartados, como já acontece ao carregar.
+
+Uso:
+    python save_validator.py [pasta] [--repair] [--workers N] [--json]
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from companions import COMPANION_TEMPLATES, build_companion
+from dungeon_loader import list_dungeons, load_dungeon
+from item_registry import get_item_registry
+from save_manager import (
+    SAVE_EXTENSIONS,
+    SAVE_FORMAT_VERSION,
+    SAVE_INDEX_FILENAME,
+    SAVE_MAGIC,
+    SaveManager,
+    decode_save,
+    encode_save,
+    migrate_save,
+    save_format_version,
+    write_file_atomic,
+)
+from skill_tree import get_skill_tree
+
+STATUS_OK = "ok"
+STATUS_OUTDATED = "desatualizado"
+STATUS_DRIFT = "divergente"
+STATUS_INVALID = "inválido"
+
+# Abaixo disso os processos custam mais do que economizam
+PARALLEL_MIN_FILES = 64
+
+# Campos do formato atual: nome -> tipos aceitos
+PLAYER_FIELDS = {
+    "name": str,
+    "class": str,
+    "level": int,
+    "xp": int,
+    "hp": int,
+    "max_hp": int,
+    "mana": (int, float),
+    "bonus_mana": int,
+    "attributes": list,
+    "points": list,
+    "max_pa": int,
+    "position": str,
+    "skills": list,
+    "spells": list,
+    "inventory": list,
+    "equipment": list,
+    "companions": list,
+}
+OPTIONAL_PLAYER_FIELDS = {"mana", "max_pa"}
+WORLD_FIELDS = {
+    "dungeon_id": str,
+    "visited_rooms": list,
+    "defeated_enemies": list,
+    "looted_rooms": list,
+    "rng": (dict, type(None)),
+}
+PLAYER_CLASSES = ("guerreiro", "mago", "druida")
+
+# Campos que um companheiro salvo pode ter além dos do template
+COMPANION_EXTRA_FIELDS = {"weapon_item_id", "weapon_item_name"}
+
+
+def _check_fields(section, data, fields, optional, issues):
+    for field, types in fields.items():
+        if field not in data:
+            if field not in optional:
+                issues.append(f"campo ausente: {section}.{field}")
+        elif not isinstance(data[field], types):
+            issues.append(f"tipo inválido: {section}.{field} ({type(data[field]).__name__})")
+    for field in data:
+        if field not in fields:
+            issues.append(f"campo desconhecido: {section}.{field}")
+
+
+def _check_player(player_data, issues, unknown_items):
+    _check_fields("player", player_data, PLAYER_FIELDS, OPTIONAL_PLAYER_FIELDS, issues)
+    registry = get_item_registry()
+
+    def check_item(key, where):
+        if key is not None and registry.resolve(key) is None:
+            unknown_items.append(str(key))
+            issues.append(f"item desconhecido em {where}: {key}")
+
+    for field, size in (("attributes", 3), ("points", 2), ("equipment", 3)):
+        if isinstance(player_data.get(field), list) and len(player_data[field]) != size:
+            issues.append(f"tamanho inválido: player.{field} ({len(player_data[field])}, esperado {size})")
+
+    for entry in player_data.get("inventory") or []:
+        if not isinstance(entry, list) or len(entry) != 2 or not isinstance(entry[1], int):
+            issues.append(f"entrada de inventário inválida: {entry!r}")
+            continue
+        check_item(entry[0], "inventory")
+    for key in player_data.get("equipment") or []:
+        check_item(key, "equipment")
+    for key in player_data.get("spells") or []:
+        check_item(key, "spells")
+
+    player_class = player_data.get("class")
+    if player_class not in PLAYER_CLASSES:
+        issues.append(f"classe desconhecida: {player_class}")
+    else:
+        skills = get_skill_tree(player_class).skills
+        for skill_id in player_data.get("skills") or []:
+            if skill_id not in skills:
+                issues.append(f"skill desconhecida: {skill_id}")
+
+    for companion in player_data.get("companions") or []:
+        companion_id = companion.get("id") if isinstance(companion, dict) else None
+        if companion_id not in COMPANION_TEMPLATES:
+            issues.append(f"companheiro desconhecido: {companion_id}")
+            continue
+        allowed = set(build_companion(companion_id)) | COMPANION_EXTRA_FIELDS
+        for field in companion:
+            if field not in allowed:
+                issues.append(f"campo desconhecido: companions.{companion_id}.{field}")
+        template_skills = COMPANION_TEMPLATES[companion_id]["skills"]
+        for skill_id in companion.get("unlocked_skills", []):
+            if skill_id not in template_skills:
+                issues.append(f"skill de companheiro desconhecida: {companion_id}.{skill_id}")
+        for key in (companion.get("weapon_item_id"), companion.get("weapon_item_name")):
+            check_item(key, f"companions.{companion_id}")
+
+
+def _check_world(world_data, player_data, issues):
+    _check_fields("world", world_data, WORLD_FIELDS, set(), issues)
+
+    dungeon_id = world_data.get("dungeon_id")
+    if dungeon_id not in list_dungeons():
+        issues.append(f"dungeon desconhecida: {dungeon_id}")
+        return
+    rooms = load_dungeon(dungeon_id).rooms
+    if player_data.get("position") not in rooms:
+        issues.append(f"sala inexistente: player.position {player_data.get('position')}")
+    for field in ("visited_rooms", "defeated_enemies", "looted_rooms"):
+        missing = [room_id for room_id in world_data.get(field) or [] if room_id not in rooms]
+        if missing:
+            issues.append(f"sala inexistente: world.{field} {missing}")
+
+    rng_state = world_data.get("rng")
+    if isinstance(rng_state, dict) and ("run_seed" not in rng_state or not ("offsets" in rng_state or "streams" in rng_state)):
+        issues.append("estado do RNG incompleto")
+
+
+def validate_save_file(path, repair=False):
+    """Valida (e opcionalmente repara) um arquivo de save. Retorna o relatório"""
+    report = {
+        "file": os.path.basename(path),
+        "status": STATUS_OK,
+        "version": None,
+        "issues": [],
+        "unknown_items": [],
+        "repaired": False,
+    }
+
+    def fail(message):
+        report["status"] = STATUS_INVALID
+        report["issues"].append(message)
+        return report
+
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        save_data = decode_save(raw)
+    except Exception as e:  # JSON quebrado, zlib corrompido, msgpack ausente...
+        return fail(f"arquivo ilegível: {e}")
+    if not isinstance(save_data, dict):
+        return fail("conteúdo não é um save")
+
+    try:
+        version = save_format_version(save_data)
+        report["version"] = version
+        if version < SAVE_FORMAT_VERSION:
+            report["status"] = STATUS_OUTDATED
+            report["issues"].append(f"formato {save_data.get('version', '1.0')} (atual: {SAVE_FORMAT_VERSION})")
+        current = migrate_save(save_data)
+    except Exception as e:
+        return fail(f"migração falhou: {e!r}")
+
+    drift = []
+    player_data = current.get("player")
+    world_data = current.get("world")
+    if not isinstance(player_data, dict) or not isinstance(world_data, dict):
+        return fail("seções player/world ausentes")
+    _check_player(player_data, drift, report["unknown_items"])
+    _check_world(world_data, player_data, drift)
+    if drift:
+        report["status"] = STATUS_DRIFT
+        report["issues"].extend(drift)
+
+    if report["status"] == STATUS_OK:
+        # Formato atual e tudo reconhecido: reconstruir o jogo seria só custo
+        return report
+
+    save_manager = SaveManager(os.path.dirname(path) or ".")
+    try:
+        normalized = save_manager.normalize_save_data(save_data)
+    except Exception as e:
+        return fail(f"não reconstrói o jogo: {e!r}")
+
+    if repair:
+        encoding = "binary" if raw.startswith(SAVE_MAGIC) else "json"
+        try:
+            write_file_atomic(path, encode_save(normalized, encoding))
+            report["repaired"] = True
+        except OSError as e:
+            report["issues"].append(f"reparo falhou: {e}")
+    return report
+
+
+def _validate_for_pool(args):
+    return validate_save_file(*args)
+
+
+def save_files(save_dir):
+    """Arquivos de save de uma pasta (sem o índice e temporários)"""
+    with os.scandir(save_dir) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.endswith(SAVE_EXTENSIONS) and entry.name != SAVE_INDEX_FILENAME
+        )
+
+
+def validate_directory(save_dir="saves", repair=False, workers=None):
+    """Valida todos os saves da pasta. Retorna (relatórios, resumo)"""
+    paths = save_files(save_dir)
+    workers = workers or os.cpu_count() or 1
+    if len(paths) < PARALLEL_MIN_FILES:
+        workers = 1
+
+    started = time.perf_counter()
+    jobs = [(path, repair) for path in paths]
+    if workers == 1:
+        reports = [_validate_for_pool(job) for job in jobs]
+    else:
+        # Lotes grandes: cada processo valida muitos arquivos por ida e volta
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(_validate_for_pool, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    if any(report["repaired"] for report in reports):
+        # Reparos mudaram mtime/tamanho: o índice relê só esses arquivos
+        SaveManager(save_dir).refresh_index()
+
+    summary = {
+        "total": len(reports),
+        "seconds": round(elapsed, 3),
+        "workers": workers,
+        "status": Counter(report["status"] for report in reports),
+        "repaired": sum(report["repaired"] for report in reports),
+        "unknown_items": Counter(
+            item for report in reports for item in set(report["unknown_items"])
+        ),
+    }
+    return reports, summary
+
+
+def print_report(reports, summary):
+    status = summary["status"]
+    print(f"🔍 {summary['total']} saves verificados em {summary['seconds']:.2f}s ({summary['workers']} processos)")
+    print(
+        f"   ✅ {status[STATUS_OK]} ok  📦 {status[STATUS_OUTDATED]} desatualizados  "
+        f"⚠️ {status[STATUS_DRIFT]} divergentes  ❌ {status[STATUS_INVALID]} inválidos"
+    )
+
+    for report in reports:
+        if report["status"] == STATUS_OK:
+            continue
+        repaired = " (reparado)" if report["repaired"] else ""
+        print(f"\n{report['file']}: {report['status']}{repaired}")
+        for issue in report["issues"]:
+            print(f"   - {issue}")
+
+    if summary["unknown_items"]:
+        print("\n🧩 Itens desconhecidos:")
+        for item, count in summary["unknown_items"].most_common():
+            print(f"   {item} ({count} saves)")
+    if summary["repaired"]:
+        print(f"\n🔧 {summary['repaired']} saves reescritos no formato {SAVE_FORMAT_VERSION}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida e repara a pasta de saves")
+    parser.add_argument("save_dir", nargs="?", default="saves", help="Pasta dos saves (padrão: saves)")
+    parser.add_argument("--repair", action="store_true", help="Reescreve no formato atual os saves que ainda carregam")
+    parser.add_argument("--workers", type=int, default=None, help="Processos em paralelo (padrão: núcleos da máquina)")
+    parser.add_argument("--json", action="store_true", help="Relatório em JSON")
+    args = parser.parse_args()
+
+    reports, summary = validate_directory(args.save_dir, repair=args.repair, workers=args.workers)
+    if args.json:
+        print(json.dumps({"summary": summary, "saves": reports}, ensure_ascii=False, indent=2))
+    else:
+        print_report(reports, summary)
+    # Código de saída para scripts/CI: 1 se algum save não carrega
+    return 1 if summary["status"][STATUS_INVALID] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,477 @@
+"""
+Armazenamento de jogos ativos da versão web.
+
+Substitui o antigo dicionário global `active_games` por backends plugáveis:
+- MemorySessionStore: cache LRU em memória com limite de residentes e TTL
+  de inatividade; os jogos despejados viram snapshots do SaveManager
+- DiskSessionStore: snapshots compactos em disco, um arquivo por jogo,
+  permitindo que vários workers (gunicorn) atendam as rotas /api/*
+
+Todos os backends expõem a mesma interface estilo dicionário usada pelo
+app_web (`in`, `[]`, `pop`) e um `flush()` chamado ao fim de cada request
+para gravar os jogos alterados.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos, um único worker por jogo
+    fcntl = None
+
+from save_manager import SaveManager, state_versions
+
+# Segundos esperando outro worker liberar um jogo antes de desistir do request
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+# Intervalo mínimo entre duas varreduras de snapshots vencidos (por processo)
+SNAPSHOT_SWEEP_INTERVAL = 10 * 60
+
+# Valores de game_data que dá para comparar sem copiar (alterações no lugar impossíveis)
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def game_state_token(game_data):
+    """Marca barata do estado de um jogo ativo, ou None se só gravando para saber.
+
+    Usa as versões das seções de player/world (dirty_tracking.py) e os
+    valores simples de game_data; qualquer outro objeto (combate em
+    andamento, fila de inimigos...) pode mudar no lugar sem aviso.
+    """
+    player = game_data.get('player')
+    world = game_data.get('world')
+    if player is None or world is None:
+        return None
+
+    others = []
+    for key, value in game_data.items():
+        if key in ('player', 'world'):
+            continue
+        if not isinstance(value, _SCALAR_TYPES):
+            return None
+        others.append((key, value))
+    return state_versions(player, world), sorted(others)
+
+
+class SessionStore:
+    """Interface base dos backends de jogos ativos"""
+
+    def get(self, game_id):
+        """Retorna os dados do jogo (ou None se não existir)"""
+        raise NotImplementedError
+
+    def put(self, game_id, game_data):
+        """Registra/atualiza um jogo"""
+        raise NotImplementedError
+
+    def delete(self, game_id):
+        """Remove um jogo do store"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Grava os jogos alterados no backend persistente"""
+
+    def stats(self):
+        """Contadores de uso do store"""
+        return {}
+
+    def __contains__(self, game_id):
+        return game_id is not None and self.get(game_id) is not None
+
+    def __getitem__(self, game_id):
+        game_data = self.get(game_id)
+        if game_data is None:
+            raise KeyError(game_id)
+        return game_data
+
+    def __setitem__(self, game_id, game_data):
+        self.put(game_id, game_data)
+
+    def pop(self, game_id, default=None):
+        """Remove e retorna o jogo, como dict.pop"""
+        game_data = self.get(game_id)
+        if game_data is None:
+            return default
+        self.delete(game_id)
+        return game_data
+
+
+class MemorySessionStore(SessionStore):
+    """Jogos ativos em memória com política LRU e despejo por inatividade.
+
+    max_games=None e idle_ttl=None mantêm o comportamento antigo (sem limite).
+    Com limite de residentes ou TTL, os jogos despejados vão para o
+    `backing_store` (se houver) e são reidratados sob demanda quando o
+    jogador voltar. A gravação dos despejados acontece fora da trava do
+    store: os outros requests não esperam o disco.
+    """
+
+    def __init__(self, max_games=None, backing_store=None, idle_ttl=None, clock=time.monotonic):
+        self.max_games = max_games
+        self.backing_store = backing_store
+        self.idle_ttl = idle_ttl  # Segundos sem acesso antes do despejo
+        self._clock = clock
+        self._games = OrderedDict()
+        self._last_access = {}
+        self._spilling = {}  # Despejados ainda sendo gravados: jogo -> [game_data]
+        self._lock = threading.RLock()
+        self.evicted_count = 0  # Despejados por limite de residentes
+        self.expired_count = 0  # Despejados por inatividade
+        self.rehydrated_count = 0  # Recarregados do store de apoio
+
+    def get(self, game_id):
+        with self._lock:
+            evicted = self._evict_idle_locked()
+            game_data = self._lookup(game_id)
+            if game_data is not None:
+                evicted += self._insert(game_id, game_data)
+        self._spill(evicted)
+        return game_data
+
+    def put(self, game_id, game_data):
+        with self._lock:
+            evicted = self._evict_idle_locked()
+            evicted += self._insert(game_id, game_data)
+        self._spill(evicted)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+            self._last_access.pop(game_id, None)
+            self._spilling.pop(game_id, None)
+            if self.backing_store is not None:
+                self.backing_store.delete(game_id)
+
+    def flush(self):
+        if self.backing_store is not None:
+            self.backing_store.flush()
+
+    def __len__(self):
+        return len(self._games)
+
+    def evict_idle(self):
+        """Despeja jogos sem acesso há mais de idle_ttl segundos"""
+        with self._lock:
+            evicted = self._evict_idle_locked()
+        self._spill(evicted)
+        return len(evicted)
+
+    def stats(self):
+        """Contadores para dimensionar o servidor"""
+        with self._lock:
+            stats = {
+                'resident': len(self._games),
+                'max_resident': self.max_games,
+                'idle_ttl': self.idle_ttl,
+                'evicted': self.evicted_count,
+                'expired': self.expired_count,
+                'rehydrated': self.rehydrated_count,
+            }
+        if self.backing_store is not None:
+            stats['swept'] = self.backing_store.stats().get('swept', 0)
+        return stats
+
+    def _lookup(self, game_id):
+        """Jogo residente, em gravação ou reidratado do store de apoio (com a trava)"""
+        game_data = self._games.get(game_id)
+        if game_data is not None:
+            return game_data
+
+        # Despejado agora há pouco: volta direto, sem esperar o disco
+        spilling = self._spilling.pop(game_id, None)
+        if spilling is not None:
+            return spilling[0]
+        if self.backing_store is None:
+            return None
+
+        game_data = self.backing_store.get(game_id)
+        if game_data is not None:
+            # Jogo volta a ser residente; a cópia em disco deixa de ser a fonte da verdade
+            self.backing_store.delete(game_id)
+            self.rehydrated_count += 1
+        return game_data
+
+    def _evict_idle_locked(self):
+        """Tira da memória os jogos ociosos (com a trava). Retorna os despejados.
+
+        Os jogos ficam em ordem de acesso, então basta olhar o início da fila.
+        """
+        if self.idle_ttl is None:
+            return []
+
+        deadline = self._clock() - self.idle_ttl
+        evicted = []
+        while self._games:
+            oldest_id = next(iter(self._games))
+            if self._last_access.get(oldest_id, 0) > deadline:
+                break
+            evicted.append(self._evict(oldest_id))
+
+        self.expired_count += len(evicted)
+        return evicted
+
+    def _touch(self, game_id):
+        self._games.move_to_end(game_id)
+        self._last_access[game_id] = self._clock()
+
+    def _insert(self, game_id, game_data):
+        """Insere como mais recente e tira o excedente da memória. Retorna os despejados"""
+        self._games[game_id] = game_data
+        self._touch(game_id)
+
+        evicted = []
+        while self.max_games is not None and len(self._games) > self.max_games:
+            evicted.append(self._evict(next(iter(self._games))))
+            self.evicted_count += 1
+        return evicted
+
+    def _evict(self, game_id):
+        """Remove um jogo da memória (com a trava); _spill grava depois"""
+        entry = [self._games.pop(game_id)]
+        self._last_access.pop(game_id, None)
+        if self.backing_store is not None:
+            self._spilling[game_id] = entry
+        return game_id, entry
+
+    def _spill(self, evicted):
+        """Envia os despejados para o store de apoio (sem a trava do store)"""
+        if self.backing_store is None:
+            return
+        for game_id, entry in evicted:
+            self.backing_store.put(game_id, entry[0])
+            self.backing_store.flush()
+            with self._lock:
+                # Cada despejo tem sua própria entrada: compara por identidade
+                reclaimed = self._spilling.get(game_id) is not entry
+                if not reclaimed:
+                    del self._spilling[game_id]
+            if reclaimed:
+                # O jogador voltou durante a gravação: o jogo já é residente de novo
+                self.backing_store.delete(game_id)
+                self.backing_store.flush()
+
+
+class DiskSessionStore(SessionStore):
+    """Jogos ativos em disco como snapshots do SaveManager.
+
+    Cada request carrega o jogo sob demanda e o `flush()` do fim do request
+    grava de volta os jogos alterados (os só lidos, pelo game_state_token,
+    ficam como estão). Nada fica residente entre requests, então vários
+    processos podem compartilhar o mesmo diretório.
+
+    Do primeiro acesso até o flush o request segura uma trava exclusiva do
+    jogo (flock em `<jogo>.lock`): dois workers nunca alteram o mesmo jogo
+    ao mesmo tempo, o segundo espera e carrega o estado já gravado pelo
+    primeiro. Sem fcntl (Windows) não há trava entre processos, e cada
+    jogo deve ser atendido por um único worker (sessão fixa no balanceador).
+
+    Com snapshot_ttl, snapshots sem alteração há mais de snapshot_ttl
+    segundos (abas abandonadas) são apagados por uma varredura que roda no
+    flush, no máximo uma vez a cada SNAPSHOT_SWEEP_INTERVAL.
+    """
+
+    def __init__(self, session_dir=os.path.join("saves", "sessions"), lock_timeout=DEFAULT_LOCK_TIMEOUT, snapshot_ttl=None):
+        self.save_manager = SaveManager(snapshot_dir=session_dir)
+        self.lock_timeout = lock_timeout
+        self.snapshot_ttl = snapshot_ttl
+        # Jogos carregados pelo request atual (por thread)
+        self._local = threading.local()
+        self._sweep_lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.skipped_writes = 0  # Jogos carregados e devolvidos sem alteração
+        self.swept_count = 0  # Snapshots apagados por inatividade
+
+    def _working_set(self):
+        if not hasattr(self._local, "games"):
+            self._local.games = {}
+            self._local.tokens = {}
+            self._local.locks = {}
+        return self._local.games
+
+    def _lock(self, game_id, timeout=None):
+        """Trava o jogo para este request (liberada no flush)"""
+        locks = self._local.locks
+        if fcntl is None or game_id in locks:
+            return
+        os.makedirs(self.save_manager.snapshot_dir, exist_ok=True)
+        lock_file = open(self.save_manager.snapshot_lock_path(game_id), "a+b")
+        deadline = time.monotonic() + (self.lock_timeout if timeout is None else timeout)
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(f"Jogo {game_id} travado por outro worker")
+                time.sleep(0.005)
+        locks[game_id] = lock_file
+
+    def _unlock(self, game_id, remove=False):
+        lock_file = self._local.locks.pop(game_id, None)
+        if lock_file is None:
+            return
+        if remove:
+            # Jogo não existe (mais): a trava não serve para ninguém
+            try:
+                os.remove(lock_file.name)
+            except OSError:
+                pass
+        lock_file.close()  # Fechar o arquivo solta o flock
+
+    def _release_locks(self):
+        for game_id in list(self._local.locks):
+            self._unlock(game_id)
+
+    def get(self, game_id):
+        working_set = self._working_set()
+        if game_id in working_set:
+            return working_set[game_id]
+
+        # Trava antes de ler: o snapshot carregado é o último gravado
+        self._lock(game_id)
+        game_data = self.save_manager.load_snapshot(game_id)
+        if game_data is None:
+            self._unlock(game_id, remove=True)
+            return None
+        # As rotas alteram os objetos no lugar: o flush compara com o estado carregado
+        working_set[game_id] = game_data
+        self._local.tokens[game_id] = game_state_token(game_data)
+        return game_data
+
+    def put(self, game_id, game_data):
+        self._working_set()[game_id] = game_data
+        self._lock(game_id)
+        self._local.tokens.pop(game_id, None)
+
+    def delete(self, game_id):
+        self._working_set().pop(game_id, None)
+        self._lock(game_id)
+        self._local.tokens.pop(game_id, None)
+        self.save_manager.delete_snapshot(game_id)
+        self._unlock(game_id, remove=True)
+
+    def flush(self):
+        working_set = self._working_set()
+        tokens = self._local.tokens
+        try:
+            for game_id, game_data in working_set.items():
+                token = tokens.get(game_id)
+                if token is not None and token == game_state_token(game_data):
+                    self.skipped_writes += 1
+                    continue
+                self.save_manager.save_snapshot(game_id, game_data)
+        finally:
+            working_set.clear()
+            tokens.clear()
+            self._release_locks()
+        self._maybe_sweep()
+
+    def sweep_expired(self, now=None):
+        """Apaga snapshots sem alteração há mais de snapshot_ttl segundos.
+
+        Jogos travados por algum request (em uso agora) ficam para a próxima
+        varredura. Retorna quantos snapshots foram apagados.
+        """
+        if self.snapshot_ttl is None:
+            return 0
+        self._working_set()
+        deadline = (time.time() if now is None else now) - self.snapshot_ttl
+        try:
+            with os.scandir(self.save_manager.snapshot_dir) as entries:
+                expired = [entry for entry in entries if entry.name.endswith((".session", ".lock"))]
+        except FileNotFoundError:
+            return 0
+
+        removed = 0
+        for entry in expired:
+            game_id, extension = os.path.splitext(entry.name)
+            snapshot_path = self.save_manager._snapshot_path(game_id)
+            try:
+                if entry.stat().st_mtime > deadline:
+                    continue
+                if extension == ".lock":
+                    # Trava órfã de um jogo que já não tem snapshot
+                    if not os.path.exists(snapshot_path):
+                        os.remove(entry.path)
+                    continue
+                if game_id in self._local.locks:
+                    continue
+                self._lock(game_id, timeout=0)
+            except TimeoutError:
+                continue
+            except FileNotFoundError:
+                continue
+            try:
+                # Confere de novo com a trava: outro worker pode ter gravado agora
+                if os.stat(snapshot_path).st_mtime <= deadline:
+                    self.save_manager.delete_snapshot(game_id)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+            finally:
+                self._unlock(game_id, remove=not os.path.exists(snapshot_path))
+
+        self.swept_count += removed
+        return removed
+
+    def _maybe_sweep(self):
+        if self.snapshot_ttl is None or time.monotonic() < self._next_sweep:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return  # Outra thread já está varrendo
+        try:
+            self._next_sweep = time.monotonic() + SNAPSHOT_SWEEP_INTERVAL
+            self.sweep_expired()
+        finally:
+            self._sweep_lock.release()
+
+    def stats(self):
+        """Contadores do store em disco (nada fica residente entre requests)"""
+        return {
+            'resident': len(self._working_set()),
+            'max_resident': None,
+            'idle_ttl': None,
+            'evicted': 0,
+            'expired': 0,
+            'rehydrated': 0,
+            'skipped_writes': self.skipped_writes,
+            'swept': self.swept_count,
+        }
+
+
+DEFAULT_MAX_ACTIVE_GAMES = 500
+DEFAULT_IDLE_TTL = 30 * 60
+DEFAULT_SNAPSHOT_TTL = 7 * 24 * 60 * 60
+
+
+def create_session_store():
+    """Cria o store configurado por variáveis de ambiente.
+
+    DUNGEON_SESSION_STORE: "memory" (padrão) ou "disk" (multi-worker)
+    DUNGEON_MAX_ACTIVE_GAMES: limite de jogos residentes no store em memória
+        (0 desativa o limite)
+    DUNGEON_SESSION_TTL: segundos sem acesso antes de despejar um jogo
+        (0 desativa o despejo por inatividade)
+    DUNGEON_SESSION_DIR: diretório dos snapshots (padrão saves/sessions)
+    DUNGEON_SNAPSHOT_TTL: segundos sem alteração antes de apagar um snapshot
+        em disco (padrão 7 dias, 0 mantém para sempre)
+    """
+    backend = os.environ.get("DUNGEON_SESSION_STORE", "memory").strip().lower()
+    session_dir = os.environ.get("DUNGEON_SESSION_DIR", os.path.join("saves", "sessions"))
+    snapshot_ttl = float(os.environ.get("DUNGEON_SNAPSHOT_TTL", DEFAULT_SNAPSHOT_TTL)) or None
+    disk_store = DiskSessionStore(session_dir, snapshot_ttl=snapshot_ttl)
+
+    if backend == "disk":
+        return disk_store
+
+    max_games = int(os.environ.get("DUNGEON_MAX_ACTIVE_GAMES", DEFAULT_MAX_ACTIVE_GAMES))
+    idle_ttl = float(os.environ.get("DUNGEON_SESSION_TTL", DEFAULT_IDLE_TTL))
+
+    return MemorySessionStore(
+        max_games=max_games or None,
+        backing_store=disk_store,
+        idle_ttl=idle_ttl or None,
+    )
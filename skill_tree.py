@@ -1,9 +1,19 @@
 """
 Sistema de Árvore de Habilidades tipo Clair Obscur
+
+As árvores são definições imutáveis montadas uma vez por classe e
+compartilhadas por todos os jogadores (get_skill_tree). O estado de cada
+jogador (cooldowns) fica no Player, em uma lista indexada pelo slot da skill.
 """
+from functools import lru_cache
 
 class Skill:
     """Representa uma habilidade individual"""
+    __slots__ = (
+        "skill_id", "name", "description", "skill_type", "tier", "path",
+        "cost_pa", "cooldown", "power", "requirements", "is_passive",
+        "effect_kind", "secondary_power",
+    )
 
     def __init__(self, skill_id, name, description, skill_type, tier, path,
                  cost_pa=0, cooldown=0, power=0, requirements=None, is_passive=False, **kwargs):
@@ -19,11 +29,10 @@ class Skill:
         self.cost_pa = cost_pa
         self.cooldown = cooldown  # Em turnos
         self.power = power  # Dano/Cura/Buff valor
-        self.requirements = requirements or []  # IDs das skills necessárias
+        self.requirements = tuple(requirements or ())  # IDs das skills necessárias
         self.is_passive = is_passive
         self.effect_kind = kwargs.pop("effect_kind", None)
         self.secondary_power = kwargs.pop("secondary_power", 0)
-        self.current_cooldown = 0
 
     @property
     def cost_mana(self):
@@ -37,17 +46,13 @@ class Skill:
         return all(req in unlocked_skills for req in self.requirements)
     
     def use(self, caster, target=None):
-        """Usa a habilidade"""
-        if self.current_cooldown > 0:
-            return False, f"{self.name} ainda está em cooldown! ({self.current_cooldown} turnos)"
+        """Usa a habilidade (o cooldown fica registrado no caster)"""
+        current_cooldown = caster.get_skill_cooldown(self.skill_id)
+        if current_cooldown > 0:
+            return False, f"{self.name} ainda está em cooldown! ({current_cooldown} turnos)"
         
-        self.current_cooldown = self.cooldown
+        caster.start_skill_cooldown(self.skill_id)
         return True, None
-    
-    def tick_cooldown(self):
-        """Reduz o cooldown em 1"""
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
 
 
 class SkillTree:
@@ -57,6 +62,13 @@ class SkillTree:
         self.player_class = player_class
         self.skills = {}
         self._load_skills()
+        # Slot fixo de cada skill: índice da lista de cooldowns do jogador
+        self.slot_ids = tuple(self.skills)
+        self.slot_index = {skill_id: slot for slot, skill_id in enumerate(self.slot_ids)}
+
+    def __reduce__(self):
+        """Snapshots guardam só a classe: a árvore compartilhada é reaproveitada"""
+        return (get_skill_tree, (self.player_class,))
     
     def _load_skills(self):
         """Carrega as habilidades baseado na classe"""
@@ -81,7 +93,7 @@ class SkillTree:
             "d_nature_2", "Seiva Renovadora",
             "A natureza refaz suas feridas. Regenera 4% do HP máximo ao fim do turno (passiva).",
             "passive", tier=2, path="natureza",
-            requirements=["d_nature_1"], is_passive=True, power=0.04
+            requirements=["d_nature_1"], is_passive=True, power=0.04, effect_kind="hp_regen"
         )
 
         self.skills["d_nature_3"] = Skill(
@@ -111,7 +123,7 @@ class SkillTree:
             "d_spirit_2", "Ressonância Espiritual",
             "Os ecos do véu fortalecem suas técnicas druidicas em 18% (passiva).",
             "passive", tier=2, path="espiritos",
-            requirements=["d_spirit_1"], is_passive=True, power=0.18
+            requirements=["d_spirit_1"], is_passive=True, power=0.18, effect_kind="damage_bonus"
         )
 
         self.skills["d_spirit_3"] = Skill(
@@ -141,7 +153,7 @@ class SkillTree:
             "d_shape_2", "Pele de Casca",
             "Sua pele endurece como madeira antiga, elevando a defesa em 25% (passiva).",
             "passive", tier=2, path="metamorfose",
-            requirements=["d_shape_1"], is_passive=True, power=0.25
+            requirements=["d_shape_1"], is_passive=True, power=0.25, effect_kind="defense_bonus"
         )
 
         self.skills["d_shape_3"] = Skill(
@@ -175,7 +187,7 @@ class SkillTree:
             "w_tank_2", "Escudo Vivo",
             "Recupera 3% HP máximo por turno (passiva).",
             "passive", tier=2, path="tanque",
-            requirements=["w_tank_1"], is_passive=True, power=0.03
+            requirements=["w_tank_1"], is_passive=True, power=0.03, effect_kind="hp_regen"
         )
         
         self.skills["w_tank_3"] = Skill(
@@ -205,7 +217,7 @@ class SkillTree:
             "w_dps_2", "Mestre de Armas",
             "+15% chance de crítico (passiva).",
             "passive", tier=2, path="dps",
-            requirements=["w_dps_1"], is_passive=True, power=15
+            requirements=["w_dps_1"], is_passive=True, power=15, effect_kind="crit_chance"
         )
         
         self.skills["w_dps_3"] = Skill(
@@ -229,7 +241,7 @@ class SkillTree:
             "w_berserk_1", "Fúria Crescente",
             "Quanto menor seu HP, mais dano causa (+2% por 1% HP perdido).",
             "passive", tier=1, path="berserker",
-            is_passive=True, power=2
+            is_passive=True, power=2, effect_kind="low_hp_fury"
         )
         
         self.skills["w_berserk_2"] = Skill(
@@ -244,7 +256,7 @@ class SkillTree:
             "w_berserk_3", "Sede de Sangue",
             "Cura 20% do dano causado (passiva).",
             "passive", tier=3, path="berserker",
-            is_passive=True, power=0.2,
+            is_passive=True, power=0.2, effect_kind="lifesteal",
             requirements=["w_berserk_2"]
         )
         
@@ -271,7 +283,7 @@ class SkillTree:
             "m_fire_2", "Combustão Interna",
             "Magias de fogo causam +30% de dano (passiva).",
             "passive", tier=2, path="fogo",
-            requirements=["m_fire_1"], is_passive=True, power=0.3
+            requirements=["m_fire_1"], is_passive=True, power=0.3, effect_kind="fire_damage"
         )
         
         self.skills["m_fire_3"] = Skill(
@@ -334,7 +346,7 @@ class SkillTree:
             "m_arcane_2", "Maestria Arcana",
             "Sua energia flui melhor: técnicas arcanas ficam mais eficientes (passiva).",
             "passive", tier=2, path="arcano",
-            requirements=["m_arcane_1"], is_passive=True, power=0.2
+            requirements=["m_arcane_1"], is_passive=True, power=0.2, effect_kind="arcane_mastery"
         )
         
         self.skills["m_arcane_3"] = Skill(
@@ -370,6 +382,26 @@ class SkillTree:
         return self.skills
 
 
+# Efeito passivo (Skill.effect_kind) -> chaves do perfil de bônus que recebem skill.power.
+# "regen_fraction" e "fury_power" dependem do HP e são aplicados a cada consulta.
+PASSIVE_EFFECTS = {
+    "crit_chance": ("crit_chance",),
+    "lifesteal": ("lifesteal",),
+    "fire_damage": ("fire_damage_multiplier",),
+    "damage_bonus": ("damage_multiplier",),
+    "defense_bonus": ("defense_multiplier",),
+    "arcane_mastery": ("mana_cost_reduction", "arcane_damage_multiplier"),
+    "hp_regen": ("regen_fraction",),
+    "low_hp_fury": ("fury_power",),
+}
+
+
+@lru_cache(maxsize=None)
+def get_skill_tree(player_class):
+    """Árvore de habilidades da classe (montada uma vez por processo)"""
+    return SkillTree(player_class)
+
+
 # Funções auxiliares para combate
 def apply_skill_effects(skill, caster, target):
     """Aplica os efeitos de uma habilidade"""
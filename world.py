@@ -1,344 +1,78 @@
-import random
-from enemy import Goblin, OrcChief, MestreButcher, Blackwarrior, Spaghettus, esqueleto, Necromancer, PrisionGuard,Shadowmage, Dragonwarrior
+from collections import ChainMap
+from collections.abc import Mapping
+from dirty_tracking import DirtyTracking
+from dungeon_loader import DEFAULT_DUNGEON_ID, load_dungeon
+from enemy import create_enemy, spawn_enemies
+from game_rng import GameRNG
+from item_registry import CHEST_FALLBACK_IDS, get_item_registry
 
-class World:
+
+# Topologia e textos das salas vêm de dungeons/<id>.json, compilados uma única
+# vez por processo e compartilhados por todos os World. Cada jogo guarda apenas
+# seu overlay (conteúdo dos baús, salas visitadas/derrotadas/saqueadas).
+DEFAULT_DUNGEON = load_dungeon(DEFAULT_DUNGEON_ID)
+ROOM_TEMPLATES = DEFAULT_DUNGEON.rooms
+TREASURE_ROOM_IDS = DEFAULT_DUNGEON.treasure_room_ids
+
+
+class WorldRooms(Mapping):
+    """Visão somente leitura das salas de um World (template + overlay do jogo)"""
+
+    def __init__(self, world):
+        self._world = world
+
+    def __getitem__(self, room_id):
+        room = self._world.get_room(room_id)
+        if room is None:
+            raise KeyError(room_id)
+        return room
+
+    def __iter__(self):
+        return iter(self._world.dungeon.rooms)
+
+    def __len__(self):
+        return len(self._world.dungeon.rooms)
+
+
+# Seções do save marcadas como alteradas quando o atributo é reatribuído
+WORLD_DIRTY_SECTIONS = {
+    "dungeon_id": "dungeon",
+    "rng": "rng",
+    "visited_rooms": "visited_rooms",
+    "defeated_enemies": "defeated_enemies",
+    "looted_rooms": "looted_rooms",
+}
+
+
+class World(DirtyTracking):
     """Gerencia o mapa da dungeon como um grafo de salas"""
+
+    DIRTY_SECTIONS = WORLD_DIRTY_SECTIONS
     
-    def __init__(self):
-        self.rooms = self.load_map()
+    def __init__(self, dungeon_id=DEFAULT_DUNGEON_ID, seed=None):
+        self.dungeon_id = dungeon_id  # Só o id vai para saves/snapshots
+        self.rng = GameRNG(seed)  # Fluxos aleatórios da partida (loot, combate, IA)
+        self.chest_items = {}  # Overlay por jogo: conteúdo sorteado dos baús
         self.visited_rooms = set()  # Salas já visitadas
         self.defeated_enemies = set()  # IDs de salas com inimigos derrotados
         self.looted_rooms = set()  # Salas que já tiveram tesouro coletado
         self.previous_room = None
         self.randomize_treasure_loot()  # Gera loot aleatório para baús
 
+    @property
+    def dungeon(self):
+        """Dungeon compilada (cacheada por processo, nunca copiada por jogo)"""
+        return load_dungeon(getattr(self, "dungeon_id", DEFAULT_DUNGEON_ID))
+
+    @property
+    def rooms(self):
+        """Salas do mapa (template compartilhado + overlay deste jogo)"""
+        return WorldRooms(self)
+
     def load_map(self):
-        """Carrega o mapa da dungeon"""
-        return {
-            "1": {
-                "name": "Sala Inicial",
-                "type": "start",
-                "description": "Uma sala fria e escura, iluminada por tochas antigas.\nO ar cheira a mofo e pedra molhada.",
-                "connections": {"sul": "2"},
-                "enemy": None,
-                "items": []
-            },
-            "2": {
-                "name": "Corredor de Pedra",
-                "type": "corridor",
-                "description": "Um corredor estreito com paredes rachadas.\nVocê escuta algo se movendo à distância.",
-                "connections": {"norte": "1", "leste": "3", "sul": "4", "oeste": "7"},
-                "enemy": None,
-                "items": []
-            },
-            "3": {
-                "name": "Sala do Goblin",
-                "type": "enemy",
-                "description": "Uma sala mal iluminada com manchas de sangue nas paredes.",
-                "connections": {"oeste": "2"},
-                "enemy": "goblin",
-                "items": ["rusty_sword"]  # Drop do inimigo
-            },
-            "4": {
-                "name": "Câmara do Tesouro",
-                "type": "treasure",
-                "description": "Você encontra um baú antigo coberto de poeira.",
-                "connections": {"norte": "2", "leste": "5"},
-                "enemy": None,
-                "items": []  # Será preenchido aleatoriamente
-            },
-            "5": {
-                "name": "Salão do Chefe",
-                "type": "boss",
-                "description": "Um salão enorme com teto alto.\nUm orc gigantesco bloqueia a passagem para a saída.",
-                "connections": {"oeste": "4", "leste": "6"},
-                "enemy": "orc_chief",
-                "items": ["exit_key"]
-            },
-            "6": {
-                "name": "Saída",
-                "type": "exit",
-                "description": "Um feixe de luz natural entra pela passagem à frente.\nVocê sente o ar fresco pela primeira vez desde que entrou.",
-                "connections": {"oeste": "5"},
-                "enemy": None,
-                "items": []
-            },
-            "7": {
-                "name": "Arsenal Abandonado",
-                "type": "treasure",
-                "description": "Prateleiras enferrujadas exibem armas antigas quebradas.\nUm baú de ferro repousa no canto, ainda intacto.",
-                "connections": {"leste": "2", "sul": "9",},
-                "enemy": None,
-                "items": []
-            },
-            "8": {
-                "name": "Cozinha Abandonada",
-                "type": "enemy",
-                "description": "Uma cozinha em ruínas com manchas escuras nas tábuas de corte.\nIngredientes não identificáveis apodrecem sobre a mesa.",
-                "connections": {"sul": "9"},
-                "enemy": "mestre_butcher",
-                "items": ["butcher_spatula"]
-            },
-            "9": {
-                "name": "corredor ate a cozinha",
-                "type": "enemy",
-                "description": "Corredor mal iluminado com rastros de gordura nas paredes.\nFumaça fina e cinzenta emerge de uma passagem mais adiante.",
-                "connections": {"norte": "8", "oeste": "7", "sul": "11"},
-                "enemy": "spaghettus",
-                "items": []
-            },
-            "10": {
-                "name": "Biblioteca Esquecida",
-                "type": "treasure",
-                "description": "Prateleiras altas repletas de livros empoeirados e ilegíveis.\nTeias de aranha cobrem cada canto.",
-                "connections": { "leste": "11"},
-                "enemy": None,
-                "items": [],
-                "npc": {
-                    "name": "Lyra Cinzaviva",
-                    "title": "A maga enclausurada",
-                    "intro": "Entre estantes partidas, uma maga de olhos cansados segura um foco arcano lascado. Ela mede seus passos antes de confiar na sua presença.",
-                    "button_label": "💬 Falar com Lyra",
-                    "companion_id": "mage_companion",
-                    "recruit_button_label": "🔮 Convidar Lyra para a equipe",
-                    "recruit_message": "Lyra abandona o esconderijo entre as estantes e decide seguir com você, transformando a fuga em contra-ataque.",
-                    "topics": [
-                        {
-                            "label": "Perguntar como ela sobreviveu",
-                            "response": "Livros queimam, pergaminhos apodrecem, mas uma mente faminta aprende a sobreviver com migalhas de magia."
-                        },
-                        {
-                            "label": "Perguntar por que ela quer lutar",
-                            "response": "Porque a dungeon já tomou demais. Se eu sair daqui, não será escondida entre poeira."
-                        }
-                    ]
-                }
-            },
-            "11": {
-                "name": "Poço das Sombras",
-                "type": "corridor",
-                "description": "Um poço profundo domina o centro da sala.\nVocê escuta ecos distantes vindo de baixo.",
-                "connections": {"norte": "9", "oeste": "10", "sul": "12"},
-                "enemy": None,
-                "items": []
-            },
-            "12": {
-                "name": "Jardim Petrificado",
-                "type": "treasure",
-                "description": "Estátuas de pedra que um dia foram plantas cercam um baú ornamentado.\nA atmosfera é estranhamente pacífica.",
-                "connections": {"norte": "11", "leste": "13"},
-                "enemy": None,
-                "items": [],
-                "npc": {
-                    "name": "Eira Folhaviva",
-                    "title": "A druida sitiada pelo silêncio",
-                    "intro": "Entre raízes petrificadas, uma druida mantém a mão sobre o solo como se ainda pudesse ouvir vida debaixo da pedra. Quando você se aproxima, ela abre os olhos devagar.",
-                    "button_label": "💬 Falar com Eira",
-                    "companion_id": "druid_companion",
-                    "recruit_button_label": "🌿 Chamar Eira para a equipe",
-                    "recruit_message": "Eira se levanta do círculo de raízes petrificadas e decide caminhar com você para restaurar o que ainda puder ser salvo.",
-                    "topics": [
-                        {
-                            "label": "Perguntar o que aconteceu ao jardim",
-                            "response": "A vida foi interrompida, não morta. A pedra aqui é só uma pausa longa demais no ciclo natural."
-                        },
-                        {
-                            "label": "Perguntar por que ela ficou",
-                            "response": "Porque alguém precisava lembrar que mesmo a dungeon já foi tocada por chuva, semente e lua."
-                        }
-                    ]
-                }
-            },
-            "13": {
-                "name": "Salão de Cristais",
-                "type": "corridor",
-                "description": "Cristais brilhantes crescem das paredes, emitindo uma luz azulada fraca.\nO som dos seus passos ecoa estranhamente.",
-                "connections": {"oeste": "12", "norte": "14", "leste": "15"},
-                "enemy": None,
-                "items": []
-            },
-            "14": {
-                "name": "Altar Sombrio",
-                "type": "enemy",
-                "description": "Um altar de pedra negra ocupa o centro da sala.\nMarcas de rituais antigos cobrem o chão.",
-                "connections": {"sul": "13"},
-                "enemy": "Blackwarrior",
-                "items": ["Blackwarrior_sword", "Blackwarrior_armor"]
-            },
-            "15": {
-                "name": "Câmara das Ruínas",
-                "type": "treasure",
-                "description": "Colunas quebradas e destroços de uma civilização antiga.\nUm baú de bronze está meio enterrado nos escombros.",
-                "connections": {"oeste": "13", "sul": "16"},
-                "enemy": None,
-                "items": []
-            },
-            "16": {
-                "name": "Passagem Estreita",
-                "type": "corridor",
-                "description": "Uma passagem tão estreita que você precisa andar de lado.\nO ar está abafado e quente.",
-                "connections": {"norte": "15", "sul": "17", "oeste": "18"},
-                "enemy": None,
-                "items": [],
-                "npc": {
-                    "name": "Irmão Ferromorto",
-                    "title": "O cronista acorrentado",
-                    "intro": "Um monge espectral preso por correntes de ferro ergue o rosto quando você se aproxima. A voz dele soa como metal arrastando na pedra.",
-                    "button_label": "💬 Ouvir o cronista",
-                    "topics": [
-                        {
-                            "label": "Perguntar sobre o Ferreiro Negro",
-                            "response": "O Ferreiro Negro forjou aço com luto e juramento. Dizem que cada golpe do martelo dele ainda ecoa no altar, vestindo o Blackwarrior com uma armadura que não conhece descanso."
-                        },
-                        {
-                            "label": "Perguntar sobre o Necromante",
-                            "response": "O Necromante não teme a morte porque já deixou de ser um homem. Na cripta profanada, ele escuta runas como outros escutam sinos, e responde com ossos, névoa e maldição."
-                        }
-                    ]
-                }
-            },
-            "17": {
-                "name": "Caverna de Estalactites",
-                "type": "enemy",
-                "description": "Estalactites afiadas pendem do teto como lanças.\nGotas de água ecoam pela caverna.",
-                "connections": {"norte": "16"},
-                "enemy": "goblin",
-                "items": []
-            },
-            "18": {
-                "name": "Depósito Inundado",
-                "type": "treasure",
-                "description": "Água até os tornozelos cobre o chão desta sala.\nCaixas empilhadas e um baú flutuam na água.",
-                "connections": {"leste": "16", "sul": "19"},
-                "enemy": None,
-                "items": []
-            },
-            "19": {
-                "name": "Catacumbas Antigas",
-                "type": "enemy",
-                "description": "Nichos nas paredes contêm ossos antigos.\nUm esqueleto reanimado patrulha entre as tumbas.",
-                "connections": {"norte": "18", "leste": "20", "sul": "22"},
-                "enemy": "esqueleto",
-                "items": []
-            },
-            "20": {
-                "name": "Cripta Profanada",
-                "type": "boss",
-                "description": "Sarcófagos quebrados e saqueados cercam um círculo necromântico.\nO ar é pesado com energia sombria.",
-                "connections": {"oeste": "19", "sul": "21"},
-                "enemy": "Necromancer",
-                "items": ["necromancer_robe", "necromancer_curser"]
-            },
-            "21": {
-                "name": "Câmara do Escriba",
-                "type": "treasure",
-                "description": "Uma escrivaninha antiga com pergaminhos deteriorados.\nUm pequeno baú está trancado sob a mesa.",
-                "connections": {"norte": "20"},
-                "enemy": None,
-                "items": []
-            },
-            "22": {
-                "name": "Túnel Desabado",
-                "type": "enemy",
-                "description": "Rochas e entulho bloqueiam parte da passagem.\nUm esqueleto emerge dos escombros.",
-                "connections": {"norte": "19", "leste": "23"},
-                "enemy": "esqueleto",
-                "items": []
-            },
-            "23": {
-                "name": "Sala das Armadilhas",
-                "type": "enemy",
-                "description": "Marcas de flechas nas paredes e buracos no chão.\nUm goblin patrulha os mecanismos enferrujados.",
-                "connections": {"oeste": "22", "sul": "24"},
-                "enemy": "goblin",
-                "items": []
-            },
-            "24": {
-                "name": "Torre em Ruínas",
-                "type": "enemy",
-                "description": "O que restou de uma torre interna.\nUm esqueleto guardando as escadas quebradas.",
-                "connections": {"norte": "23", "leste": "25", "sul": "26"},
-                "enemy": "esqueleto",
-                "items": []
-            },
-            "25": {
-                "name": "Observatório Destruído",
-                "type": "treasure",
-                "description": "Instrumentos astronômicos antigos cobertos de ferrugem.\nUm baú celestial jaz no centro.",
-                "connections": {"oeste": "24"},
-                "enemy": None,
-                "items": [],
-                "npc": {
-                    "name": "Alden Escudo-Partido",
-                    "title": "O guerreiro sitiado",
-                    "intro": "Um guarda veterano repousa perto do telescópio tombado, o escudo rachado apoiado no joelho. Ao notar você, ele se força a ficar de pé.",
-                    "button_label": "💬 Falar com Alden",
-                    "companion_id": "warrior_companion",
-                    "recruit_button_label": "⚔️ Chamar Alden para a equipe",
-                    "recruit_message": "Alden aperta as correias do escudo rachado e aceita voltar ao combate, desta vez ao seu lado.",
-                    "topics": [
-                        {
-                            "label": "Perguntar por quanto tempo ele resistiu",
-                            "response": "Tempo demais para contar. Quando o ferro enferruja, a memória vira a única muralha que resta."
-                        },
-                        {
-                            "label": "Perguntar o que ele viu aqui",
-                            "response": "Vi o céu por esta cúpula antes dela cair. Depois disso, só restou pedra, eco e disciplina."
-                        }
-                    ]
-                }
-            },
-            "26": {
-                "name": "Ponte de Pedra",
-                "type": "enemy",
-                "description": "Uma ponte sobre um abismo escuro.\nUm esqueleto bloqueia a passagem.",
-                "connections": {"norte": "24", "sul": "27"},
-                "enemy": "esqueleto",
-                "items": []
-            },
-            "27": {
-                "name": "Forja Apagada",
-                "type": "enemy",
-                "description": "Uma forja antiga ainda emite calor das brasas.\nFerramentas de ferreiro estão espalhadas.",
-                "connections": {"norte": "26", "leste": "28"},
-                "enemy": "goblin",
-                "items": []
-            },
-            "28": {
-                "name": "Arsenal Secreto",
-                "type": "treasure",
-                "description": "Uma sala escondida cheia de armas antigas.\nUm baú reforçado está encostado na parede.",
-                "connections": {"oeste": "27", "sul": "29"},
-                "enemy": None,
-                "items": []
-            },
-            "29": {
-                "name": "Salão dos Espelhos",
-                "type": "enemy",
-                "description": "Espelhos rachados refletem sua imagem distorcida.\nUm guarda se move entre os reflexos.",
-                "connections": {"norte": "28", "oeste": "30"},
-                "enemy": "PrisionGuard",
-                "items": []
-            },
-            "30": {
-                "name": "Prisão Abandonada",
-                "type": "treasure",
-                "description": "Celas enferrujadas com correntes penduradas.\nUm baú do carcereiro está em um canto.",
-                "connections": {"leste": "29", "sul": "31"},
-                "enemy": None,
-                "items": []
-            },
-        
+        """Carrega o mapa da dungeon (template somente leitura compartilhado)"""
+        return self.dungeon.rooms
 
-            "31": {
-                "name": "Câmara dos Duelistas",
-                "type": "multi_enemy",
-                "description": "Dois guerreiros mortos-vivos empunham suas armas em posição de combate.\nSuas armaduras enferrujadas brilham fracamente à luz das tochas.",
-                "connections": {"norte": "30",},  # Ajuste as conexões conforme seu mapa
-                "enemies": ["Dragonwarrior", "Shadowmage"],  # Ou outro inimigo que preferir
-                "items": ["dragon_lance", "shadow_grimoire", "exit_key"]
-            },
-        }
     def randomize_treasure_loot(self):
         """Distribui itens aleatoriamente nos baús de tesouro sem repetição"""
         unique_loot_pool = [
@@ -367,23 +101,24 @@ class World:
             "grove_totem",
         ]
                 
+        loot_rng = self.rng.loot
+
         # Meteoro tem 33% de chance de aparecer
-        if random.random() < 0.33:
+        if loot_rng.random() < 0.33:
             unique_loot_pool.append("meteor")
         
         # Identifica salas de tipo "treasure" (baús)
-        treasure_rooms = [room_id for room_id, room in self.rooms.items() 
-                         if room.get("type") == "treasure"]
+        treasure_rooms = list(self.dungeon.treasure_room_ids)
         
         # Escolhe baús aleatórios para chave, runa do blackwarrior e runa do necromante
         if len(treasure_rooms) >= 3:
-            key_room = random.choice(treasure_rooms)
+            key_room = loot_rng.choice(treasure_rooms)
             # Escolhe um baú diferente para a runa do blackwarrior
             remaining_rooms = [r for r in treasure_rooms if r != key_room]
-            rune_room = random.choice(remaining_rooms)
+            rune_room = loot_rng.choice(remaining_rooms)
             # Escolhe um baú diferente para a runa do necromante
             remaining_rooms = [r for r in remaining_rooms if r != rune_room]
-            necro_rune_room = random.choice(remaining_rooms)
+            necro_rune_room = loot_rng.choice(remaining_rooms)
         else:
             key_room = rune_room = necro_rune_room = None
         
@@ -391,11 +126,11 @@ class World:
         available_unique_items = unique_loot_pool[:]
         for room_id in treasure_rooms:
             room_items = []
-            items_per_chest = random.randint(2, 3)
+            items_per_chest = loot_rng.randint(2, 3)
             unique_count = min(len(available_unique_items), items_per_chest)
 
             if unique_count > 0:
-                selected_unique_items = random.sample(available_unique_items, unique_count)
+                selected_unique_items = loot_rng.sample(available_unique_items, unique_count)
                 room_items.extend(selected_unique_items)
                 for item_name in selected_unique_items:
                     available_unique_items.remove(item_name)
@@ -415,15 +150,19 @@ class World:
             if room_id == necro_rune_room:
                 room_items.append("necromancer_rune")
             
-            # Atribui itens ao baú
-            self.rooms[room_id]["items"] = room_items
+            # Atribui itens ao baú (overlay deste jogo, o template não muda)
+            self.chest_items[room_id] = room_items
             
             # Debug: descomentar para ver a distribuição
-            # print(f"Baú na sala {room_id} ({self.rooms[room_id]['name']}): {room_items}")
+            # print(f"Baú na sala {room_id} ({self.dungeon.rooms[room_id]['name']}): {room_items}")
     
     def get_room(self, room_id):
         """Retorna os dados de uma sala"""
-        return self.rooms.get(room_id)
+        room = self.dungeon.rooms.get(room_id)
+        if room is None or room_id not in self.chest_items:
+            return room
+        # Baús sorteados: itens deste jogo sobre o template compartilhado
+        return ChainMap({"items": self.chest_items[room_id]}, room)
     
     def get_room_description(self, room_id):
         """Retorna a descrição formatada de uma sala"""
@@ -435,7 +174,7 @@ class World:
         is_revisit = room_id in self.visited_rooms
         
         # Marca sala como visitada
-        self.visited_rooms.add(room_id)
+        self.visit_room(room_id)
         
         description = f"\n{'='*40}\n"
         
@@ -452,9 +191,10 @@ class World:
     
     def get_connections(self, room_id):
         """Retorna as direções disponíveis de uma sala"""
-        room = self.get_room(room_id)
+        # Conexões nunca mudam por jogo: lê direto do template, sem overlay
+        room = self.dungeon.rooms.get(room_id)
         if room:
-            return room.get("connections", {})
+            return room["connections"]
         return {}
     
     def get_available_directions(self, room_id):
@@ -473,6 +213,35 @@ class World:
         
         return connections[direction.lower()]
     
+    def route(self, from_room, to_room):
+        """Rota mais curta entre duas salas como [(direção, room_id), ...].
+
+        Retorna [] se já estiver no destino e None se não houver caminho.
+        """
+        return self.dungeon.path(from_room, to_room)
+
+    def nearest(self, from_room, target):
+        """Sala mais próxima de um tipo de alvo: "treasure", "enemy" ou "exit".
+
+        Percorre as salas já ordenadas por distância e para no primeiro alvo
+        que ainda vale para este jogo (baú não saqueado, inimigo vivo).
+        """
+        check = {
+            "treasure": self.has_treasure,
+            "enemy": self.has_enemy,
+            "exit": self.is_exit,
+        }[target]
+
+        dungeon = self.dungeon
+        source = dungeon.room_index.get(from_room)
+        if source is None:
+            return None
+        for index in dungeon.by_distance[source]:
+            room_id = dungeon.room_ids[index]
+            if check(room_id):
+                return room_id
+        return None
+
     def has_enemy(self, room_id):
         """Verifica se a sala tem um inimigo vivo"""
         room = self.get_room(room_id)
@@ -494,9 +263,16 @@ class World:
             return room.get("enemy")
         return None
     
+    def visit_room(self, room_id):
+        """Marca a sala como visitada"""
+        if room_id not in self.visited_rooms:
+            self.visited_rooms.add(room_id)
+            self.mark_dirty("visited_rooms")
+
     def defeat_enemy(self, room_id):
         """Marca inimigo da sala como derrotado"""
         self.defeated_enemies.add(room_id)
+        self.mark_dirty("defeated_enemies")
         print(f"\n✅ O inimigo desta sala foi derrotado!")
     
     def has_treasure(self, room_id):
@@ -521,6 +297,7 @@ class World:
         item_names = room.get("items", [])
         
         self.looted_rooms.add(room_id)
+        self.mark_dirty("looted_rooms")
         return item_names
     
     def is_exit(self, room_id):
@@ -537,61 +314,18 @@ class World:
 
     def create_enemy(self, room_id):
         """Cria instância de inimigo baseado no tipo da sala"""
-        
-        enemy_type = self.get_enemy_type(room_id)
-        if isinstance(enemy_type, str):
-            enemy_type = enemy_type.lower()
-        
-        if enemy_type == "goblin":
-            return Goblin()
-        elif enemy_type == "orc_chief":
-            return OrcChief()
-        elif enemy_type == "mestre_butcher":
-            return MestreButcher()
-        elif enemy_type == "spaghettus":
-            return Spaghettus()
-        elif enemy_type == "blackwarrior":
-            return Blackwarrior()
-        elif enemy_type == "esqueleto":
-            return esqueleto()
-        elif enemy_type == "necromancer":
-            return Necromancer()
-        elif enemy_type in {"prision_guard", "prisionguard"}:
-            return PrisionGuard()
-        elif enemy_type == "shadowmage":
-            return Shadowmage()
-        elif enemy_type == "dragonwarrior":
-            return Dragonwarrior()
-        
-        return None
+        return create_enemy(self.get_enemy_type(room_id))
     
     def create_enemy_by_name(self, enemy_name):
         """Cria instância de inimigo baseado no nome"""
-        if isinstance(enemy_name, str):
-            enemy_name = enemy_name.lower()
+        return create_enemy(enemy_name)
 
-        if enemy_name == "goblin":
-            return Goblin()
-        elif enemy_name == "orc_chief":
-            return OrcChief()
-        elif enemy_name == "mestre_butcher":
-            return MestreButcher()
-        elif enemy_name == "spaghettus":
-            return Spaghettus()
-        elif enemy_name == "blackwarrior":
-            return Blackwarrior()
-        elif enemy_name == "esqueleto":
-            return esqueleto()
-        elif enemy_name == "necromancer":
-            return Necromancer()
-        elif enemy_name in {"prision_guard", "prisionguard"}:
-            return PrisionGuard()
-        elif enemy_name == "shadowmage":
-            return Shadowmage()
-        elif enemy_name == "dragonwarrior":
-            return Dragonwarrior()
-        
-        return None
+    def spawn_room_enemies(self, room_id):
+        """Cria de uma vez a fila de inimigos de uma sala com vários inimigos"""
+        room = self.get_room(room_id)
+        if not room or not room.get("enemies") or room_id in self.defeated_enemies:
+            return []
+        return spawn_enemies(room["enemies"])
     
     def get_item_from_room(self, room_id, player_class=None, source="any"):
         """Retorna instâncias dos itens da sala.
@@ -600,107 +334,16 @@ class World:
                     - "boss": aplica filtro por classe e mantém spells/recompensas especiais
           - "any": mantém comportamento antigo (sem filtro)
         """
-        from items import (
-            rusty_sword, simple_shield, health_potion, exit_key, summoning_rune, necromancer_rune,
-            iron_shield, leather_armor, iron_armor, necromancer_robe, Blackwarrior_sword, Blackwarrior_armor,
-            butcher_spatula, fireball, lightning_bolt, ice_shard, magical_heal, meteor, necromancer_curser,
-            battle_axe, flaming_sword, war_hammer, dragon_lance, crystal_orb, ice_wand, ancient_staff,
-            shadow_grimoire, fire_staff, lightning_rod, druid_staff, thorn_sickle, moonbranch_crook,
-            root_spear, druid_armor, bark_mail, moonweave_cloak, warden_blade, ember_focus,
-            grove_totem
-        )
-
         item_names = self.get_treasure(room_id)
         if not item_names:
             return []
 
-        # Mapeia nome do item para instância
-        items_map = {
-            "rusty_sword": rusty_sword,
-            "simple_shield": simple_shield,
-            "health_potion": health_potion,
-            "summoning_rune": summoning_rune,
-            "necromancer_rune": necromancer_rune,
-            "iron_shield": iron_shield,
-            "leather_armor": leather_armor,
-            "iron_armor": iron_armor,
-            "necromancer_robe": necromancer_robe,
-            "Blackwarrior_sword": Blackwarrior_sword,
-            "Blackwarrior_armor": Blackwarrior_armor,
-            "butcher_spatula": butcher_spatula,
-            "fireball": fireball,
-            "lightning_bolt": lightning_bolt,
-            "ice_shard": ice_shard,
-            "magical_heal": magical_heal,
-            "meteor": meteor,
-            "necromancer_curser": necromancer_curser,
-            "battle_axe": battle_axe,
-            "flaming_sword": flaming_sword,
-            "war_hammer": war_hammer,
-            "dragon_lance": dragon_lance,
-            "exit_key": exit_key,
-            "crystal_orb": crystal_orb,
-            "ice_wand": ice_wand,
-            "ancient_staff": ancient_staff,
-            "shadow_grimoire": shadow_grimoire,
-            "fire_staff": fire_staff,
-            "lightning_rod": lightning_rod,
-            "druid_staff": druid_staff,
-            "thorn_sickle": thorn_sickle,
-            "moonbranch_crook": moonbranch_crook,
-            "root_spear": root_spear,
-            "druid_armor": druid_armor,
-            "bark_mail": bark_mail,
-            "moonweave_cloak": moonweave_cloak,
-            "warden_blade": warden_blade,
-            "ember_focus": ember_focus,
-            "grove_totem": grove_totem,
-        }
-
-        neutral_items = {
-            "health_potion",
-            "simple_shield", "iron_shield", "rusty_sword", "exit_key"
-        }
-        companion_items = {
-            "warden_blade", "ember_focus", "grove_totem"
-        }
-        warrior_items = {
-            "battle_axe", "flaming_sword", "war_hammer", "dragon_lance",
-            "leather_armor", "iron_armor", "Blackwarrior_sword",
-            "Blackwarrior_armor", "butcher_spatula", "summoning_rune"
-        }
-        mage_items = {
-            "crystal_orb", "ice_wand", "ancient_staff", "shadow_grimoire",
-            "fire_staff", "lightning_rod", "necromancer_robe", "necromancer_rune",
-            "necromancer_curser"
-        }
-        druid_items = {
-            "druid_staff", "thorn_sickle", "moonbranch_crook", "root_spear",
-            "druid_armor", "bark_mail", "moonweave_cloak"
-        }
-
-        normalized_class = (player_class or "").lower()
-
-        allowed_names = set(items_map.keys())
-        if source == "chest":
-            allowed_names = set(neutral_items) | companion_items
-            if normalized_class == "guerreiro":
-                allowed_names |= warrior_items
-            elif normalized_class == "mago":
-                allowed_names |= mage_items
-            elif normalized_class == "druida":
-                allowed_names |= druid_items
-        elif source == "boss":
-            if normalized_class == "guerreiro":
-                allowed_names = set(warrior_items)
-            elif normalized_class == "mago":
-                allowed_names = set(mage_items)
-            elif normalized_class == "druida":
-                allowed_names = set(druid_items)
+        registry = get_item_registry()
+        allowed_ids = registry.allowed_ids(source, player_class)
 
         items = []
         for item_name in item_names:
-            item = items_map.get(item_name)
+            item = registry.get(item_name)
             if not item:
                 continue
 
@@ -709,30 +352,24 @@ class World:
             if room_id == "31" and item_name == "health_potion":
                 continue
 
-            if source in {"chest", "boss"}:
-                if item_name not in allowed_names:
-                    continue
-                if source == "chest" and item.item_type == "spell":
-                    continue
+            if allowed_ids is not None and item_name not in allowed_ids:
+                continue
+            if source == "chest" and item.item_type == "spell":
+                continue
 
             items.append(item)
 
         # Garantia: baú nunca vazio após filtro de classe
         if source == "chest" and not items:
-            class_priority = {
-                "guerreiro": ["battle_axe", "iron_armor"],
-                "mago": ["crystal_orb", "ancient_staff"],
-                "druida": ["thorn_sickle", "moonbranch_crook", "bark_mail", "moonweave_cloak"],
-            }
-
-            for fallback_name in class_priority.get(normalized_class, []):
-                fallback_item = items_map.get(fallback_name)
+            normalized_class = (player_class or "").lower()
+            for fallback_name in CHEST_FALLBACK_IDS.get(normalized_class, ()):
+                fallback_item = registry.get(fallback_name)
                 if fallback_item:
                     items.append(fallback_item)
                     break
 
             if not items:
-                fallback_item = items_map.get("health_potion")
+                fallback_item = registry.get("health_potion")
                 if fallback_item:
                     items.append(fallback_item)
 
@@ -749,7 +386,7 @@ class World:
             return {"event": "none"}
         
         # Marca sala como visitada
-        self.visited_rooms.add(room_id)
+        self.visit_room(room_id)
         
         # Verifica se é a Cripta Profanada (sala 20) e se o jogador tem a runa necromântica
         if room_id == "20" and room_id not in self.defeated_enemies:
@@ -771,12 +408,11 @@ class World:
                     print("👻 O NECROMANTE FOI INVOCADO!")
                     
                     # Cria o necromante e inicia combate
-                    from enemy import Necromancer
-                    enemy = Necromancer()
+                    enemy = create_enemy("necromancer")
                     print(f"\n{enemy.description}")
                     
                     from combat_pa import CombatPA
-                    combat = CombatPA(player, enemy)
+                    combat = CombatPA(player, enemy, rng=self.rng)
                     result = combat.run_combat()
                     
                     if result["result"] == "victory":
@@ -843,10 +479,10 @@ class World:
                     print("👹 O BLACKWARRIOR FOI INVOCADO!")
                     
                     # Cria o Blackwarrior e inicia combate
-                    enemy = Blackwarrior()
+                    enemy = create_enemy("blackwarrior")
                     print(f"\n{enemy.description}")
                     
-                    combat = CombatPA(player, enemy)
+                    combat = CombatPA(player, enemy, rng=self.rng)
                     result = combat.run_combat()
                     
                     if result["result"] == "victory":
@@ -892,21 +528,16 @@ class World:
         if "enemies" in room and room["enemies"] and room_id not in self.defeated_enemies:
             print(f"\n⚔️  MÚLTIPLOS INIMIGOS APARECEM!")
             
-            enemies_list = room["enemies"]
+            enemies_list = self.spawn_room_enemies(room_id)
             all_defeated = True
             
-            for i, enemy_name in enumerate(enemies_list, 1):
-                enemy = self.create_enemy_by_name(enemy_name)
-                
-                if not enemy:
-                    continue
-                    
+            for i, enemy in enumerate(enemies_list, 1):
                 print(f"\n{'='*60}")
                 print(f"🗡️  COMBATE {i}/{len(enemies_list)}: {enemy.name}")
                 print(f"{'='*60}")
                 print(f"{enemy.description}")
                 
-                combat = CombatPA(player, enemy)
+                combat = CombatPA(player, enemy, rng=self.rng)
                 result = combat.run_combat()
                 
                 if result["result"] == "defeat":
@@ -985,7 +616,7 @@ class World:
                     }
                 
                 # Inicia combate
-                combat = CombatPA(player, enemy)
+                combat = CombatPA(player, enemy, rng=self.rng)
                 result = combat.run_combat()
                 
                 if result["result"] == "victory":